@@ -0,0 +1,202 @@
+# package imports
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+# function imports
+from pathlib import Path
+from typing import Any, Callable
+
+# local imports
+from benchmark.league import generate_league
+from benchmark.server import PostgrestServer, SleeperServer
+
+# request counts do not depend on the machine and are committed, timings and memory are kept per machine and never committed
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+MACHINE_BASELINE_PATH = Path(os.getenv("LEAGUEDB_BENCHMARK_PATH", Path.home() / ".cache" / "leaguedb" / "benchmark")) / f"{platform.node() or 'local'}.json"
+COMMITTED_METRICS: tuple[str, ...] = ("sleeper_requests", "supabase_requests")
+
+def run_benchmark(teams: int = 12, seasons: int = 3, weeks: int = 14, repeat: int = 3) -> dict[str, dict[str, float]]:
+    """
+    Runs the pipeline entry points against local Sleeper and PostgREST stand-ins serving a synthetic league.
+    Every repeat starts from a cold Sleeper cache and club registry.
+
+    Args:
+        teams (int = 12): The number of teams of the synthetic league.
+        seasons (int = 3): The number of seasons of the synthetic league.
+        weeks (int = 14): The number of weeks of the synthetic league.
+        repeat (int = 3): The number of times each stage is run.
+
+    Returns:
+        dict[str, dict[str, float]]: A dictionary of stage name to its median 'seconds', peak memory in 'peak_mb' and
+        the number of 'sleeper_requests' and 'supabase_requests' of the first, cold run.
+    """
+    league = generate_league(teams, seasons, weeks)
+
+    sleeper = SleeperServer(league["sleeper"])
+    postgrest = PostgrestServer(league["supabase"])
+    for server in (sleeper, postgrest):
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    from supabase import create_client
+    from league_table.core import get_league_table, update_standings
+    from matchup_history.core import update_matchups
+    from matchup_table.core import get_matchup_table
+    from shared.python import registry
+    from shared.sleeper import client as sleeper_client
+
+    # point the Sleeper client at the stand-in and keep every cache in a temporary directory
+    cache = tempfile.TemporaryDirectory()
+    sleeper_client.SLEEPER_URL = sleeper.url
+    sleeper_client.CACHE_PATH = Path(cache.name) / "sleeper"
+    registry.REGISTRY_PATH = Path(cache.name) / "registry"
+
+    client = create_client(postgrest.url, "benchmark.benchmark.benchmark")
+    league_id, sleeper_league_id, week = league["league_id"], league["sleeper_league_id"], league["week"]
+    season_id = league["season_ids"][max(league["season_ids"])]
+
+    stages: dict[str, Callable[[], Any]] = {
+        "update_standings": lambda: update_standings(client, sleeper_league_id, league_id, season_id, week),
+        "update_matchups": lambda: update_matchups(client, sleeper_league_id, league_id, season_id, week),
+        "get_league_table": lambda: get_league_table(client, season_id, week, supabase_league_id=league_id),
+        "get_matchup_table": lambda: get_matchup_table(client, season_id, league_id, week)
+    }
+
+    try:
+        results: dict[str, dict[str, float]] = {}
+        for name, stage in stages.items():
+            runs: list[dict[str, float]] = []
+
+            for _ in range(repeat):
+                sleeper_client.clear_cache()
+                registry.invalidate()
+
+                sleeper_requests, supabase_requests = sleeper.requests.total(), postgrest.requests.total()
+                tracemalloc.start()
+                start = time.perf_counter()
+
+                stage()
+
+                seconds = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                runs.append({
+                    "seconds": seconds,
+                    "peak_mb": peak / 2**20,
+                    "sleeper_requests": sleeper.requests.total() - sleeper_requests,
+                    "supabase_requests": postgrest.requests.total() - supabase_requests
+                })
+
+            results[name] = {
+                "seconds": round(statistics.median(run["seconds"] for run in runs), 4),
+                "peak_mb": round(max(run["peak_mb"] for run in runs), 2),
+                "sleeper_requests": runs[0]["sleeper_requests"],
+                "supabase_requests": runs[0]["supabase_requests"]
+            }
+
+        return results
+
+    finally:
+        for server in (sleeper, postgrest):
+            server.shutdown()
+            server.server_close()
+        cache.cleanup()
+
+def measure_startup(argv: list[str] | None = None, repeat: int = 5) -> dict[str, float]:
+    """
+    Measures the wall time of starting the 'leaguedb' command line interface in a fresh interpreter.
+
+    Args:
+        argv (list[str] | None = None): The command line arguments, defaults to '--help'.
+        repeat (int = 5): The number of runs.
+
+    Returns:
+        dict[str, float]: The median 'seconds' of a run.
+    """
+    runs: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "cli.main", *(argv or ["--help"])], check=True, capture_output=True, cwd=Path(__file__).parent.parent)
+        runs.append(time.perf_counter() - start)
+
+    return { "seconds": round(statistics.median(runs), 4) }
+
+def compare_baseline(results: dict[str, dict[str, dict[str, float]]], baseline: dict[str, dict[str, dict[str, float]]], tolerance: float = 0.25) -> list[str]:
+    """
+    Compares benchmark results to a baseline and lists the regressions.
+    A stage regresses when it makes more requests than the baseline, or when it is slower or uses more memory than the
+    baseline by more than the tolerance. Only the metrics present in the baseline are compared, so a baseline without
+    timings of this machine checks the request counts alone.
+
+    Args:
+        results (dict[str, dict[str, dict[str, float]]]): The results of each scenario returned by 'run_benchmark'.
+        baseline (dict[str, dict[str, dict[str, float]]]): The baseline results of each scenario.
+        tolerance (float = 0.25): The allowed relative increase of 'seconds' and 'peak_mb'.
+
+    Returns:
+        list[str]: A description of every regression.
+    """
+    regressions: list[str] = []
+
+    for scenario, stages in results.items():
+        for stage, metrics in stages.items():
+            if (expected := baseline.get(scenario, {}).get(stage)) is None:
+                continue
+
+            for metric in ("seconds", "peak_mb"):
+                if metric in metrics and metric in expected and metrics[metric] > expected[metric] * (1 + tolerance):
+                    regressions.append(f"{scenario} {stage}: {metric} {metrics[metric]} > {expected[metric]} baseline.")
+
+            for metric in COMMITTED_METRICS:
+                if metric in metrics and metric in expected and metrics[metric] > expected[metric]:
+                    regressions.append(f"{scenario} {stage}: {metric} {metrics[metric]} > {expected[metric]} baseline.")
+
+    return regressions
+
+def read_baseline(path: Path = BASELINE_PATH, machine_path: Path = MACHINE_BASELINE_PATH) -> dict[str, dict[str, dict[str, float]]]:
+    """
+    Reads the committed request counts merged with the timings and memory of this machine, when it has saved any.
+
+    Args:
+        path (Path = BASELINE_PATH): The path of the committed baseline.
+        machine_path (Path = MACHINE_BASELINE_PATH): The path of the baseline of this machine.
+
+    Returns:
+        dict[str, dict[str, dict[str, float]]]: The baseline metrics of each scenario and stage.
+    """
+    baseline: dict[str, dict[str, dict[str, float]]] = {}
+
+    for source in (path, machine_path):
+        if source.exists():
+            with open(source, "r", encoding="utf-8") as file:
+                for scenario, stages in json.load(file).items():
+                    for stage, metrics in stages.items():
+                        baseline.setdefault(scenario, {}).setdefault(stage, {}).update(metrics)
+
+    return baseline
+
+def write_baseline(results: dict[str, dict[str, dict[str, float]]], path: Path = BASELINE_PATH, machine_path: Path = MACHINE_BASELINE_PATH) -> None:
+    """
+    Saves the request counts of the results as the committed baseline and the timings and memory as the baseline of this machine.
+
+    Args:
+        results (dict[str, dict[str, dict[str, float]]]): The results of each scenario.
+        path (Path = BASELINE_PATH): The path of the committed baseline.
+        machine_path (Path = MACHINE_BASELINE_PATH): The path of the baseline of this machine.
+    """
+    committed = { scenario: { stage: { metric: value for metric, value in metrics.items() if metric in COMMITTED_METRICS } for stage, metrics in stages.items() } for scenario, stages in results.items() }
+    machine = { scenario: { stage: { metric: value for metric, value in metrics.items() if metric not in COMMITTED_METRICS } for stage, metrics in stages.items() } for scenario, stages in results.items() }
+
+    machine_path.parent.mkdir(parents=True, exist_ok=True)
+    for target, baseline in ((path, committed), (machine_path, machine)):
+        with open(target, "w", encoding="utf-8") as file:
+            json.dump({ scenario: stages for scenario, stages in baseline.items() if any(stages.values()) }, file, indent=4)
+            file.write("\n")
@@ -0,0 +1,163 @@
+# package imports
+import random
+
+# function imports
+from datetime import datetime, timezone
+from typing import Any
+
+# the position of the player in each roster slot, the flex starter is a receiver
+SLOT_POSITIONS: list[str] = ["QB", "RB", "RB", "WR", "WR", "TE", "WR", "K", "DEF", "QB", "RB", "RB", "WR", "TE", "WR"]
+
+def generate_league(teams: int = 12, seasons: int = 3, weeks: int = 14, week: int | None = None, seed: int = 0) -> dict[str, Any]:
+    """
+    Generates a synthetic league with Sleeper API payloads and Supabase table rows.
+    Every season before the last is complete, the last season is played through the given week.
+
+    Args:
+        teams (int = 12): The number of teams, which must be even.
+        seasons (int = 3): The number of seasons.
+        weeks (int = 14): The number of regular season weeks.
+        week (int | None = None): The current week of the last season, defaults to the last week.
+        seed (int = 0): The seed of the random scores.
+
+    Returns:
+        dict[str, Any]: A dictionary with the 'sleeper' payloads keyed by endpoint, the 'supabase' tables keyed by name and
+        the 'league_id', 'sleeper_league_id', 'season_ids' and 'week' of the current season.
+    """
+    if teams % 2:
+        raise ValueError(f"The number of {teams=} must be even.")
+
+    week = week or weeks
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).isoformat()
+    years = [str(2025 - seasons + 1 + index) for index in range(seasons)]
+
+    league_id = "league-0"
+    managers = [{ "id": f"manager-{index}", "name": f"First{index} Last{index}", "sleeper": f"owner-{index}" } for index in range(teams)]
+    clubs = [
+        { "id": f"club-{index:04d}", "league": league_id, "name": f"Club {index}", "founded": years[0], "title": 0, "active": True, "manager": managers[index]["id"] }
+        for index in range(teams)
+    ]
+    season_ids = { year: f"season-{year}" for year in years }
+
+    sleeper: dict[str, Any] = { "state/nfl": { "season": years[-1], "week": week + 1 if week < weeks else week } }
+    sleeper["players/nfl"] = {
+        f"{team}{slot:02d}": { "full_name": f"Player {team}-{slot}", "position": position, "team": f"T{team:02d}" }
+        for team in range(teams) for slot, position in enumerate(SLOT_POSITIONS)
+    }
+    standings: list[dict[str, Any]] = []
+    matchups: list[dict[str, Any]] = []
+
+    for index, year in enumerate(years):
+        sleeper_league_id = f"sleeper-{year}"
+        last_week = week if year == years[-1] else weeks
+        current = year == years[-1]
+
+        sleeper[f"league/{sleeper_league_id}"] = {
+            "league_id": sleeper_league_id,
+            "season": year,
+            "status": "in_season" if current else "complete",
+            "previous_league_id": f"sleeper-{years[index - 1]}" if index else None,
+            "roster_positions": ["QB", "RB", "RB", "WR", "WR", "TE", "FLEX", "K", "DEF"] + ["BN"] * 6,
+            "settings": { "playoff_teams": 6, "playoff_week_start": weeks + 1 }
+        }
+
+        totals = { team: { "wins": 0, "losses": 0, "ties": 0, "pf": 0.0, "pa": 0.0, "mpf": 0.0 } for team in range(teams) }
+
+        for matchup_week in range(1, weeks + 1):
+            order = list(range(teams))
+            rng.shuffle(order)
+            played = matchup_week <= last_week
+
+            payload: list[dict[str, Any]] = []
+            for matchup_id, (team_x, team_y) in enumerate(zip(order[::2], order[1::2]), start=1):
+                score_x = round(rng.gauss(110, 20), 2) if played else 0.0
+                score_y = round(rng.gauss(110, 20), 2) if played else 0.0
+
+                for team, score in ((team_x, score_x), (team_y, score_y)):
+                    players = [f"{team}{slot:02d}" for slot in range(15)]
+                    points = { player: round(rng.uniform(0, 25), 2) if played else 0.0 for player in players }
+                    payload.append({
+                        "roster_id": team + 1,
+                        "matchup_id": matchup_id,
+                        "points": score,
+                        "starters": players[:9],
+                        "players": players,
+                        "players_points": points
+                    })
+
+                if not played:
+                    continue
+
+                # accumulate the roster settings and the stored rows of the week
+                for team, score, against in ((team_x, score_x, score_y), (team_y, score_y, score_x)):
+                    totals[team]["wins"] += score > against
+                    totals[team]["losses"] += score < against
+                    totals[team]["ties"] += score == against
+                    totals[team]["pf"] += score
+                    totals[team]["pa"] += against
+                    totals[team]["mpf"] += score + rng.uniform(0, 20)
+
+                if current and matchup_week == week:
+                    continue
+
+                matchups.append({
+                    "id": len(matchups) + 1,
+                    "season": season_ids[year],
+                    "week": matchup_week,
+                    "club_x": clubs[team_x]["id"],
+                    "score_x": score_x,
+                    "club_y": clubs[team_y]["id"],
+                    "score_y": score_y,
+                    "winner": clubs[team_x]["id"] if score_x > score_y else clubs[team_y]["id"] if score_y > score_x else None,
+                    "stage": "regular",
+                    "round": None,
+                    "updated_at": now
+                })
+
+            sleeper[f"league/{sleeper_league_id}/matchups/{matchup_week}"] = payload
+
+            if played and not (current and matchup_week == week):
+                ranking = sorted(totals, key=lambda team: (totals[team]["wins"], totals[team]["pf"]), reverse=True)
+                for standing, team in enumerate(ranking, start=1):
+                    standings.append({
+                        "id": len(standings) + 1,
+                        "season": season_ids[year],
+                        "club": clubs[team]["id"],
+                        "week": matchup_week,
+                        "standing": standing,
+                        "win": totals[team]["wins"],
+                        "loss": totals[team]["losses"],
+                        "draw": totals[team]["ties"],
+                        "pf": round(totals[team]["pf"], 2),
+                        "pa": round(totals[team]["pa"], 2),
+                        "mpf": round(totals[team]["mpf"], 2)
+                    })
+
+        sleeper[f"league/{sleeper_league_id}/rosters"] = [
+            {
+                "roster_id": team + 1,
+                "owner_id": managers[team]["sleeper"],
+                "players": [f"{team}{slot:02d}" for slot in range(15)],
+                "settings": {
+                    "wins": totals[team]["wins"],
+                    "losses": totals[team]["losses"],
+                    "ties": totals[team]["ties"],
+                    "fpts": int(totals[team]["pf"]),
+                    "fpts_decimal": round(totals[team]["pf"] % 1 * 100),
+                    "fpts_against": int(totals[team]["pa"]),
+                    "fpts_against_decimal": round(totals[team]["pa"] % 1 * 100),
+                    "ppts": int(totals[team]["mpf"]),
+                    "ppts_decimal": round(totals[team]["mpf"] % 1 * 100)
+                }
+            } for team in range(teams)
+        ]
+
+    return {
+        "sleeper": sleeper,
+        "supabase": { "manager": managers, "club": clubs, "standing": standings, "matchup": matchups },
+        "league_id": league_id,
+        "sleeper_league_id": f"sleeper-{years[-1]}",
+        "season_ids": season_ids,
+        "week": week
+    }
@@ -0,0 +1,42 @@
+# package imports
+import argparse
+import json
+import sys
+
+# local imports
+from benchmark.core import compare_baseline, measure_startup, read_baseline, run_benchmark, write_baseline
+
+parser = argparse.ArgumentParser(description="Benchmark the pipeline entry points against local Sleeper and Supabase stand-ins.")
+parser.add_argument("--scenario", action="append", help="A synthetic league as 'teams x seasons x weeks', e.g. 12x3x14. May be repeated.")
+parser.add_argument("--repeat", type=int, default=3, help="The number of runs of each stage.")
+parser.add_argument("--tolerance", type=float, default=0.25, help="The allowed relative increase of timings and memory over the baseline of this machine.")
+parser.add_argument("--save-baseline", action="store_true", help="Save the request counts as the committed baseline and the timings and memory as the baseline of this machine.")
+parser.add_argument("--output", help="An optional path to write the results as JSON.")
+args = parser.parse_args()
+
+results: dict[str, dict[str, dict[str, float]]] = {}
+for scenario in args.scenario or ["12x1x14", "12x5x14"]:
+    teams, seasons, weeks = (int(value) for value in scenario.split("x"))
+    results[scenario] = run_benchmark(teams, seasons, weeks, args.repeat)
+
+    for stage, metrics in results[scenario].items():
+        print(f"{scenario:>10} {stage:<20} {metrics['seconds']:>8.4f}s {metrics['peak_mb']:>8.2f}MB {metrics['sleeper_requests']:>4} sleeper {metrics['supabase_requests']:>4} supabase")
+
+# startup of the command line interface, which must stay free of heavy imports
+results["startup"] = { "leaguedb --help": measure_startup(repeat=args.repeat) }
+print(f"{'startup':>10} {'leaguedb --help':<20} {results['startup']['leaguedb --help']['seconds']:>8.4f}s")
+
+if args.output:
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=4)
+
+if args.save_baseline:
+    write_baseline(results)
+    print(f"Saved the baseline.")
+    sys.exit()
+
+if regressions := compare_baseline(results, read_baseline(), args.tolerance):
+    print(f"Regressions against the baseline:")
+    for regression in regressions:
+        print(f"  {regression}")
+    sys.exit(1)
@@ -0,0 +1,193 @@
+# package imports
+import json
+import re
+import threading
+
+# function imports
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+class SleeperServer(ThreadingHTTPServer):
+    """
+    A local stand-in for the Sleeper API serving the payloads of a synthetic league, keyed by endpoint.
+    """
+    daemon_threads = True
+
+    def __init__(self, payloads: dict[str, Any]) -> None:
+        super().__init__(("127.0.0.1", 0), SleeperHandler)
+        self.payloads = payloads
+        self.requests: Counter[str] = Counter()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/v1"
+
+class SleeperHandler(BaseHTTPRequestHandler):
+    server: SleeperServer
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        endpoint = urlsplit(self.path).path.removeprefix("/v1/")
+
+        with self.server.lock:
+            self.server.requests[endpoint] += 1
+
+        if endpoint not in self.server.payloads:
+            return send_json(self, 404, None)
+
+        send_json(self, 200, self.server.payloads[endpoint])
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+class PostgrestServer(ThreadingHTTPServer):
+    """
+    A local stand-in for the PostgREST API of Supabase over in-memory tables.
+    Supports the filters, ordering, paging, embedded 'manager' select, upserts and the 'get_head_to_head' rpc used by 'shared.supabase'.
+    An optional 'max_rows' caps every page like the PostgREST 'max-rows' setting, and the body of every upsert is kept in 'posts'.
+    """
+    daemon_threads = True
+
+    def __init__(self, tables: dict[str, list[dict[str, Any]]], max_rows: int | None = None) -> None:
+        super().__init__(("127.0.0.1", 0), PostgrestHandler)
+        self.tables = tables
+        self.max_rows = max_rows
+        self.requests: Counter[str] = Counter()
+        self.posts: list[tuple[str, list[dict[str, Any]]]] = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+class PostgrestHandler(BaseHTTPRequestHandler):
+    server: PostgrestServer
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        table, params = self.parse()
+        with self.server.lock:
+            self.server.requests[f"GET {table}"] += 1
+            rows = [row for row in self.server.tables.get(table, []) if matches(row, params)]
+
+        for column, direction in (item.split(".")[:2] for item in reversed(params.get("order", "").split(",")) if item):
+            rows.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=direction == "desc")
+
+        total = len(rows)
+        offset = int(params.get("offset", 0))
+        limit = min(int(params.get("limit", total)), self.server.max_rows or total)
+        rows = [self.select(row, params.get("select", "*")) for row in rows[offset:offset + limit]]
+
+        headers = { "Content-Range": f"{offset}-{offset + len(rows) - 1}/{total if 'count=exact' in self.headers.get('Prefer', '') else '*'}" }
+        send_json(self, 200, rows, headers)
+
+    def do_POST(self) -> None:
+        table, params = self.parse()
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"null")
+
+        with self.server.lock:
+            self.server.requests[f"POST {table}"] += 1
+
+            if table == "rpc/get_head_to_head":
+                return send_json(self, 200, head_to_head(self.server.tables["matchup"], body["season_id"], body["week_number"]))
+
+            rows = self.server.tables.setdefault(table, [])
+            self.server.posts.append((table, body if isinstance(body, list) else [body]))
+            keys = [key.strip() for key in params.get("on_conflict", "id").split(",")]
+            index = { tuple(row.get(key) for key in keys): row for row in rows }
+            now = datetime.now(timezone.utc).isoformat()
+
+            written: list[dict[str, Any]] = []
+            for row in body if isinstance(body, list) else [body]:
+                if (existing := index.get(tuple(row.get(key) for key in keys))) is not None:
+                    existing.update(row, updated_at=now)
+                    written.append(existing)
+                else:
+                    row = { "id": len(rows) + 1, **row, "updated_at": now }
+                    rows.append(row)
+                    index[tuple(row.get(key) for key in keys)] = row
+                    written.append(row)
+
+        if "return=minimal" in self.headers.get("Prefer", ""):
+            return send_json(self, 201, None)
+
+        send_json(self, 201, [dict(row) for row in written])
+
+    def parse(self) -> tuple[str, dict[str, str]]:
+        url = urlsplit(self.path)
+        return url.path.removeprefix("/rest/v1/"), dict(parse_qsl(url.query))
+
+    def select(self, row: dict[str, Any], select: str) -> dict[str, Any]:
+        # embedded resources are written as 'table(column, column)'
+        embeds = dict(re.findall(r"(\w+)\(([^)]*)\)", select))
+        columns = [column.strip() for column in re.sub(r"\w+\([^)]*\)", "", select).split(",") if column.strip()]
+
+        selected = dict(row) if "*" in columns else { column: row.get(column) for column in columns }
+        for table, embed_columns in embeds.items():
+            embedded = next((other for other in self.server.tables.get(table, []) if other["id"] == row.get(table)), None)
+            selected[table] = { column.strip(): embedded.get(column.strip()) for column in embed_columns.split(",") } if embedded else None
+
+        return selected
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+def matches(row: dict[str, Any], params: dict[str, str]) -> bool:
+    for column, condition in params.items():
+        if column in ("select", "order", "offset", "limit", "on_conflict", "columns"):
+            continue
+
+        operator, _, value = condition.partition(".")
+        stored = row.get(column)
+        if operator == "in":
+            if str(stored) not in value.strip("()").split(","):
+                return False
+            continue
+
+        target: Any = type(stored)(value) if isinstance(stored, (int, float)) and not isinstance(stored, bool) else value
+
+        if operator == "eq" and stored != target:
+            return False
+        if operator == "gt" and (stored is None or stored <= target):
+            return False
+        if operator == "gte" and (stored is None or stored < target):
+            return False
+        if operator == "lt" and (stored is None or stored >= target):
+            return False
+        if operator == "lte" and (stored is None or stored > target):
+            return False
+
+    return True
+
+def head_to_head(matchups: list[dict[str, Any]], season_id: str, week: int) -> list[dict[str, Any]]:
+    pairs: dict[frozenset[str], list[dict[str, Any]]] = {}
+    for matchup in matchups:
+        pairs.setdefault(frozenset((matchup["club_x"], matchup["club_y"])), []).append(matchup)
+
+    return [
+        {
+            "club_x": current["club_x"],
+            "club_y": current["club_y"],
+            "wins_x": sum(history["winner"] == current["club_x"] for history in pairs[frozenset((current["club_x"], current["club_y"]))]),
+            "wins_y": sum(history["winner"] == current["club_y"] for history in pairs[frozenset((current["club_x"], current["club_y"]))]),
+            "draws": sum(history["winner"] is None and history["score_x"] != 0 and history["score_y"] != 0 for history in pairs[frozenset((current["club_x"], current["club_y"]))])
+        } for current in matchups
+        if current["season"] == season_id and current["week"] == week
+    ]
+
+def send_json(handler: BaseHTTPRequestHandler, status: int, payload: Any, headers: dict[str, str] | None = None) -> None:
+    body = json.dumps(payload).encode() if payload is not None else b""
+
+    handler.send_response(status)
+    handler.send_header("Content-Type", "application/json")
+    handler.send_header("Content-Length", str(len(body)))
+    for key, value in (headers or {}).items():
+        handler.send_header(key, value)
+    handler.end_headers()
+    handler.wfile.write(body)
@@ -0,0 +1,284 @@
+# package imports
+import hashlib
+import io
+import json
+import os
+import polars as pl
+import threading
+import zipfile
+
+# function imports
+from datetime import datetime, timezone
+from pathlib import Path
+from supabase import Client
+from typing import Any
+
+# local imports
+from league_table.core import calculate_league_tables
+from matchup_table.core import get_matchup_table
+from shared.python.output import OUTPUT_PATH
+from shared.python.registry import encode_clubs, get_club_frame, get_club_rows
+from shared.python.trace import span, traced
+from shared.store.matchup import STORE_PATH, scan_matchups, sync_matchups
+from shared.supabase.standing import get_standings_frame
+
+# the format version of the bundle, a bundle of another version is rebuilt from scratch
+BUNDLE_VERSION: int = 2
+
+MANIFEST_FILE = "manifest.json"
+WEEKLY_TABLES: list[str] = ["league_table", "matchup_table"]
+
+@traced
+def build_bundle(client: Client, league: str, season: str, season_id: str, supabase_league_id: str, path: Path | None = None, store_path: Path = STORE_PATH) -> dict[str, Any]:
+    """
+    Builds the season bundle of a league: one zip file with the league table and matchup table of every week and the
+    head-to-head summary of every pair of clubs, each an Arrow IPC file compressed with zstd, and a 'manifest.json'.
+    Each week is fingerprinted by the standings and matchups it is calculated from, and only the weeks whose fingerprint
+    changed since the last build are recalculated, the others are copied from the previous bundle as they are.
+
+    Args:
+        client (Client): The Supabase client.
+        league (str): The key of the league, e.g. 'HOMIES'.
+        season (str): The season year, e.g. '2025'.
+        season_id (str): The Supabase UUID of the season.
+        supabase_league_id (str): The Supabase UUID of the league.
+        path (Path | None = None): The path of the bundle, defaults to 'OUTPUT_PATH/bundle/<league>-<season>.zip'.
+        store_path (Path = STORE_PATH): The root directory of the local matchup store.
+
+    Returns:
+        dict[str, Any]: The manifest of the bundle.
+    """
+    path = path or get_bundle_path(league, season)
+
+    try:
+        clubs = get_club_rows(client, supabase_league_id)
+        club_frame = get_club_frame(clubs)
+
+        if (standings := get_standings_frame(client, season_id)) is None:
+            raise RuntimeError(f"No standing records were returned for {season_id=}.")
+
+        # the head-to-head history of every season comes from the local matchup store
+        _ = sync_matchups(client, store_path)
+        history = scan_matchups(store_path).with_columns(encode_clubs(club_frame.schema["id"], "club_x", "club_y")).drop_nulls(["club_x", "club_y"]).collect()
+
+        weeks = sorted(standings["week"].unique().to_list())
+        fingerprints = get_fingerprints(standings, history, season_id, weeks, club_frame)
+
+        previous = read_manifest(path)
+        if previous is None or previous["version"] != BUNDLE_VERSION:
+            previous = None
+
+        changed = [week for week in weeks if previous is None or previous["weeks"].get(str(week), {}).get("fingerprint") != fingerprints[week]]
+        if previous is not None and not changed and len(previous["weeks"]) == len(weeks):
+            return { **previous, "rebuilt": [] }
+
+        members: dict[str, bytes] = {}
+        with span("bundle.core.build_bundle.weeks", changed=len(changed), weeks=len(weeks)):
+            # recalculate the changed weeks, with the week before each for 'move'
+            league_tables = calculate_league_tables(
+                standings.lazy().filter(pl.col("week").is_in([week - offset for week in changed for offset in (0, 1)])),
+                club_frame.lazy()
+            ).filter(pl.col("week").is_in(changed)).collect()
+
+            for week in changed:
+                league_table = league_tables.filter(pl.col("week") == week).drop(["id", "season", "club_id"], strict=False).sort("standing")
+                members[get_member("league_table", week)] = write_member(league_table)
+
+                # the head-to-head history of a week leaves out the later weeks of its season
+                week_history = history.filter((pl.col("season") != season_id) | (pl.col("week") <= week))
+                week_matchups = week_history.filter((pl.col("season") == season_id) & (pl.col("week") == week)).with_columns(pl.col(["club_x", "club_y"]).cast(pl.String))
+
+                if not week_matchups.is_empty():
+                    matchup_table = get_matchup_table(client, season_id, supabase_league_id, week, clubs, week_matchups, week_history.lazy())
+                    members[get_member("matchup_table", week)] = write_member(matchup_table)
+
+        # copy the members of the unchanged weeks from the previous bundle without decompressing them
+        if previous is not None:
+            with zipfile.ZipFile(path) as bundle:
+                for week in set(weeks) - set(changed):
+                    for table in previous["weeks"][str(week)]["tables"]:
+                        members[get_member(table, week)] = bundle.read(get_member(table, week))
+
+        members["head_to_head.arrow"] = write_member(calculate_head_to_head_summary(history.filter((pl.col("season") != season_id) | (pl.col("week") <= weeks[-1])), club_frame))
+
+        manifest = {
+            "version": BUNDLE_VERSION,
+            "revision": previous["revision"] + 1 if previous is not None else 1,
+            "league": league,
+            "season": season,
+            "season_id": season_id,
+            "built_at": datetime.now(timezone.utc).isoformat(),
+            "weeks": {
+                str(week): {
+                    "fingerprint": fingerprints[week],
+                    "tables": [table for table in WEEKLY_TABLES if get_member(table, week) in members]
+                } for week in weeks
+            },
+            "members": { name: { "sha256": hashlib.sha256(data).hexdigest(), "bytes": len(data) } for name, data in sorted(members.items()) },
+            "rebuilt": changed
+        }
+
+        write_bundle(path, manifest, members)
+
+        return manifest
+
+    except Exception as ex:
+        raise RuntimeError(f"Error building the bundle of {league=} and {season=} at {path=}.") from ex
+
+def get_fingerprints(standings: pl.DataFrame, history: pl.DataFrame, season_id: str, weeks: list[int], clubs: pl.DataFrame) -> dict[int, str]:
+    """
+    Gets the fingerprint of the inputs of each week of a season.
+    The league table of a week is calculated from the standings of the week and the week before it, and the matchup
+    table from the matchups of the season up to the week and every matchup of the other seasons.
+
+    Args:
+        standings (polars.DataFrame): The standings of the season.
+        history (polars.DataFrame): Every stored matchup with the club columns encoded by the club Enum.
+        season_id (str): The Supabase UUID of the season.
+        weeks (list[int]): The week numbers of the season.
+        clubs (polars.DataFrame): The club frame returned by 'get_club_frame'.
+
+    Returns:
+        dict[int, str]: A dictionary of week number to the sha256 fingerprint of its inputs.
+    """
+    standing_columns = ["club", "week", "standing", "win", "loss", "draw", "pf", "pa", "mpf"]
+    matchup_columns = ["club_x", "club_y", "week", "score_x", "score_y", "winner"]
+
+    standing_hashes = _hash_weeks(standings.select(standing_columns).with_columns(pl.col("club").cast(pl.String)))
+    matchup_hashes = _hash_weeks(history.filter(pl.col("season") == season_id).select(matchup_columns).with_columns(pl.col(["club_x", "club_y"]).cast(pl.String)))
+
+    base = hashlib.sha256()
+    base.update(_hash_frame(clubs.with_columns(pl.col("id").cast(pl.String))).encode())
+    base.update(_hash_frame(history.filter(pl.col("season") != season_id).select(["season", *matchup_columns]).with_columns(pl.col(["club_x", "club_y"]).cast(pl.String))).encode())
+
+    fingerprints: dict[int, str] = {}
+    matchups = base.copy()
+    for week in range(1, weeks[-1] + 1 if weeks else 1):
+        # matchups accumulate over the season, standings only reach back one week
+        matchups.update(matchup_hashes.get(week, "").encode())
+
+        if week in weeks:
+            fingerprint = matchups.copy()
+            fingerprint.update(standing_hashes.get(week - 1, "").encode())
+            fingerprint.update(standing_hashes.get(week, "").encode())
+            fingerprints[week] = fingerprint.hexdigest()
+
+    return fingerprints
+
+def calculate_head_to_head_summary(history: pl.DataFrame, clubs: pl.DataFrame) -> pl.DataFrame:
+    """
+    Calculates the all-time head-to-head record of every pair of clubs that has played.
+
+    Args:
+        history (polars.DataFrame): Every matchup to summarize with the club columns encoded by the club Enum.
+        clubs (polars.DataFrame): The club frame returned by 'get_club_frame'.
+
+    Returns:
+        polars.DataFrame: A DataFrame with the 'club_a' and 'club_b' names of each pair, their 'wins_a', 'wins_b',
+        'draws', 'games' and points 'pf_a' and 'pf_b', with 'club_a' the club first in the club Enum.
+    """
+    # orient every matchup so club a has the lower integer code
+    flipped = pl.col("club_x").to_physical() > pl.col("club_y").to_physical()
+    played = history.filter((pl.col("score_x") != 0) | (pl.col("score_y") != 0)).with_columns(encode_clubs(clubs.schema["id"], "winner"))
+
+    names = clubs.select(["id", "name"])
+
+    return (
+        played
+        .select([
+            pl.when(flipped).then(pl.col("club_y")).otherwise(pl.col("club_x")).alias("a"),
+            pl.when(flipped).then(pl.col("club_x")).otherwise(pl.col("club_y")).alias("b"),
+            pl.when(flipped).then(pl.col("score_y")).otherwise(pl.col("score_x")).alias("score_a"),
+            pl.when(flipped).then(pl.col("score_x")).otherwise(pl.col("score_y")).alias("score_b"),
+            "winner"
+        ])
+        .group_by(["a", "b"])
+        .agg([
+            (pl.col("winner") == pl.col("a")).sum().alias("wins_a"),
+            (pl.col("winner") == pl.col("b")).sum().alias("wins_b"),
+            (pl.col("winner").is_null() & (pl.col("score_a") != 0) & (pl.col("score_b") != 0)).sum().alias("draws"),
+            pl.len().alias("games"),
+            pl.col("score_a").sum().round(2).alias("pf_a"),
+            pl.col("score_b").sum().round(2).alias("pf_b")
+        ])
+        .join(names.rename({ "id": "a", "name": "club_a" }), on="a", how="inner")
+        .join(names.rename({ "id": "b", "name": "club_b" }), on="b", how="inner")
+        .sort(["a", "b"])
+        .select(["club_a", "club_b", "wins_a", "wins_b", "draws", "games", "pf_a", "pf_b"])
+    )
+
+def read_bundle(path: Path, table: str, week: int | None = None) -> pl.DataFrame:
+    """
+    Reads a table of a season bundle.
+
+    Args:
+        path (Path): The path of the bundle.
+        table (str): The table, 'league_table', 'matchup_table' or 'head_to_head'.
+        week (int | None = None): The week number of a weekly table, defaults to every week of the bundle with a 'week' column.
+
+    Returns:
+        polars.DataFrame: The table.
+    """
+    with zipfile.ZipFile(path) as bundle:
+        if table not in WEEKLY_TABLES:
+            return pl.read_ipc(io.BytesIO(bundle.read(f"{table}.arrow")))
+
+        if week is not None:
+            return pl.read_ipc(io.BytesIO(bundle.read(get_member(table, week))))
+
+        names = sorted(name for name in bundle.namelist() if name.startswith(f"{table}/"))
+        return pl.concat([pl.read_ipc(io.BytesIO(bundle.read(name))) for name in names], how="diagonal_relaxed")
+
+def read_manifest(path: Path) -> dict[str, Any] | None:
+    """
+    Reads the manifest of a season bundle.
+
+    Args:
+        path (Path): The path of the bundle.
+
+    Returns:
+        dict[str, Any] | None: The manifest, or None if the bundle does not exist or cannot be read.
+    """
+    try:
+        with zipfile.ZipFile(path) as bundle:
+            return json.loads(bundle.read(MANIFEST_FILE))
+
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+
+def get_bundle_path(league: str, season: str) -> Path:
+    return OUTPUT_PATH / "bundle" / f"{league}-{season}.zip"
+
+def get_member(table: str, week: int) -> str:
+    return f"{table}/week={week:02d}.arrow"
+
+def write_member(frame: pl.DataFrame) -> bytes:
+    buffer = io.BytesIO()
+    frame.write_ipc(buffer, compression="zstd")
+
+    return buffer.getvalue()
+
+def write_bundle(path: Path, manifest: dict[str, Any], members: dict[str, bytes]) -> None:
+    # the members are already compressed, so the zip only stores them, and the bundle is replaced atomically
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    try:
+        with zipfile.ZipFile(temp_path, "w", compression=zipfile.ZIP_STORED) as bundle:
+            bundle.writestr(MANIFEST_FILE, json.dumps(manifest, indent=4))
+            for name, data in sorted(members.items()):
+                bundle.writestr(name, data)
+
+        os.replace(temp_path, path)
+
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+def _hash_weeks(frame: pl.DataFrame) -> dict[int, str]:
+    return { week: _hash_frame(partition) for (week,), partition in frame.partition_by("week", as_dict=True).items() }
+
+def _hash_frame(frame: pl.DataFrame) -> str:
+    # the rows are sorted and written as csv, a serialization that stays the same across polars versions unlike
+    # 'hash_rows', so the fingerprint depends on neither the row order nor the polars version
+    canonical = frame.sort(frame.columns, nulls_last=True).write_csv(float_precision=6, null_value="")
+    return hashlib.sha256(canonical.encode()).hexdigest()
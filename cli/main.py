@@ -0,0 +1,322 @@
+# package imports
+import argparse
+import sys
+import time
+import traceback
+
+# function imports
+from typing import Any, Callable
+
+# heavy packages such as supabase and polars are imported inside the commands that need them, so '--help' and
+# argument errors return without paying their import cost
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Runs the 'leaguedb' command line interface.
+
+    Args:
+        argv (list[str] | None = None): The command line arguments, defaults to 'sys.argv'.
+
+    Returns:
+        int: The exit code.
+    """
+    start = time.perf_counter()
+    args = get_parser().parse_args(argv)
+
+    from shared.python.trace import enable_tracing, profile
+
+    if args.trace:
+        enable_tracing(args.trace)
+
+    if args.refresh:
+        from shared.sleeper.client import refresh_cache
+
+        refresh_cache()
+
+    try:
+        with profile(args.profile):
+            args.command(args)
+
+        if args.timing:
+            print(f"Finished {args.name} in {time.perf_counter() - start:.3f}s.", file=sys.stderr)
+
+        return 0
+
+    except Exception as ex:
+        print(f"An error occurred:", file=sys.stderr)
+        traceback.print_exception(type(ex), ex, ex.__traceback__)
+        return 1
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="leaguedb", description="Fantasy football league database pipelines.")
+    parser.add_argument("--trace", metavar="PATH", help="Export timing spans as JSON lines to a path, or '-' for stderr.")
+    parser.add_argument("--profile", choices=["cprofile", "sampling"], help="Profile the command.")
+    parser.add_argument("--timing", action="store_true", help="Print the total run time including startup.")
+    parser.add_argument("--sqlite", metavar="PATH", help="Read and write a local SQLite database instead of Supabase, e.g. one filled by 'mirror'.")
+    parser.add_argument("--refresh", action="store_true", help="Fetch every Sleeper response again once, including completed weeks cached permanently, e.g. after a stat correction.")
+
+    commands = parser.add_subparsers(dest="name", required=True, metavar="command")
+
+    standings = add_command(commands, "standings", "Update the standings of each week and write the league table of the last week.", run_standings)
+    standings.add_argument("--rebuild", action="store_true", help="Rebuild the standings from the stored matchups instead of the current Sleeper rosters, every week when no week is given.")
+    add_odds_arguments(standings)
+    add_output_arguments(standings)
+    add_command(commands, "matchups", "Update the matchups of each week and season.", run_matchups, seasons=True)
+    add_output_arguments(add_command(commands, "power", "Write the all-play records, expected wins, luck and power ranking of the week, the last played week when no week is given.", run_power))
+    add_output_arguments(add_command(commands, "lineups", "Ingest the lineups and player points of each week and write the optimal lineup points and lineup efficiency of every roster.", run_lineups), csv=False)
+    add_output_arguments(add_command(commands, "matchup-table", "Write the matchup table of the week with head-to-head history.", run_matchup_table))
+
+    run = add_command(commands, "all", "Run the standings, matchups and both tables for each week of every given league in one process.", run_all, leagues=True)
+    add_odds_arguments(run)
+    add_output_arguments(run)
+    run.add_argument("--bundle", action="store_true", help="Rebuild the changed weeks of the season bundle of each league after the update.")
+
+    add_command(commands, "bundle", "Build the season bundle of league tables, matchup tables and head-to-head summaries, recalculating only the changed weeks.", run_bundle)
+
+    live = add_command(commands, "live", "Poll the matchups of the week and upsert the scores that changed until its games are over, the current week when no week is given.", run_live)
+    live.add_argument("--min-interval", type=float, default=30.0, help="The seconds between polls right after a score changed.")
+    live.add_argument("--max-interval", type=float, default=1800.0, help="The most seconds between polls outside a game window.")
+
+    mirror = commands.add_parser("mirror", help="Mirror the Supabase tables into the local SQLite database.", description="Mirror the Supabase tables into the local SQLite database.")
+    mirror.add_argument("--push", action="store_true", help="Push the local SQLite rows to Supabase instead.")
+    mirror.add_argument("--table", "--tables", dest="tables", nargs="+", choices=["manager", "club", "standing", "matchup"], help="The tables to mirror, defaults to every table.")
+    mirror.set_defaults(command=run_mirror)
+
+    return parser
+
+def add_command(commands: Any, name: str, description: str, command: Callable[[argparse.Namespace], None], seasons: bool = False, leagues: bool = False) -> argparse.ArgumentParser:
+    parser = commands.add_parser(name, help=description, description=description)
+    parser.add_argument("--week", "--weeks", dest="weeks", type=parse_weeks, help="A week or a range of weeks such as 1-14, defaults to the last week whose games are over.")
+
+    if leagues:
+        parser.add_argument("--league", "--leagues", dest="leagues", nargs="+", help="One or more league keys in shared/leagues.json, defaults to every league.")
+    else:
+        parser.add_argument("--league", dest="leagues", type=lambda league: [league], help="The league key in shared/leagues.json, defaults to the first league.")
+
+    if seasons:
+        parser.add_argument("--season", "--seasons", dest="seasons", nargs="+", help="One or more season years, defaults to the most recent season.")
+    else:
+        parser.add_argument("--season", dest="seasons", type=lambda season: [season], help="The season year, defaults to the most recent season.")
+
+    parser.set_defaults(command=command)
+    return parser
+
+def add_odds_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--odds", action="store_true", help="Simulate the rest of the season and add seed and playoff odds to the league table.")
+    parser.add_argument("--simulations", type=int, default=1_000_000, help="The number of simulated seasons of the playoff odds.")
+
+def add_output_arguments(parser: argparse.ArgumentParser, csv: bool = True) -> None:
+    parser.add_argument("--format", choices=["parquet", "ipc"], default="parquet", help="The format of the output dataset partitioned by league, season and week.")
+
+    if csv:
+        parser.add_argument("--csv", action=argparse.BooleanOptionalAction, default=True, help="Also export the table as a CSV file for the R scripts.")
+
+def parse_weeks(value: str) -> range:
+    from shared.python.utils import MAX_WEEK
+
+    first, _, last = value.partition("-")
+
+    try:
+        weeks = range(int(first), int(last or first) + 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{value=} is not a week or a range of weeks such as 1-14.")
+
+    if not weeks or weeks.start < 1 or weeks.stop > MAX_WEEK + 1:
+        raise argparse.ArgumentTypeError(f"{value=} must be between weeks 1 and {MAX_WEEK}.")
+
+    return weeks
+
+def get_weeks(args: argparse.Namespace, env: dict[str, str], live: bool = False) -> range:
+    if args.weeks is not None:
+        return args.weeks
+
+    from shared.sleeper.league import get_final_week, get_last_week
+
+    # scheduled runs never prompt, they default to the last week whose games are over or, when live, the week after it
+    # up to the final playoff week
+    week = get_last_week(env["sleeper_league_id"])
+    if live:
+        week = min(week + 1, get_final_week(env["sleeper_league_id"]))
+
+    return range(week, week + 1)
+
+def get_leagues(args: argparse.Namespace, latest: bool = False) -> list[dict[str, str]]:
+    from shared.python.league import get_league, get_league_keys
+
+    keys = args.leagues or (get_league_keys() if args.name == "all" else get_league_keys()[:1])
+    if not keys:
+        raise ValueError(f"No leagues were given or registered in shared/leagues.json.")
+
+    return [get_league(key, args.seasons[-1] if args.seasons and not latest else None) for key in keys]
+
+def write_table(args: argparse.Namespace, frame: Any, table: str, env: dict[str, str], week: int, csv_path: str) -> None:
+    from shared.python.output import write_output
+
+    write_output(frame, table, env["league"], env["season"], week, args.format, csv_path if args.csv else None)
+
+def get_client(args: argparse.Namespace) -> Any:
+    if args.sqlite:
+        from shared.sqlite.client import SQLiteClient
+
+        return SQLiteClient(args.sqlite)
+
+    from supabase import create_client
+    from shared.python.env import get_env
+
+    return create_client(get_env("SUPABASE_URL", "supabase url"), get_env("SUPABASE_KEY", "supabase key"))
+
+def run_standings(args: argparse.Namespace) -> None:
+    import polars as pl
+    from league_table.core import get_league_table, rebuild_standings, update_standings
+
+    env = get_leagues(args)[0]
+    weeks = args.weeks if args.rebuild else get_weeks(args, env)
+    client = get_client(args)
+
+    if args.rebuild:
+        standings = rebuild_standings(client, env["season_id"], weeks)
+        print(f"Rebuilt {standings.height} standings for season {env['season']}.")
+        standings = standings.filter(pl.col("week") == standings["week"].max())
+    else:
+        for week in weeks:
+            standings = update_standings(client, env["sleeper_league_id"], env["supabase_league_id"], env["season_id"], week)
+            print(f"Updated {standings.height} standings for week {week}.")
+
+    league_table = get_league_table(client, env["season_id"], standings["week"].max(), standings, supabase_league_id=env["supabase_league_id"])
+
+    if args.odds:
+        from playoff_odds.core import add_playoff_odds, get_playoff_odds
+
+        odds = get_playoff_odds(client, env["sleeper_league_id"], env["supabase_league_id"], env["season_id"], standings["week"].max(), standings, simulations=args.simulations)
+        league_table = add_playoff_odds(league_table, odds)
+
+    write_table(args, league_table.drop(["id", "season", "club_id"], strict=False).sort("standing"), "league_table", env, standings["week"].max(), "league_table/data/league_table.csv")
+
+def run_power(args: argparse.Namespace) -> None:
+    import polars as pl
+    from league_table.core import get_all_play
+
+    env = get_leagues(args)[0]
+    client = get_client(args)
+
+    all_play = get_all_play(client, env["season_id"], supabase_league_id=env["supabase_league_id"])
+    week = args.weeks[-1] if args.weeks is not None else all_play["week"].max()
+
+    power_rankings = all_play.filter(pl.col("week") == week).drop(["season", "club_id"]).with_columns(pl.col("expected_wins").round(2))
+    write_table(args, power_rankings, "power_rankings", env, week, "league_table/data/power_rankings.csv")
+
+def run_lineups(args: argparse.Namespace) -> None:
+    import polars as pl
+    from lineup.core import get_lineup_efficiency
+    from shared.python.output import write_output
+
+    env = get_leagues(args)[0]
+    weeks = get_weeks(args, env)
+
+    efficiency = get_lineup_efficiency(env["sleeper_league_id"], env["league"], env["season"], weeks, args.format)
+
+    for week in weeks:
+        write_output(efficiency.filter(pl.col("week") == week), "lineup_efficiency", env["league"], env["season"], week, args.format)
+
+def run_matchups(args: argparse.Namespace) -> None:
+    from matchup_history.core import backfill_matchups, update_matchups
+    from shared.python.league import get_league, get_season_ids
+
+    # a backfill of several seasons runs through the most recent league, see below
+    env = get_leagues(args, latest=len(args.seasons or []) > 1)[0]
+    weeks = get_weeks(args, env)
+    client = get_client(args)
+
+    if len(weeks) == 1 and len(args.seasons or []) <= 1:
+        matchups = update_matchups(client, env["sleeper_league_id"], env["supabase_league_id"], env["season_id"], weeks[0])
+        print(f"Updated {matchups.height} matchups for week {weeks[0]}.")
+        return
+
+    # backfill every season through the Sleeper league chain of the most recent season, so past seasons only need a season id
+    season_ids = get_season_ids(env["league"], args.seasons or [env["season"]])
+    sleeper_league_id = env["sleeper_league_id"] if max(season_ids) <= env["season"] else get_league(env["league"], max(season_ids))["sleeper_league_id"]
+    matchups = backfill_matchups(client, sleeper_league_id, env["supabase_league_id"], season_ids, weeks)
+    print(f"Backfilled {matchups.height} matchups for seasons {list(season_ids)}.")
+
+def run_matchup_table(args: argparse.Namespace) -> None:
+    from matchup_table.core import get_matchup_table
+    from shared.store.matchup import scan_matchups, sync_matchups
+
+    env = get_leagues(args)[0]
+    weeks = get_weeks(args, env)
+    client = get_client(args)
+
+    _ = sync_matchups(client)
+    matchup_table = get_matchup_table(client, env["season_id"], env["supabase_league_id"], weeks[-1], history=scan_matchups())
+    write_table(args, matchup_table, "matchup_table", env, weeks[-1], "matchup_table/data/matchup_table.csv")
+
+def run_all(args: argparse.Namespace) -> None:
+    from weekly.core import run_leagues
+
+    leagues = get_leagues(args)
+    weeks = get_weeks(args, leagues[0])
+    client = get_client(args)
+
+    # every league shares the client and one bounded pool of stages
+    for week in weeks:
+        results = run_leagues(client, leagues, week)
+
+    # a single league keeps the CSV paths read by the R scripts, several leagues export to a folder per league
+    for env in leagues:
+        tables = results[env["league"]]
+
+        if args.odds:
+            from playoff_odds.core import add_playoff_odds, get_playoff_odds
+
+            odds = get_playoff_odds(client, env["sleeper_league_id"], env["supabase_league_id"], env["season_id"], weeks[-1], tables["standings"], simulations=args.simulations)
+            tables["league_table"] = add_playoff_odds(tables["league_table"], odds)
+
+        folder = "" if len(leagues) == 1 else f"{env['league']}/"
+        write_table(args, tables["league_table"].drop(["id", "season", "club_id"], strict=False).sort("standing"), "league_table", env, weeks[-1], f"league_table/data/{folder}league_table.csv")
+        write_table(args, tables["matchup_table"], "matchup_table", env, weeks[-1], f"matchup_table/data/{folder}matchup_table.csv")
+
+        if args.bundle:
+            from bundle.core import build_bundle
+
+            build_bundle(client, env["league"], env["season"], env["season_id"], env["supabase_league_id"])
+
+def run_bundle(args: argparse.Namespace) -> None:
+    from bundle.core import build_bundle, get_bundle_path
+
+    env = get_leagues(args)[0]
+    client = get_client(args)
+
+    manifest = build_bundle(client, env["league"], env["season"], env["season_id"], env["supabase_league_id"])
+    print(f"Bundle revision {manifest['revision']} of {len(manifest['weeks'])} weeks at {get_bundle_path(env['league'], env['season'])}, rebuilt weeks {manifest['rebuilt']}.")
+
+def run_live(args: argparse.Namespace) -> None:
+    from matchup_history.live import poll_matchups
+    from shared.sleeper.league import is_season_over
+
+    env = get_leagues(args)[0]
+
+    if args.weeks is None and is_season_over(env["sleeper_league_id"]):
+        print(f"Season {env['season']} of league {env['league']} is over, there is no live week to poll.", file=sys.stderr)
+        return
+
+    weeks = get_weeks(args, env, live=True)
+    client = get_client(args)
+
+    try:
+        _, counts = poll_matchups(client, env["sleeper_league_id"], env["supabase_league_id"], env["season_id"], weeks[-1], args.min_interval, args.max_interval)
+        print(f"Polled live matchups for week {weeks[-1]} {counts['polls']} times: {counts['inserted']} inserted, {counts['updated']} updated.")
+    except KeyboardInterrupt:
+        print(f"Stopped polling live matchups.", file=sys.stderr)
+
+def run_mirror(args: argparse.Namespace) -> None:
+    from shared.sqlite.client import SQLITE_PATH, SQLiteClient
+    from shared.sqlite.mirror import mirror_tables
+
+    local = SQLiteClient(args.sqlite or SQLITE_PATH)
+    remote = get_client(argparse.Namespace(sqlite=None))
+
+    counts = mirror_tables(local, remote, args.tables, ids=False) if args.push else mirror_tables(remote, local, args.tables)
+    print(f"Mirrored {', '.join(f'{count} {table}' for table, count in counts.items())} rows {'to Supabase' if args.push else f'to {local.path}'}.")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,11 +6,15 @@ from supabase import Client
 from typing import Any
 
 # local imports
-from shared.sleeper.roster import get_sleeper_rosters
-from shared.supabase.club import get_clubs
-from shared.supabase.standing import get_standings, upsert_standings
+from shared.python.enum import get_enum
+from shared.python.registry import create_club_lookup, encode_clubs, get_club_frame, get_club_lookup, get_club_rows
+from shared.python.trace import annotate, traced
+from shared.sleeper.roster import get_sleeper_rosters_frame
+from shared.supabase.matchup import get_matchups_frame
+from shared.supabase.standing import get_standings_frame, write_standings
 
-def get_league_table(client: Client, season_id: str, week: int) -> pl.DataFrame:
+@traced
+def get_league_table(client: Client, season_id: str, week: int, standings: pl.DataFrame | None = None, clubs: list[dict[str, Any]] | None = None, supabase_league_id: str | None = None) -> pl.DataFrame:
     """
     Gets the league table for a given season and fantasy week.
 
@@ -18,75 +22,329 @@ def get_league_table(client: Client, season_id: str, week: int) -> pl.DataFrame:
         client (Client): The Supabase client instance.
         season_id (str): The Supabase UUID of the season.
         week (int): The week number of the league table.
+        standings (polars.DataFrame | None = None): The optional standings of the week already returned by 'update_standings'.
+        Only the standings of the previous week are read from the Supabase database when given.
+        clubs (list[dict[str, Any]] | None = None): The optional club rows already returned by 'get_clubs'.
+        supabase_league_id (str | None = None): The optional Supabase UUID of the league to filter the clubs by.
 
     Returns:
         polars.DataFrame: A DataFrame of the current league table.
     """
     try:
         # get standings
-        standings = get_standings(client, season_id)
         if standings is None:
+            if (standings := get_standings_frame(client, season_id)) is None:
+                raise RuntimeError(f"No standing records were returned for {season_id=}.")
+
+        elif week > 1 and (previous_standings := get_standings_frame(client, season_id, week - 1)) is not None:
+            standings = pl.concat([standings, previous_standings], how="diagonal_relaxed")
+
+        # get clubs
+        if clubs is None:
+            clubs = get_club_rows(client, supabase_league_id)
+
+        # calculate the league table of the week and the week before it for move
+        league_tables = calculate_league_tables(
+            standings.lazy().filter(pl.col("week").is_between(week - 1, week)),
+            get_club_frame(clubs).lazy()
+        )
+
+        return league_tables.filter(pl.col("week") == week).collect()
+
+    except Exception as ex:
+        raise RuntimeError(f"Error getting league table.") from ex
+
+@traced
+def get_league_tables(client: Client, season_id: str, supabase_league_id: str | None = None, clubs: list[dict[str, Any]] | None = None) -> pl.DataFrame:
+    """
+    Gets the league table of every week of a given season in one query plan.
+
+    Args:
+        client (Client): The Supabase client instance.
+        season_id (str): The Supabase UUID of the season.
+        supabase_league_id (str | None = None): The optional Supabase UUID of the league to filter the clubs by.
+        clubs (list[dict[str, Any]] | None = None): The optional club rows already returned by 'get_clubs'.
+
+    Returns:
+        polars.DataFrame: A DataFrame of the league tables of every week, sorted by week and standing.
+    """
+    try:
+        # get standings
+        if (standings := get_standings_frame(client, season_id)) is None:
             raise RuntimeError(f"No standing records were returned for {season_id=}.")
-        
-        standings = pl.DataFrame(standings).rename({ "club": "club_id" })
-        
+
         # get clubs
-        clubs = get_clubs(client)
         if clubs is None:
-            raise RuntimeError(f"No club records were returned.")
-        
-        clubs = pl.DataFrame(clubs).select([
+            clubs = get_club_rows(client, supabase_league_id)
+
+        return calculate_league_tables(standings.lazy(), get_club_frame(clubs).lazy()).sort(["week", "standing"]).collect()
+
+    except Exception as ex:
+        raise RuntimeError(f"Error getting league tables.") from ex
+
+def calculate_league_tables(standings: pl.LazyFrame, clubs: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Calculates the 'ortg', 'drtg', 'eff' and 'move' columns of the league table for every week of the standings.
+    The 'eff' is null for clubs without a positive 'mpf', e.g. rebuilt standings whose max points for are unknown.
+    The 'move' column subtracts the standing from the standing of the previous week with a window over each club ordered by week.
+    The join and window run on the integer codes of the club Enum and 'club_id' is decoded to the club UUID at the end.
+
+    Args:
+        standings (polars.LazyFrame): The rows of the Supabase 'standing' table.
+        clubs (polars.LazyFrame): The club frame returned by 'get_club_frame' with 'id', 'name' and 'manager' columns.
+
+    Returns:
+        polars.LazyFrame: A LazyFrame of the league table of every week.
+    """
+    previous_week = pl.col("week").shift(1).over("club_id", order_by="week")
+    previous_standing = pl.col("standing").shift(1).over("club_id", order_by="week")
+    move = pl.when(previous_week == pl.col("week") - 1).then(previous_standing - pl.col("standing"))
+
+    club_enum = clubs.collect_schema()["id"]
+
+    return (
+        standings
+        .with_columns(encode_clubs(club_enum, "club"))
+        .rename({ "club": "club_id" })
+        .join(clubs.select([
             pl.col("id").alias("club_id"),
             pl.col("name").alias("club"),
             pl.col("manager").alias("manager")
+        ]), on="club_id", how="inner")
+        .with_columns([
+            (pl.col("pf") / pl.col("week")).round(2).alias("ortg"),
+            (pl.col("pa") / pl.col("week")).round(2).alias("drtg"),
+            pl.when(pl.col("mpf") > 0).then((pl.col("pf") / pl.col("mpf")).round(3)).alias("eff"),
+            move.alias("move")
         ])
+        .with_columns(
+            pl.when(pl.col("move") > 0)
+              .then(pl.concat_str([pl.lit("+"), pl.col("move").cast(pl.Utf8)]))
+              .when(pl.col("move") < 0)
+              .then(pl.col("move").cast(pl.Utf8))
+              .otherwise(pl.lit(""))
+              .alias("move")
+        )
+        .with_columns(pl.col("club_id").cast(pl.String))
+    )
+
+@traced
+def get_all_play(client: Client, season_id: str | None = None, week: int | None = None, previous: pl.DataFrame | None = None, clubs: list[dict[str, Any]] | None = None, supabase_league_id: str | None = None) -> pl.DataFrame:
+    """
+    Gets the all-play records, expected wins, luck and power ranking of every club after every regular season week.
+    Every season of the league is included if no season is given. Given a season, a week and the all-play table of the
+    weeks before it, only the matchups of that week are read and added to the previous totals. Rows of the previous table
+    at or after the week are replaced, so the same week can be added again.
+
+    Args:
+        client (Client): The Supabase client instance.
+        season_id (str | None = None): The optional Supabase UUID of the season.
+        week (int | None = None): The optional week number to add to the previous all-play table.
+        previous (polars.DataFrame | None = None): The optional all-play table of the weeks before the week already returned by 'get_all_play'.
+        Requires a season and a week.
+        clubs (list[dict[str, Any]] | None = None): The optional club rows already returned by 'get_clubs'.
+        supabase_league_id (str | None = None): The optional Supabase UUID of the league to filter the clubs by.
+
+    Returns:
+        polars.DataFrame: A DataFrame of the all-play table of every week, sorted by season, week and power ranking.
+        With a week and previous all-play table, the previous table with the week added.
+    """
+    if previous is not None and (season_id is None or week is None):
+        raise ValueError(f"Adding a week to a previous all-play table requires a season and a week, got {season_id=} and {week=}.")
+
+    try:
+        # get matchups
+        if (matchups := get_matchups_frame(client, season_id, week, max_workers=4)) is None:
+            raise RuntimeError(f"No matchup records were returned for {season_id=} and {week=}.")
+
+        # get clubs
+        if clubs is None:
+            clubs = get_club_rows(client, supabase_league_id)
 
-        # merge club name into the standings dataframe
-        standings = pl.DataFrame(standings).join(pl.DataFrame(clubs), on="club_id", how="inner")
+        club_frame = get_club_frame(clubs).lazy()
+        club_enum = club_frame.collect_schema()["id"]
 
-        # calculate ortg, drtg, and eff for current standings
-        current_standings = pl.DataFrame(standings).filter(pl.col("week") == week).with_columns([
-            (pl.col("pf") / week).round(2).alias("ortg"),
-            (pl.col("pa") / week).round(2).alias("drtg"),
-            (pl.col("pf") / pl.col("mpf")).round(3).alias("eff")
+        # matchups of clubs outside the league are dropped by the club Enum
+        matchups = (
+            matchups.lazy()
+            .filter(pl.col("stage") == get_enum("stage")["regular"])
+            .with_columns(encode_clubs(club_enum, "club_x", "club_y"))
+            .drop_nulls(["club_x", "club_y"])
+        )
+
+        # only the weeks of the season before the week are kept from the previous table
+        if previous is not None:
+            previous = previous.filter((pl.col("season") != season_id) | (pl.col("week") < week))
+
+        totals = previous.lazy().drop(["club", "manager"]).rename({ "club_id": "club" }).with_columns(encode_clubs(club_enum, "club")) if previous is not None else None
+
+        all_play = (
+            calculate_all_play(matchups, totals)
+            .rename({ "club": "club_id" })
+            .join(club_frame.select([pl.col("id").alias("club_id"), pl.col("name").alias("club"), "manager"]), on="club_id", how="inner")
+            .with_columns(pl.col("club_id").cast(pl.String))
+        )
+
+        if previous is not None:
+            all_play = pl.concat([previous.lazy(), all_play], how="diagonal_relaxed")
+
+        return all_play.sort(["season", "week", "power"]).collect()
+
+    except Exception as ex:
+        raise RuntimeError(f"Error getting all-play records.") from ex
+
+def calculate_all_play(matchups: pl.LazyFrame, previous: pl.LazyFrame | None = None) -> pl.LazyFrame:
+    """
+    Calculates the cumulative all-play records, expected wins, luck and power ranking of every club after every week in one pass.
+    The all-play record of a club in a week is its score against the score of every other club that week. Ranking the scores
+    within each week gives the all-play wins and losses without comparing every pair of clubs.
+    Expected wins are the all-play win rate of each week summed over the season, luck is the actual wins minus the expected
+    wins, and the power ranking orders the clubs of each week by expected wins and then points for.
+    Expected wins are not rounded so adding a week to a previous all-play table ranks the same as a full rebuild.
+
+    Args:
+        matchups (polars.LazyFrame): The rows of the Supabase 'matchup' table.
+        previous (polars.LazyFrame | None = None): The optional all-play table of the weeks before the matchups to add the totals to.
+        Only the rows of each season before the first week of its matchups are added.
+
+    Returns:
+        polars.LazyFrame: A LazyFrame of all-play rows with 'season', 'week', 'club', 'win', 'loss', 'draw', 'pf', 'all_play_win',
+        'all_play_loss', 'all_play_draw', 'all_play_pct', 'expected_wins', 'luck' and 'power' columns.
+    """
+    week = ["season", "week"]
+    clubs = pl.len().over(week).cast(pl.Int64)
+    totals = ["win", "loss", "draw", "pf", "all_play_win", "all_play_loss", "all_play_draw", "expected_wins"]
+
+    all_play = (
+        _club_results(matchups)
+        .with_columns([
+            (pl.col("pf").rank("min").over(week).cast(pl.Int64) - 1).alias("all_play_win"),
+            (clubs - pl.col("pf").rank("max").over(week).cast(pl.Int64)).alias("all_play_loss")
         ])
+        .with_columns((clubs - 1 - pl.col("all_play_win") - pl.col("all_play_loss")).alias("all_play_draw"))
+        .with_columns(
+            pl.when(clubs > 1)
+              .then((pl.col("all_play_win") + 0.5 * pl.col("all_play_draw")) / (clubs - 1))
+              .otherwise(0.0)
+              .alias("expected_wins")
+        )
+        .with_columns([pl.col(column).cum_sum().over(["season", "club"], order_by="week") for column in totals])
+    )
 
-        if week == 1:
-            return current_standings
+    # add the totals of the last previous week of each club before the matchups
+    if previous is not None:
+        first = matchups.group_by("season").agg(pl.col("week").min().alias("first_week"))
+        last = (
+            previous
+            .join(first, on="season", how="inner")
+            .filter(pl.col("week") < pl.col("first_week"))
+            .group_by(["season", "club"])
+            .agg([pl.col(column).sort_by("week").last().alias(f"previous_{column}") for column in totals])
+        )
+        all_play = (
+            all_play
+            .join(last, on=["season", "club"], how="left")
+            .with_columns([(pl.col(column) + pl.col(f"previous_{column}").fill_null(0)).alias(column) for column in totals])
+            .drop([f"previous_{column}" for column in totals])
+        )
+
+    games = pl.col("all_play_win") + pl.col("all_play_loss") + pl.col("all_play_draw")
+
+    return (
+        all_play
+        .with_columns([
+            pl.col("pf").round(2),
+            ((pl.col("all_play_win") + 0.5 * pl.col("all_play_draw")) / games).round(3).alias("all_play_pct"),
+            (pl.col("win") + 0.5 * pl.col("draw") - pl.col("expected_wins")).round(2).alias("luck")
+        ])
+        .sort(["season", "week", "expected_wins", "pf"], descending=[False, False, True, True])
+        .with_columns(pl.int_range(1, pl.len() + 1).over(week).alias("power"))
+        .select(["season", "week", "club", "win", "loss", "draw", "pf", "all_play_win", "all_play_loss", "all_play_draw", "all_play_pct", "expected_wins", "luck", "power"])
+    )
 
-        # calculate move for current standings
-        return calculate_move(current_standings, pl.DataFrame(standings).filter(pl.col("week") == week - 1))
+@traced
+def rebuild_standings(client: Client, season_id: str, weeks: range | None = None, batch_size: int = 500) -> pl.DataFrame:
+    """
+    Rebuilds the standings of every week of a season from the regular season matchups in the Supabase 'matchup' table
+    and upserts the new and changed standings in bulk, so missed weeks and past seasons can be backfilled.
+    The 'mpf' of a rebuilt standing is kept from the stored standing since it cannot be derived from the matchups.
+    Standings without a stored 'mpf' are written without the column, so they take its default instead of an explicit null.
+
+    Args:
+        client (Client): The Supabase client.
+        season_id (str): The Supabase UUID of the season.
+        weeks (range | None = None): The optional week numbers of the standings to write, every week with matchups if not given.
+        batch_size (int = 500): The maximum number of standings per upsert.
+
+    Returns:
+        polars.DataFrame: A DataFrame with the rebuilt records, without the 'id' of inserted records.
+    """
+    try:
+        # get the matchups of the season
+        if (matchups := get_matchups_frame(client, season_id, max_workers=4)) is None:
+            raise RuntimeError(f"No matchup records were returned for {season_id=}.")
+
+        # the weeks before the first written week are still needed for the cumulative records
+        standings = calculate_standings(matchups.lazy().filter(pl.col("stage") == get_enum("stage")["regular"]))
+        if weeks is not None:
+            standings = standings.filter(pl.col("week").is_in(list(weeks)))
+
+        # keep the stored 'mpf' of each standing
+        if (stored := get_standings_frame(client, season_id, columns="club, week, mpf", max_workers=4)) is not None:
+            standings = standings.join(stored.lazy().select(["club", "week", pl.col("mpf").cast(pl.Float64)]), on=["club", "week"], how="left")
+        else:
+            standings = standings.with_columns(pl.lit(None, dtype=pl.Float64).alias("mpf"))
+
+        # upsert the new and changed standings in batches, leaving out 'mpf' where it is unknown
+        rebuilt = standings.collect()
+        written: list[dict[str, Any]] = []
+        counts = { "inserted": 0, "updated": 0, "unchanged": 0 }
+
+        for part in (rebuilt.filter(pl.col("mpf").is_not_null()), rebuilt.filter(pl.col("mpf").is_null()).drop("mpf")):
+            if part.height:
+                part_written, part_counts = write_standings(client, part.to_dicts(), chunk_size=batch_size, minimal=True)
+                written.extend(part_written)
+                counts = { key: counts[key] + part_counts[key] for key in counts }
+
+        annotate(**counts, missing_mpf=rebuilt["mpf"].null_count())
+
+        # rows written without 'mpf' are returned with a null 'mpf'
+        frame = pl.DataFrame(written, infer_schema_length=None)
+        return frame if frame.is_empty() or "mpf" in frame.columns else frame.with_columns(pl.lit(None, dtype=pl.Float64).alias("mpf"))
 
     except Exception as ex:
-        raise RuntimeError(f"Error getting league table.") from ex
-    
-def calculate_move(current_standings: pl.DataFrame, previous_standings: pl.DataFrame) -> pl.DataFrame:
+        raise RuntimeError(f"Error rebuilding standings.") from ex
+
+def calculate_standings(matchups: pl.LazyFrame) -> pl.LazyFrame:
     """
-    Calculates the 'move' column for the current standings by subtracting the standing from the previous standing.
+    Calculates the cumulative standings of every club after every week from matchups in one pass.
+    Each matchup is split into a row per club, the results are summed cumulatively over each club ordered by week and the
+    clubs are ranked within each week by wins and then points for, the same ordering as 'get_sleeper_rosters'.
+    Matchups where both scores are zero have not been played and are left out.
 
     Args:
-        current_standings (polars.DataFrame): The standings for the current week.
-        previous_standings (polars.DataFrame): The standings for the previous week.
+        matchups (polars.LazyFrame): The rows of the Supabase 'matchup' table.
 
     Returns:
-        polars.DataFrame: A DataFrame of the current standings with a 'move' column.
-    """
-    standings = current_standings.join(previous_standings.select(["club_id", "standing"]).rename({"standing": "previous"}), on="club_id", how="left")
-    standings = standings.with_columns((pl.col("previous") - pl.col("standing")).alias("move"))
-    
-    return standings.with_columns(
-        pl.when(pl.col("move") > 0)
-          .then(pl.concat_str([pl.lit("+"), pl.col("move").cast(pl.Utf8)]))
-          .when(pl.col("move") < 0)
-          .then(pl.col("move").cast(pl.Utf8))
-          .otherwise(pl.lit(""))
-          .alias("move")
-    ).drop(["previous"])
-
-def update_standings(client: Client, sleeper_league_id: str, supabase_league_id: str, season_id: str, week: int) -> pl.DataFrame:
+        polars.LazyFrame: A LazyFrame of standing rows with 'season', 'club', 'week', 'standing', 'win', 'loss', 'draw', 'pf' and 'pa' columns.
+    """
+    return (
+        _club_results(matchups)
+        .with_columns([
+            pl.col(column).cum_sum().over(["season", "club"], order_by="week")
+            for column in ("win", "loss", "draw", "pf", "pa")
+        ])
+        .with_columns([pl.col("pf").round(2), pl.col("pa").round(2)])
+        .sort(["season", "week", "win", "pf"], descending=[False, False, True, True])
+        .with_columns(pl.int_range(1, pl.len() + 1).over(["season", "week"]).alias("standing"))
+        .select(["season", "club", "week", "standing", "win", "loss", "draw", "pf", "pa"])
+    )
+
+@traced
+def update_standings(client: Client, sleeper_league_id: str, supabase_league_id: str, season_id: str, week: int, rosters: pl.DataFrame | None = None, clubs: list[dict[str, Any]] | None = None) -> pl.DataFrame:
     """
     Updates the weekly standings in the Supabase 'standing' table with roster data from the Sleeper API and returns a polars DataFrame.
-    Makes use of the 'get_rosters(sleeper_league_id: str)' and the 'upsert_standings(client: Client, season_id: str, week: int, rosters: list[dict[str, str]])' functions.
+    Makes use of the 'get_sleeper_rosters_frame(sleeper_league_id: str)' and the 'write_standings(client: Client, standings: list[dict[str, Any]])' functions, so only new and changed standings are upserted.
 
     Args:
         client (Client): The Supabase client.
@@ -94,44 +352,55 @@ def update_standings(client: Client, sleeper_league_id: str, supabase_league_id:
         supabase_league_id: str: The Supabase UUID of the league.
         season_id (str): The Supabase UUID of the season.
         week (int): The week number for the standings.
+        rosters (polars.DataFrame | None = None): The optional rosters already returned by 'get_sleeper_rosters_frame'.
+        clubs (list[dict[str, Any]] | None = None): The optional club rows already returned by 'get_clubs'.
 
     Returns:
-        polars.DataFrame: A DataFrame with the records upserted into the 'standing' table.
+        polars.DataFrame: A DataFrame with the records of the week as stored in the 'standing' table.
     """
     try:
         # get sleeper rosters
-        if not (rosters := get_sleeper_rosters(sleeper_league_id)):
+        if (rosters := rosters if rosters is not None else get_sleeper_rosters_frame(sleeper_league_id)).is_empty():
             raise RuntimeError(f"No rosters were returned in the Sleeper API response for {sleeper_league_id=}.")
 
-        # get clubs
-        if not (clubs := get_clubs(client, supabase_league_id)):
-            raise RuntimeError(f"No club records were returned from the Supabase database for {supabase_league_id=}.")
+        # get club lookup
+        club_lookup = create_club_lookup(clubs) if clubs is not None else get_club_lookup(client, supabase_league_id)
 
-        # club lookup dict
-        club_lookup = { club["sleeper"]: club["id"] for club in clubs if club.get("sleeper") }
-        
         # create standings to upsert
-        standings: list[dict[str, Any]] = [
-            {
-                "season": season_id,
-                "club": club_lookup[roster["id"]],
-                "week": week,
-                "standing": int(roster["standing"]),
-                "win": int(roster["win"]),
-                "loss": int(roster["loss"]),
-                "draw": int(roster["draw"]),
-                "pf": float(roster["pf"]),
-                "pa": float(roster["pa"]),
-                "mpf": float(roster["mpf"])
-            } for roster in rosters
-            if roster["id"] in club_lookup
-        ]
-
-        # upsert the standings
-        if (upsert_response := upsert_standings(client, standings)) is None:
-            raise RuntimeError(f"No data was returned in the upsert response for {season_id=} and {week=}.")
-    
-        return pl.DataFrame(upsert_response)
+        standings: list[dict[str, Any]] = (
+            rosters
+            .filter(pl.col("id").is_in(list(club_lookup)))
+            .select([
+                pl.lit(season_id).alias("season"),
+                pl.col("id").replace_strict(club_lookup, return_dtype=pl.String).alias("club"),
+                pl.lit(week, dtype=pl.Int64).alias("week"),
+                "standing", "win", "loss", "draw",
+                pl.col(["pf", "pa", "mpf"]).cast(pl.Float64)
+            ])
+            .to_dicts()
+        )
+
+        # upsert the new and changed standings
+        written, counts = write_standings(client, standings)
+        annotate(**counts)
+
+        return pl.DataFrame(written)
 
     except Exception as ex:
-        raise RuntimeError(f"Error updating standings.") from ex
\ No newline at end of file
+        raise RuntimeError(f"Error updating standings.") from ex
+
+def _club_results(matchups: pl.LazyFrame) -> pl.LazyFrame:
+    # one row per club and played week with the points for and against and the result
+    played = matchups.filter((pl.col("score_x") != 0) | (pl.col("score_y") != 0))
+
+    return (
+        pl.concat([
+            played.select(["season", "week", pl.col("club_x").alias("club"), pl.col("score_x").cast(pl.Float64).alias("pf"), pl.col("score_y").cast(pl.Float64).alias("pa")]),
+            played.select(["season", "week", pl.col("club_y").alias("club"), pl.col("score_y").cast(pl.Float64).alias("pf"), pl.col("score_x").cast(pl.Float64).alias("pa")])
+        ])
+        .with_columns([
+            (pl.col("pf") > pl.col("pa")).cast(pl.Int64).alias("win"),
+            (pl.col("pf") < pl.col("pa")).cast(pl.Int64).alias("loss"),
+            (pl.col("pf") == pl.col("pa")).cast(pl.Int64).alias("draw")
+        ])
+    )
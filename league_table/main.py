@@ -10,23 +10,19 @@ from supabase import Client, create_client
 
 # local imports
 from league_table.core import get_league_table, update_standings
+from shared.python.league import get_league, get_league_keys
+from shared.python.output import write_output
+from shared.python.trace import profile
 from shared.python.utils import get_week
 
 load_dotenv()
 
-league: str = "HOMIES"
+# the league is read from the league registry in shared/leagues.json, the first league unless LEAGUE is set
+league: dict[str, str] = get_league(os.getenv("LEAGUE") or get_league_keys()[0])
 
-season_id: str | None = os.getenv(f"{league}_2025_SUPABASE")
-if not season_id:
-    raise ValueError(f"Failed to retrieve the environment variable for season id.")
-
-sleeper_league_id: str | None = os.getenv(f"{league}_2025_SLEEPER")
-if not sleeper_league_id:
-    raise ValueError(f"Failed to retrieve the environment variable for sleeper league id.")
-
-supabase_league_id: str | None = os.getenv(f"{league}_ID")
-if not supabase_league_id:
-    raise ValueError(f"Failed to retrieve the environment variable for supabase league id.")
+season_id: str = league["season_id"]
+sleeper_league_id: str = league["sleeper_league_id"]
+supabase_league_id: str = league["supabase_league_id"]
 
 supabase_url: str | None = os.getenv("SUPABASE_URL")
 if not supabase_url:
@@ -43,14 +39,17 @@ try:
     # initialize the Supabase client
     client: Client = create_client(supabase_url, supabase_key)
 
-    # update the most recent standings
-    _ = update_standings(client, sleeper_league_id, supabase_league_id, season_id, week)
+    # profile the pipeline when LEAGUEDB_PROFILE is set, spans are exported when LEAGUEDB_TRACE is set
+    with profile():
+        # update the most recent standings
+        standings: pl.DataFrame = update_standings(client, sleeper_league_id, supabase_league_id, season_id, week)
+        print(f"Updated {standings.height} standings for week {week}.")
 
-    # get the most recent league table
-    league_table: pl.DataFrame = get_league_table(client, season_id, week)
+        # get the most recent league table
+        league_table: pl.DataFrame = get_league_table(client, season_id, week, supabase_league_id=supabase_league_id)
 
-    # save the league table as a .csv
-    league_table.drop(["id", "season", "club_id"]).sort("standing").write_csv("league_table/data/league_table.csv")
+        # save the league table to its partition of the output dataset and export it as a .csv
+        write_output(league_table.drop(["id", "season", "club_id"]).sort("standing"), "league_table", league["league"], league["season"], week, csv_path="league_table/data/league_table.csv")
 
 except Exception as ex:
     print(f"An error occurred:")
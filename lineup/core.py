@@ -0,0 +1,245 @@
+# package imports
+import polars as pl
+
+# function imports
+from functools import cache
+from itertools import combinations
+from pathlib import Path
+from typing import Any
+
+# local imports
+from shared.python.output import scan_output, write_output
+from shared.python.trace import span, traced
+from shared.sleeper.client import fetch_concurrently
+from shared.sleeper.league import get_sleeper_league
+from shared.sleeper.matchup import get_sleeper_matchup_data
+from shared.sleeper.player import get_players
+from shared.sleeper.roster import get_sleeper_roster_data
+
+LINEUP_SCHEMA: dict[str, pl.DataType] = {
+    "week": pl.Int64(),
+    "sleeper_id": pl.String(),
+    "matchup_id": pl.Int64(),
+    "player_id": pl.String(),
+    "slot": pl.String(),
+    "points": pl.Float64()
+}
+
+# roster slots that never score
+BENCH_SLOTS: frozenset[str] = frozenset({ "BN", "IR", "TAXI" })
+
+# roster slots of players that cannot be started, left out of the optimal lineup
+RESERVE_SLOTS: frozenset[str] = frozenset({ "IR", "TAXI" })
+
+# the positions each flex slot accepts, filled from the narrowest to the widest after every dedicated slot when the flex
+# slots of a league are nested or disjoint, and assigned exactly otherwise
+FLEX_SLOTS: dict[str, list[str]] = {
+    "WRRB_FLEX": ["RB", "WR"],
+    "REC_FLEX": ["WR", "TE"],
+    "FLEX": ["RB", "WR", "TE"],
+    "SUPER_FLEX": ["QB", "RB", "WR", "TE"],
+    "IDP_FLEX": ["DL", "LB", "DB"]
+}
+
+@traced
+def ingest_lineups(sleeper_league_id: str, league: str, season: str, weeks: range, format: str = "parquet", root: Path | None = None, max_workers: int = 8) -> pl.DataFrame:
+    """
+    Ingests the lineup of every roster for the given weeks and writes each week to its partition of the 'lineup' dataset.
+    Every rostered player is a row with the roster slot the player started in, or 'BN' on the bench, 'IR' on injured reserve
+    and 'TAXI' on the taxi squad, and the player's points.
+
+    Args:
+        sleeper_league_id (str): The Sleeper id of the league.
+        league (str): The key of the league, e.g. 'HOMIES'.
+        season (str): The season year, e.g. '2025'.
+        weeks (range): The week numbers to ingest.
+        format (str = "parquet"): The format of the dataset, 'parquet' or 'ipc'.
+        root (Path | None = None): The root directory of every dataset, defaults to 'OUTPUT_PATH'.
+        max_workers (int = 8): The maximum number of concurrent Sleeper API requests.
+
+    Returns:
+        polars.DataFrame: A DataFrame with the lineup rows of every given week.
+    """
+    try:
+        roster_positions: list[str] = get_sleeper_league(sleeper_league_id)["roster_positions"]
+        roster_data = get_sleeper_roster_data(sleeper_league_id)
+
+        lineups: list[pl.DataFrame] = []
+        for week, matchup_data in fetch_concurrently(lambda week: get_sleeper_matchup_data(sleeper_league_id, week), weeks, max_workers):
+            lineup = create_lineups(matchup_data, roster_data, roster_positions, week)
+            write_output(lineup, "lineup", league, season, week, format, root=root)
+            lineups.append(lineup)
+
+        return pl.concat(lineups).sort(["week", "matchup_id", "sleeper_id"]) if lineups else pl.DataFrame(schema=LINEUP_SCHEMA)
+
+    except Exception as ex:
+        raise RuntimeError(f"Error ingesting the lineups of {sleeper_league_id=} for {weeks=}.") from ex
+
+def create_lineups(matchup_data: list[dict[str, Any]], roster_data: list[dict[str, Any]], roster_positions: list[str], week: int) -> pl.DataFrame:
+    """
+    Creates the lineup rows of a week from the raw Sleeper matchup data.
+
+    Args:
+        matchup_data (list[dict[str, Any]]): The raw matchup data returned by 'get_sleeper_matchup_data'.
+        roster_data (list[dict[str, Any]]): The raw roster data returned by 'get_sleeper_roster_data'.
+        roster_positions (list[str]): The roster slots of the Sleeper league, e.g. ['QB', 'RB', 'FLEX', 'BN'].
+        week (int): The week number of the matchups.
+
+    Returns:
+        polars.DataFrame: A DataFrame with the 'week', 'sleeper_id', 'matchup_id', 'player_id', 'slot' and 'points' of every rostered player.
+    """
+    sleeper_lookup = { roster["roster_id"]: roster["owner_id"] for roster in roster_data }
+    reserve_lookup = {
+        roster["roster_id"]: { **{ player_id: "TAXI" for player_id in roster.get("taxi") or [] }, **{ player_id: "IR" for player_id in roster.get("reserve") or [] } }
+        for roster in roster_data
+    }
+    starter_slots = [slot for slot in roster_positions if slot not in BENCH_SLOTS]
+
+    columns: dict[str, list[Any]] = { column: [] for column in LINEUP_SCHEMA }
+    for matchup in matchup_data:
+        points: dict[str, float] = matchup.get("players_points") or {}
+
+        # sleeper marks an empty starting slot with the player id '0'
+        slots = { player_id: slot for player_id, slot in zip(matchup.get("starters") or [], starter_slots) if player_id != "0" }
+        players = matchup.get("players") or list(slots)
+        reserve = reserve_lookup.get(matchup["roster_id"], {})
+
+        columns["player_id"].extend(players)
+        columns["slot"].extend(slots.get(player_id) or reserve.get(player_id, "BN") for player_id in players)
+        columns["points"].extend(float(points.get(player_id, 0.0)) for player_id in players)
+        columns["week"].extend([week] * len(players))
+        columns["sleeper_id"].extend([sleeper_lookup[matchup["roster_id"]]] * len(players))
+        columns["matchup_id"].extend([matchup.get("matchup_id")] * len(players))
+
+    return pl.DataFrame(columns, schema=LINEUP_SCHEMA)
+
+def calculate_optimal_lineups(lineups: pl.DataFrame, roster_positions: list[str], players: pl.DataFrame | None = None) -> pl.DataFrame:
+    """
+    Calculates the optimal lineup points and lineup efficiency of every roster and week at once.
+    Dedicated slots are filled first with the highest scoring players of their position, then each flex slot from the narrowest
+    to the widest with the highest scoring players left, so a whole season is a handful of ranking passes over one frame.
+    Filling the flex slots greedily is only optimal when every two of them are nested or disjoint, e.g. 'FLEX' and 'SUPER_FLEX'.
+    Otherwise, e.g. 'WRRB_FLEX' next to 'REC_FLEX', the flex slots of each roster and week are assigned exactly by '_assign_flex'.
+    Players on injured reserve or the taxi squad cannot be started and are left out.
+
+    Args:
+        lineups (polars.DataFrame): The lineup rows returned by 'ingest_lineups' or read from the 'lineup' dataset.
+        roster_positions (list[str]): The roster slots of the Sleeper league, e.g. ['QB', 'RB', 'FLEX', 'BN'].
+        players (polars.DataFrame | None = None): The optional player catalog returned by 'get_players'.
+
+    Returns:
+        polars.DataFrame: A DataFrame with the partition columns in the lineups, 'week', 'sleeper_id', the started 'points',
+        the 'optimal_points' and the 'efficiency' in percent of every roster.
+    """
+    keys = [column for column in ("league", "season", "week", "sleeper_id") if column in lineups.columns]
+    starter_slots = [slot for slot in roster_positions if slot not in BENCH_SLOTS]
+
+    dedicated = { slot: starter_slots.count(slot) for slot in starter_slots if slot not in FLEX_SLOTS }
+    flex = [(slot, starter_slots.count(slot)) for slot in FLEX_SLOTS if slot in starter_slots]
+
+    # greedy filling is exact when the flex slots form a laminar family
+    nested = all(
+        set(FLEX_SLOTS[a]) <= set(FLEX_SLOTS[b]) or set(FLEX_SLOTS[b]) <= set(FLEX_SLOTS[a]) or not set(FLEX_SLOTS[a]) & set(FLEX_SLOTS[b])
+        for (a, _), (b, _) in combinations(flex, 2)
+    )
+
+    with span("lineup.core.calculate_optimal_lineups", rows=lineups.height, passes=1 + len(flex), nested=nested):
+        catalog = players if players is not None else get_players()
+        frame = lineups.filter(~pl.col("slot").is_in(list(RESERVE_SLOTS))).join(catalog.select(["player_id", "position"]), on="player_id", how="left")
+
+        # fill the dedicated slots with the best players of each position
+        frame = frame.with_columns(
+            (
+                pl.col("points").rank("ordinal", descending=True).over([*keys, "position"])
+                <= pl.col("position").replace_strict(dedicated, default=0, return_dtype=pl.Int64)
+            ).fill_null(False).alias("optimal")
+        )
+
+        # fill each flex slot with the best eligible players not already in the optimal lineup
+        if nested:
+            for slot, count in flex:
+                eligible = ~pl.col("optimal") & pl.col("position").is_in(FLEX_SLOTS[slot])
+                rank = pl.when(eligible).then(pl.col("points")).rank("ordinal", descending=True).over(keys)
+                frame = frame.with_columns((pl.col("optimal") | (eligible & (rank <= count)).fill_null(False)).alias("optimal"))
+
+        elif flex:
+            frame = frame.with_row_index("row")
+            candidates = (
+                frame
+                .filter(~pl.col("optimal") & pl.col("position").is_in([position for slot, _ in flex for position in FLEX_SLOTS[slot]]))
+                .sort("points", descending=True)
+                .group_by(keys)
+                .agg(["row", "points", "position"])
+            )
+            rows = [row for group in candidates.iter_rows(named=True) for row in _assign_flex(group["row"], group["points"], group["position"], flex)]
+            frame = frame.with_columns((pl.col("optimal") | pl.col("row").is_in(rows)).alias("optimal")).drop("row")
+
+        return (
+            frame.group_by(keys)
+            .agg([
+                pl.col("points").filter(~pl.col("slot").is_in(list(BENCH_SLOTS))).sum().round(2).alias("points"),
+                pl.col("points").filter(pl.col("optimal")).sum().round(2).alias("optimal_points")
+            ])
+            .with_columns(
+                pl.when(pl.col("optimal_points") > 0)
+                .then((100 * pl.col("points") / pl.col("optimal_points")).round(1))
+                .alias("efficiency")
+            )
+            .sort(keys)
+        )
+
+@traced
+def get_lineup_efficiency(sleeper_league_id: str, league: str, season: str, weeks: range, format: str = "parquet", root: Path | None = None) -> pl.DataFrame:
+    """
+    Ingests the lineups of the given weeks and calculates the optimal lineup points and lineup efficiency of every week of
+    the season stored in the 'lineup' dataset.
+
+    Args:
+        sleeper_league_id (str): The Sleeper id of the league.
+        league (str): The key of the league, e.g. 'HOMIES'.
+        season (str): The season year, e.g. '2025'.
+        weeks (range): The week numbers to ingest.
+        format (str = "parquet"): The format of the dataset, 'parquet' or 'ipc'.
+        root (Path | None = None): The root directory of every dataset, defaults to 'OUTPUT_PATH'.
+
+    Returns:
+        polars.DataFrame: The lineup efficiency returned by 'calculate_optimal_lineups' for every stored week of the season.
+    """
+    try:
+        _ = ingest_lineups(sleeper_league_id, league, season, weeks, format, root)
+
+        lineups = scan_output("lineup", format, root).filter((pl.col("league") == league) & (pl.col("season") == season)).collect()
+
+        return calculate_optimal_lineups(lineups, get_sleeper_league(sleeper_league_id)["roster_positions"])
+
+    except Exception as ex:
+        raise RuntimeError(f"Error getting the lineup efficiency of {league=} and {season=}.") from ex
+
+def _assign_flex(rows: list[int], points: list[float], positions: list[str], flex: list[tuple[str, int]]) -> list[int]:
+    # the rows of the best assignment of players, sorted by points, to the flex slots of one roster and week
+    # only the best players of each position up to the number of flex slots can be assigned
+    limit = sum(count for _, count in flex)
+    counts: dict[str, int] = {}
+    players: list[int] = []
+    for index, position in enumerate(positions):
+        counts[position] = counts.get(position, 0) + 1
+        if counts[position] <= limit:
+            players.append(index)
+
+    eligible = [[slot for slot, (name, _) in enumerate(flex) if positions[index] in FLEX_SLOTS[name]] for index in players]
+
+    @cache
+    def best(player: int, remaining: tuple[int, ...]) -> tuple[float, tuple[int, ...]]:
+        if player == len(players) or not any(remaining):
+            return 0.0, ()
+
+        result = best(player + 1, remaining)
+        for slot in eligible[player]:
+            if remaining[slot]:
+                total, assigned = best(player + 1, remaining[:slot] + (remaining[slot] - 1,) + remaining[slot + 1:])
+                if total + points[players[player]] > result[0]:
+                    result = (total + points[players[player]], (players[player], *assigned))
+
+        return result
+
+    return [rows[index] for index in best(0, tuple(count for _, count in flex))[1]]
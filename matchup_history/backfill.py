@@ -0,0 +1,55 @@
+# package imports
+import argparse
+import os
+import polars as pl
+import sys
+import traceback
+
+# function imports
+from dotenv import load_dotenv
+from supabase import Client, create_client
+
+# local imports
+from matchup_history.core import backfill_matchups
+from shared.python.league import get_league, get_league_keys, get_season_ids
+from shared.python.trace import profile
+
+load_dotenv()
+
+parser = argparse.ArgumentParser(description="Backfill the Supabase 'matchup' table for a range of weeks across one or more seasons.")
+parser.add_argument("seasons", nargs="+", help="The season years to backfill, e.g. 2023 2024 2025.")
+parser.add_argument("--first-week", type=int, default=1, help="The first week to backfill.")
+parser.add_argument("--last-week", type=int, default=14, help="The last week to backfill.")
+parser.add_argument("--league", default=os.getenv("LEAGUE") or get_league_keys()[0], help="The key of the league in shared/leagues.json.")
+args = parser.parse_args()
+
+# the league is read from the league registry in shared/leagues.json
+league: dict[str, str] = get_league(args.league)
+
+sleeper_league_id: str = league["sleeper_league_id"]
+supabase_league_id: str = league["supabase_league_id"]
+season_ids: dict[str, str] = get_season_ids(args.league, args.seasons)
+
+supabase_url: str | None = os.getenv("SUPABASE_URL")
+if not supabase_url:
+    raise ValueError(f"Failed to retrieve the environment variable for supabase url.")
+
+supabase_key: str | None = os.getenv("SUPABASE_KEY")
+if not supabase_key:
+    raise ValueError(f"Failed to retrieve the environment variable for supabase key.")
+
+try:
+    # initialize the Supabase client
+    client: Client = create_client(supabase_url, supabase_key)
+
+    # profile the pipeline when LEAGUEDB_PROFILE is set, spans are exported when LEAGUEDB_TRACE is set
+    with profile():
+        # backfill matchups in Supabase
+        matchups: pl.DataFrame = backfill_matchups(client, sleeper_league_id, supabase_league_id, season_ids, range(args.first_week, args.last_week + 1))
+        print(f"Backfilled {matchups.height} matchups for seasons {list(season_ids)}.")
+
+except Exception as ex:
+    print(f"An error occurred:")
+    traceback.print_exception(type(ex), ex, ex.__traceback__)
+    print(f"Exiting now...")
+    sys.exit()
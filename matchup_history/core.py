@@ -7,62 +7,127 @@ from typing import Any
 
 # local imports
 from shared.python.enum import get_enum
+from shared.python.registry import create_club_lookup, get_club_lookup
+from shared.python.trace import annotate, traced
+from shared.sleeper.client import fetch_concurrently
+from shared.sleeper.league import get_sleeper_league_chain
 from shared.sleeper.matchup import get_sleeper_matchups
-from shared.supabase.club import get_clubs
-from shared.supabase.matchup import upsert_matchups
+from shared.supabase.matchup import write_matchups
 
-def update_matchups(client: Client, sleeper_league_id: str, supabase_league_id: str, season_id: str, week: int) -> pl.DataFrame:
+@traced
+def update_matchups(client: Client, sleeper_league_id: str, supabase_league_id: str, season_id: str, week: int, sleeper_matchups: list[dict[str, Any]] | None = None, clubs: list[dict[str, Any]] | None = None) -> pl.DataFrame:
     """
     Updates the matchups in the Supabase 'matchup' table with matchup data from the Sleeper API and returns a polars DataFrame.
 
     Args:
         client (Client): The Supabase client.
         sleeper_league_id (str): The Sleeper id of the league.
+        supabase_league_id (str): The Supabase UUID of the league.
         season_id (str): The Supabase UUID of the season.
         week (int): The week number of the matchups.
+        sleeper_matchups (list[dict[str, Any]] | None = None): The optional matchups already returned by 'get_sleeper_matchups'.
+        clubs (list[dict[str, Any]] | None = None): The optional club rows already returned by 'get_clubs'.
 
     Returns:
-        polars.DataFrame: A DataFrame with the records upserted into the 'matchup' table.
+        polars.DataFrame: A DataFrame with the records of the week as stored in the 'matchup' table.
     """
     try:
         # get sleeper matchups
-        if not (sleeper_matchups := get_sleeper_matchups(sleeper_league_id, week)):
+        if not (sleeper_matchups := sleeper_matchups if sleeper_matchups is not None else get_sleeper_matchups(sleeper_league_id, week)):
             raise RuntimeError(f"No matchups were returned in the Sleeper API response for {sleeper_league_id=}.")
 
-        # get clubs
-        if not (clubs := get_clubs(client, supabase_league_id)):
-            raise RuntimeError(f"No club records were returned.")
-        
         # get club lookup
-        club_lookup = { club["sleeper"]: club["id"] for club in clubs if club.get("sleeper") }
+        club_lookup = create_club_lookup(clubs) if clubs is not None else get_club_lookup(client, supabase_league_id)
         
         # create matchups to upsert
+        matchups = create_matchups(sleeper_matchups, club_lookup, season_id, week)
+
+        # upsert the new and changed matchups
+        written, counts = write_matchups(client, matchups)
+        annotate(**counts)
+
+        return pl.DataFrame(written)
+    
+    except Exception as ex:
+        raise RuntimeError(f"Error updating matchups.") from ex
+
+@traced
+def backfill_matchups(client: Client, sleeper_league_id: str, supabase_league_id: str, season_ids: dict[str, str], weeks: range, max_workers: int = 8, batch_size: int = 500) -> pl.DataFrame:
+    """
+    Backfills the matchups in the Supabase 'matchup' table for a range of weeks across one or more seasons and returns a polars DataFrame.
+    Follows the Sleeper 'previous_league_id' chain from the most recent league to find the Sleeper league of each season.
+
+    Args:
+        client (Client): The Supabase client.
+        sleeper_league_id (str): The Sleeper id of the most recent league.
+        supabase_league_id (str): The Supabase UUID of the league.
+        season_ids (dict[str, str]): A dictionary of season year to the Supabase UUID of the season.
+        weeks (range): The week numbers of the matchups to backfill.
+        max_workers (int = 8): The maximum number of concurrent Sleeper API requests.
+        batch_size (int = 500): The maximum number of matchups per upsert.
+
+    Returns:
+        polars.DataFrame: A DataFrame with the backfilled records as stored in the 'matchup' table, without the 'id' of inserted records.
+    """
+    try:
+        # get the sleeper league for each season
+        league_chain = get_sleeper_league_chain(sleeper_league_id)
+        if missing := [season for season in season_ids if season not in league_chain]:
+            raise RuntimeError(f"No Sleeper league was found in the league chain for seasons {missing}.")
+
+        # get club lookup
+        club_lookup = get_club_lookup(client, supabase_league_id)
+
+        # get sleeper matchups for every season and week concurrently and create the matchups to upsert as they arrive
+        season_weeks = [(season, week) for season in season_ids for week in weeks]
         matchups: list[dict[str, Any]] = [
-            {
-                "season": season_id,
-                "week": week,
-                "club_x": club_lookup[sleeper_matchup["sleeper_id_x"]],
-                "score_x": sleeper_matchup["score_x"],
-                "club_y": club_lookup[sleeper_matchup["sleeper_id_y"]],
-                "score_y": sleeper_matchup["score_y"],
-                "winner": (
-                    club_lookup[sleeper_matchup["sleeper_id_x"]]
-                    if sleeper_matchup["score_x"] > sleeper_matchup["score_y"]
-                    else club_lookup[sleeper_matchup["sleeper_id_y"]]
-                    if sleeper_matchup["score_y"] > sleeper_matchup["score_x"]
-                    else None
-                ),
-                "stage": get_enum("stage")["regular"] if week <= 14 else None,
-                "round": None
-            } for sleeper_matchup in sleeper_matchups
-            if sleeper_matchup["sleeper_id_x"] in club_lookup and sleeper_matchup["sleeper_id_y"] in club_lookup
+            matchup
+            for (season, week), sleeper_matchups in fetch_concurrently(lambda request: get_sleeper_matchups(league_chain[request[0]], request[1]), season_weeks, max_workers)
+            for matchup in create_matchups(sleeper_matchups, club_lookup, season_ids[season], week)
         ]
 
-        # upsert the matchups
-        if (upsert_response := upsert_matchups(client, matchups)) is None:
-            raise RuntimeError(f"No data was returned in the upsert response for {season_id=} and {week=}.")
+        # upsert the new and changed matchups in batches
+        written, counts = write_matchups(client, matchups, chunk_size=batch_size, minimal=True)
+        annotate(**counts)
+
+        return pl.DataFrame(written)
 
-        return pl.DataFrame(upsert_response)
-    
     except Exception as ex:
-        raise RuntimeError(f"Error updating matchups.") from ex
\ No newline at end of file
+        raise RuntimeError(f"Error backfilling matchups.") from ex
+
+@traced
+def create_matchups(sleeper_matchups: list[dict[str, Any]], club_lookup: dict[str, str], season_id: str, week: int) -> list[dict[str, Any]]:
+    """
+    Maps Sleeper matchups to rows of the Supabase 'matchup' table.
+
+    Args:
+        sleeper_matchups (list[dict[str, Any]]): The Sleeper matchups returned by 'get_sleeper_matchups'.
+        club_lookup (dict[str, str]): A dictionary of Sleeper owner id to the Supabase UUID of the club.
+        season_id (str): The Supabase UUID of the season.
+        week (int): The week number of the matchups.
+
+    Returns:
+        list[dict[str, Any]]: A list of matchup rows to upsert.
+    """
+    stage = get_enum("stage")["regular"] if week <= 14 else None
+
+    return [
+        {
+            "season": season_id,
+            "week": week,
+            "club_x": club_lookup[sleeper_matchup["sleeper_id_x"]],
+            "score_x": sleeper_matchup["score_x"],
+            "club_y": club_lookup[sleeper_matchup["sleeper_id_y"]],
+            "score_y": sleeper_matchup["score_y"],
+            "winner": (
+                club_lookup[sleeper_matchup["sleeper_id_x"]]
+                if sleeper_matchup["score_x"] > sleeper_matchup["score_y"]
+                else club_lookup[sleeper_matchup["sleeper_id_y"]]
+                if sleeper_matchup["score_y"] > sleeper_matchup["score_x"]
+                else None
+            ),
+            "stage": stage,
+            "round": None
+        } for sleeper_matchup in sleeper_matchups
+        if sleeper_matchup["sleeper_id_x"] in club_lookup and sleeper_matchup["sleeper_id_y"] in club_lookup
+    ]
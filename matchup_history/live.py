@@ -0,0 +1,152 @@
+# package imports
+import polars as pl
+import threading
+
+# function imports
+from datetime import datetime
+from supabase import Client
+from typing import Any
+from zoneinfo import ZoneInfo
+
+# local imports
+from matchup_history.core import create_matchups
+from shared.python.registry import get_club_lookup
+from shared.python.trace import span
+from shared.sleeper.league import is_week_over
+from shared.sleeper.matchup import get_sleeper_matchups
+from shared.sleeper.roster import get_sleeper_roster_data
+from shared.supabase.matchup import get_matchups, write_matchups
+
+# the seconds between polls right after a score changed and the longest backoff inside and outside a game window
+MIN_INTERVAL: float = 30.0
+WINDOW_INTERVAL: float = 120.0
+MAX_INTERVAL: float = 1800.0
+
+# the weekday and eastern start and end hour of each window in which nfl games are played
+GAME_WINDOWS: list[tuple[int, int, int]] = [(3, 19, 24), (6, 9, 24), (0, 0, 1), (0, 19, 24)]
+EASTERN = ZoneInfo("America/New_York")
+
+def poll_matchups(client: Client, sleeper_league_id: str, supabase_league_id: str, season_id: str, week: int, min_interval: float = MIN_INTERVAL, max_interval: float = MAX_INTERVAL, backoff: float = 2.0, max_polls: int | None = None, stop: threading.Event | None = None) -> tuple[pl.DataFrame, dict[str, int]]:
+    """
+    Polls the Sleeper API for the matchups of a week and upserts only the matchups whose 'score_x', 'score_y' or 'winner' changed.
+    The interval drops to the minimum after a change and backs off while scores stay the same, up to 'WINDOW_INTERVAL' during a game
+    window and the maximum otherwise. Polling stops after one final poll once the nfl state has moved past the week, after
+    'max_polls' or when 'stop' is set.
+
+    Args:
+        client (Client): The Supabase client.
+        sleeper_league_id (str): The Sleeper id of the league.
+        supabase_league_id (str): The Supabase UUID of the league.
+        season_id (str): The Supabase UUID of the season.
+        week (int): The week number of the matchups.
+        min_interval (float = MIN_INTERVAL): The seconds between polls right after a score changed.
+        max_interval (float = MAX_INTERVAL): The most seconds between polls outside a game window.
+        backoff (float = 2.0): The factor the interval grows by after a poll without changes.
+        max_polls (int | None = None): The optional maximum number of polls.
+        stop (threading.Event | None = None): An optional event that stops polling when set.
+
+    Returns:
+        tuple[polars.DataFrame, dict[str, int]]: A DataFrame with the matchups of the week as last seen in the 'matchup' table,
+        and the number of 'polls' and of 'inserted' and 'updated' matchups across every poll.
+    """
+    try:
+        stop = stop if stop is not None else threading.Event()
+
+        # rosters and clubs do not change during a week, so they are fetched once
+        roster_data = get_sleeper_roster_data(sleeper_league_id)
+        club_lookup = get_club_lookup(client, supabase_league_id)
+
+        # the last seen matchups keyed by their unique constraint, seeded from the stored matchups of the week
+        seen: dict[tuple[Any, ...], dict[str, Any]] = {
+            _matchup_key(row): row for row in get_matchups(client, season_id, week) or []
+        }
+
+        totals = { "polls": 0, "inserted": 0, "updated": 0 }
+        interval = min_interval
+        while not stop.is_set():
+            # checked before the poll, so the poll after the games end upserts the final scores
+            over = is_week_over(sleeper_league_id, week)
+
+            with span("matchup_history.live.poll", week=week) as record:
+                sleeper_matchups = get_sleeper_matchups(sleeper_league_id, week, roster_data, live=True)
+                matchups = create_matchups(sleeper_matchups, club_lookup, season_id, week)
+
+                if changed := [matchup for matchup in matchups if has_changed(seen.get(_matchup_key(matchup)), matchup)]:
+                    written, counts = write_matchups(client, changed, current=list(seen.values()))
+                    seen.update((_matchup_key(row), row) for row in written)
+                    totals["inserted"] += counts["inserted"]
+                    totals["updated"] += counts["updated"]
+                    record.update(inserted=counts["inserted"], updated=counts["updated"])
+
+                interval = get_interval(interval, bool(changed), min_interval, max_interval, backoff)
+                record.update(changed=len(changed), interval=interval)
+
+            totals["polls"] += 1
+            if over or (max_polls is not None and totals["polls"] >= max_polls):
+                break
+
+            stop.wait(interval)
+
+        return pl.DataFrame(list(seen.values())), totals
+
+    except Exception as ex:
+        raise RuntimeError(f"Error polling live matchups.") from ex
+
+def has_changed(seen: dict[str, Any] | None, matchup: dict[str, Any]) -> bool:
+    """
+    Checks whether the score or winner of a matchup changed since it was last seen.
+
+    Args:
+        seen (dict[str, Any] | None): The last seen matchup row, or None if the matchup is new.
+        matchup (dict[str, Any]): The candidate matchup row.
+
+    Returns:
+        bool: True if the matchup is new or its 'score_x', 'score_y' or 'winner' changed, otherwise False.
+    """
+    if seen is None:
+        return True
+
+    # scores are compared to the hundredth since the database may round them
+    return (
+        round(float(seen["score_x"]), 2) != round(float(matchup["score_x"]), 2)
+        or round(float(seen["score_y"]), 2) != round(float(matchup["score_y"]), 2)
+        or seen["winner"] != matchup["winner"]
+    )
+
+def get_interval(interval: float, changed: bool, min_interval: float = MIN_INTERVAL, max_interval: float = MAX_INTERVAL, backoff: float = 2.0, now: datetime | None = None) -> float:
+    """
+    Gets the seconds until the next poll.
+
+    Args:
+        interval (float): The seconds before the last poll.
+        changed (bool): Whether any matchup changed in the last poll.
+        min_interval (float = MIN_INTERVAL): The seconds between polls right after a score changed.
+        max_interval (float = MAX_INTERVAL): The most seconds between polls outside a game window.
+        backoff (float = 2.0): The factor the interval grows by after a poll without changes.
+        now (datetime | None = None): The current time, defaults to now.
+
+    Returns:
+        float: The seconds until the next poll.
+    """
+    if changed:
+        return min_interval
+
+    limit = min(WINDOW_INTERVAL, max_interval) if is_game_window(now) else max_interval
+    return max(min_interval, min(interval * backoff, limit))
+
+def is_game_window(now: datetime | None = None) -> bool:
+    """
+    Checks whether nfl games may be in progress, Thursday and Monday nights and all of Sunday in eastern time.
+
+    Args:
+        now (datetime | None = None): The time to check, defaults to now.
+
+    Returns:
+        bool: True if the time is inside a game window, otherwise False.
+    """
+    eastern = (now or datetime.now(EASTERN)).astimezone(EASTERN)
+
+    return any(eastern.weekday() == weekday and start <= eastern.hour < end for weekday, start, end in GAME_WINDOWS)
+
+def _matchup_key(matchup: dict[str, Any]) -> tuple[Any, ...]:
+    return (matchup["season"], matchup["club_x"], matchup["club_y"], matchup["week"])
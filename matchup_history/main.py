@@ -10,23 +10,18 @@ from supabase import Client, create_client
 
 # local imports
 from matchup_history.core import update_matchups
+from shared.python.league import get_league, get_league_keys
+from shared.python.trace import profile
 from shared.python.utils import get_week
 
 load_dotenv()
 
-league: str = "HOMIES"
+# the league is read from the league registry in shared/leagues.json, the first league unless LEAGUE is set
+league: dict[str, str] = get_league(os.getenv("LEAGUE") or get_league_keys()[0])
 
-season_id: str | None = os.getenv(f"{league}_2025_SUPABASE")
-if not season_id:
-    raise ValueError(f"Failed to retrieve the environment variable for season id.")
-
-sleeper_league_id: str | None = os.getenv(f"{league}_2025_SLEEPER")
-if not sleeper_league_id:
-    raise ValueError(f"Failed to retrieve the environment variable for sleeper league id.")
-
-supabase_league_id: str | None = os.getenv(f"{league}_ID")
-if not supabase_league_id:
-    raise ValueError(f"Failed to retrieve the environment variable for supabase league id.")
+season_id: str = league["season_id"]
+sleeper_league_id: str = league["sleeper_league_id"]
+supabase_league_id: str = league["supabase_league_id"]
 
 supabase_url: str | None = os.getenv("SUPABASE_URL")
 if not supabase_url:
@@ -43,8 +38,11 @@ try:
     # initialize the Supabase client
     client: Client = create_client(supabase_url, supabase_key)
 
-    # update matchups in Supabase
-    matchups: pl.DataFrame = update_matchups(client, sleeper_league_id, supabase_league_id, season_id, week)
+    # profile the pipeline when LEAGUEDB_PROFILE is set, spans are exported when LEAGUEDB_TRACE is set
+    with profile():
+        # update matchups in Supabase
+        matchups: pl.DataFrame = update_matchups(client, sleeper_league_id, supabase_league_id, season_id, week)
+        print(f"Updated {matchups.height} matchups for week {week}.")
 
 except Exception as ex:
     print(f"An error occurred:")
@@ -3,49 +3,112 @@ import polars as pl
 
 # function imports
 from supabase import Client
+from typing import Any
 
 # local imports
-from shared.supabase.club import get_clubs
-from shared.supabase.matchup import get_matchups
+from shared.python.registry import encode_clubs, get_club_frame, get_club_rows
+from shared.python.trace import traced
+from shared.supabase.matchup import get_head_to_head, get_matchups
 
-def get_matchup_table(client: Client, season_id: str, supabase_league_id: str, week: int) -> pl.DataFrame:
+@traced
+def get_matchup_table(client: Client, season_id: str, supabase_league_id: str, week: int, clubs: list[dict[str, Any]] | None = None, matchups: pl.DataFrame | None = None, history: pl.LazyFrame | None = None) -> pl.DataFrame:
     """
+    Gets the matchup table with the head-to-head history of each matchup for a given season and fantasy week.
+
+    Args:
+        client (Client): The Supabase client instance.
+        season_id (str): The Supabase UUID of the season.
+        supabase_league_id (str): The Supabase UUID of the league.
+        week (int): The week number of the matchup table.
+        clubs (list[dict[str, Any]] | None = None): The optional club rows already returned by 'get_clubs'.
+        matchups (polars.DataFrame | None = None): The optional matchups of the week already returned by 'update_matchups'.
+        history (polars.LazyFrame | None = None): The optional scan of the local matchup store returned by 'scan_matchups'.
+        The matchups of the week and the head-to-head history are read from the local store instead of the Supabase database when given.
+
+    Returns:
+        polars.DataFrame: A DataFrame of the matchups of the week with head-to-head wins and draws.
     """
     try:
-        # get matchups
-        matchups = get_matchups(client)
-        if matchups is None:
-            raise RuntimeError(f"No matchup records were returned for {season_id=}.")
-        
-        matchups = pl.DataFrame(matchups)
-
-        # get clubs
-        clubs = get_clubs(client, supabase_league_id)
+        # get matchups of the week
+        if matchups is None and history is not None:
+            matchups = history.filter((pl.col("season") == season_id) & (pl.col("week") == week)).collect()
+
+        elif matchups is None:
+            if (week_matchups := get_matchups(client, season_id, week)) is None:
+                raise RuntimeError(f"No matchup records were returned for {season_id=} and {week=}.")
+
+            matchups = pl.DataFrame(week_matchups)
+
+        if matchups.is_empty():
+            raise RuntimeError(f"No matchup records were returned for {season_id=} and {week=}.")
+
+        # get clubs, every club column is encoded with the club Enum so joins and pair keys run on integer codes
         if clubs is None:
-            raise RuntimeError(f"No club records were returned for {supabase_league_id=}.")
-        
-        clubs = pl.DataFrame(clubs).drop(["league", "founded", "title", "active"])
+            clubs = get_club_rows(client, supabase_league_id)
+
+        club_frame = get_club_frame(clubs)
+        club_enum = club_frame.schema["id"]
+        matchups = matchups.with_columns(encode_clubs(club_enum, "club_x", "club_y"))
+
+        # get head-to-head history of the pairs playing this week, from the local store or aggregated in the database
+        if history is not None:
+            head_to_head = calculate_head_to_head(history, matchups)
+
+        elif (head_to_head_rows := get_head_to_head(client, season_id, week)) is not None:
+            head_to_head = pl.DataFrame(head_to_head_rows).with_columns(encode_clubs(club_enum, "club_x", "club_y"))
+
+        else:
+            raise RuntimeError(f"No head-to-head records were returned for {season_id=} and {week=}.")
 
         # add club info for club_x
-        matchups = matchups.join(clubs.rename({"id": "club_x"}), on="club_x", how="inner").rename({"name": "name_x", "manager": "manager_x"}).drop("sleeper")
+        matchups = matchups.join(club_frame.rename({"id": "club_x"}), on="club_x", how="inner").rename({"name": "name_x", "manager": "manager_x"})
 
         # add club info for club_y
-        matchups = matchups.join(clubs.rename({"id": "club_y"}), on="club_y", how="inner").rename({"name": "name_y", "manager": "manager_y"}).drop("sleeper")
+        matchups = matchups.join(club_frame.rename({"id": "club_y"}), on="club_y", how="inner").rename({"name": "name_y", "manager": "manager_y"})
 
-        # create a unique key for matchup history
-        matchups = matchups.with_columns((pl.min_horizontal("club_x", "club_y") + "-" + pl.max_horizontal("club_x", "club_y")).alias("key"))
+        # add matchup history
+        matchup_table = matchups.join(head_to_head, on=["club_x", "club_y"], how="left").drop(["id", "season", "club_x", "club_y", "winner", "stage", "round", "updated_at"], strict=False)
 
-        # store matchup history
-        history = matchups.group_by(pl.col("key")).agg([
+        return matchup_table
+
+    except Exception as ex:
+        raise RuntimeError(f"Error getting matchup table.") from ex
+
+@traced
+def calculate_head_to_head(history: pl.LazyFrame, matchups: pl.DataFrame) -> pl.DataFrame:
+    """
+    Calculates the head-to-head wins and draws across every season for each pair of clubs in the given matchups.
+    The club columns of the history are encoded with the club Enum of the matchups, so the pair key is built from the
+    integer codes and matchups of clubs outside the Enum are dropped before the join.
+
+    Args:
+        history (polars.LazyFrame): A LazyFrame of every matchup, e.g. from 'scan_matchups'.
+        matchups (polars.DataFrame): The matchups of the week with 'club_x' and 'club_y' columns encoded by 'encode_clubs'.
+
+    Returns:
+        polars.DataFrame: A DataFrame with 'club_x', 'club_y', 'wins_x', 'wins_y' and 'draws' columns oriented to the given matchups.
+    """
+    club_enum = matchups.schema["club_x"]
+    pair = [
+        pl.min_horizontal(pl.col("club_x").to_physical(), pl.col("club_y").to_physical()).alias("low"),
+        pl.max_horizontal(pl.col("club_x").to_physical(), pl.col("club_y").to_physical()).alias("high")
+    ]
+
+    pairs = matchups.lazy().select(["club_x", "club_y"]).with_columns(pair)
+
+    return (
+        history
+        .select(["club_x", "club_y", "score_x", "score_y", "winner"])
+        .with_columns(encode_clubs(club_enum, "club_x", "club_y", "winner"))
+        .drop_nulls(["club_x", "club_y"])
+        .with_columns(pair)
+        .drop(["club_x", "club_y"])
+        .join(pairs, on=["low", "high"], how="inner")
+        .group_by(["club_x", "club_y"])
+        .agg([
             (pl.col("winner") == pl.col("club_x")).sum().alias("wins_x"),
             (pl.col("winner") == pl.col("club_y")).sum().alias("wins_y"),
             ((pl.col("winner").is_null()) & (pl.col("score_x") != 0) & (pl.col("score_y") != 0)).sum().alias("draws")
         ])
-
-        # filter matchups for season and week with matchup history
-        matchup_table = matchups.filter((pl.col("season") == season_id) & (pl.col("week") == week)).join(history, on="key", how="left").drop(["id", "season", "club_x", "club_y", "winner", "stage", "round", "key"])
-
-        return matchup_table
-
-    except Exception as ex:
-        raise RuntimeError(f"Error getting matchup table.") from ex
\ No newline at end of file
+        .collect()
+    )
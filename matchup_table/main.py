@@ -10,19 +10,19 @@ from supabase import Client, create_client
 
 # local imports
 from matchup_table.core import get_matchup_table
+from shared.python.league import get_league, get_league_keys
+from shared.python.output import write_output
+from shared.python.trace import profile
 from shared.python.utils import get_week
+from shared.store.matchup import scan_matchups, sync_matchups
 
 load_dotenv()
 
-league: str = "HOMIES"
+# the league is read from the league registry in shared/leagues.json, the first league unless LEAGUE is set
+league: dict[str, str] = get_league(os.getenv("LEAGUE") or get_league_keys()[0])
 
-season_id: str | None = os.getenv(f"{league}_2025_SUPABASE")
-if not season_id:
-    raise ValueError(f"Failed to retrieve the environment variable for season id.")
-
-supabase_league_id: str | None = os.getenv(f"{league}_ID")
-if not supabase_league_id:
-    raise ValueError(f"Failed to retrieve the environment variable for supabase league id.")
+season_id: str = league["season_id"]
+supabase_league_id: str = league["supabase_league_id"]
 
 supabase_url: str | None = os.getenv("SUPABASE_URL")
 if not supabase_url:
@@ -39,9 +39,14 @@ try:
     # initialize the Supabase client
     client: Client = create_client(supabase_url, supabase_key)
 
-    # get matchups from Supabase
-    matchups: pl.DataFrame = get_matchup_table(client, season_id, supabase_league_id, week) 
-    matchups.write_csv("matchup_table/data/matchup_table.csv")
+    # profile the pipeline when LEAGUEDB_PROFILE is set, spans are exported when LEAGUEDB_TRACE is set
+    with profile():
+        # sync the local matchup store with the matchups updated in Supabase since the last run
+        _ = sync_matchups(client)
+
+        # get the matchup table from the local matchup store
+        matchups: pl.DataFrame = get_matchup_table(client, season_id, supabase_league_id, week, history=scan_matchups())
+        write_output(matchups, "matchup_table", league["league"], league["season"], week, csv_path="matchup_table/data/matchup_table.csv")
 
 except Exception as ex:
     print(f"An error occurred:")
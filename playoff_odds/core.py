@@ -0,0 +1,233 @@
+# package imports
+import numpy as np
+import os
+import polars as pl
+
+# function imports
+from concurrent.futures import ProcessPoolExecutor
+from supabase import Client
+from typing import Any
+
+# local imports
+from shared.python.enum import get_enum
+from shared.python.registry import create_club_lookup, get_club_rows
+from shared.python.trace import span, traced
+from shared.sleeper.client import fetch_concurrently
+from shared.sleeper.league import get_sleeper_league
+from shared.sleeper.matchup import get_sleeper_matchups
+from shared.sleeper.roster import get_sleeper_roster_data
+from shared.supabase.matchup import get_matchups_frame
+from shared.supabase.standing import get_standings_frame
+
+# the number of seasons simulated in one vectorized batch
+BATCH_SIZE: int = 50_000
+
+# the number of games of league average scores blended into the score mean of each club
+PRIOR_GAMES: float = 3.0
+
+@traced
+def get_playoff_odds(client: Client, sleeper_league_id: str, supabase_league_id: str, season_id: str, week: int, standings: pl.DataFrame | None = None, clubs: list[dict[str, Any]] | None = None, simulations: int = 1_000_000, max_workers: int | None = None, seed: int | None = None) -> pl.DataFrame:
+    """
+    Gets the seed and playoff odds of each club by simulating the rest of the regular season after a given week.
+    The scores of each club are drawn from a normal distribution fit to its matchups of the season, and the remaining
+    schedule is read from the Sleeper matchups of the weeks after the given week.
+
+    Args:
+        client (Client): The Supabase client.
+        sleeper_league_id (str): The Sleeper id of the league.
+        supabase_league_id (str): The Supabase UUID of the league.
+        season_id (str): The Supabase UUID of the season.
+        week (int): The week number of the standings to simulate from.
+        standings (polars.DataFrame | None = None): The optional standings of the week already returned by 'update_standings'.
+        clubs (list[dict[str, Any]] | None = None): The optional club rows already returned by 'get_clubs'.
+        simulations (int = 1_000_000): The number of simulated seasons.
+        max_workers (int | None = None): The maximum number of simulating processes, defaults to the number of CPUs.
+        seed (int | None = None): The optional seed of the random number generator.
+
+    Returns:
+        polars.DataFrame: A DataFrame with a 'club_id' column, a 'seed_{n}' column with the odds of each playoff seed and
+        a 'playoff' column with the odds of making the playoffs, all in percent.
+    """
+    try:
+        # get the playoff format of the league
+        settings = get_sleeper_league(sleeper_league_id).get("settings") or {}
+        playoff_teams = int(settings.get("playoff_teams", 6))
+        last_week = int(settings.get("playoff_week_start", 15)) - 1
+
+        # get the standings of the week
+        if standings is None and (standings := get_standings_frame(client, season_id, week)) is None:
+            raise RuntimeError(f"No standing records were returned for {season_id=} and {week=}.")
+
+        standings = standings.filter(pl.col("week") == week).sort("standing")
+        club_ids: list[str] = standings["club"].to_list()
+
+        # fit the score distribution of each club to its played regular season matchups
+        mean, std = fit_scores(client, season_id, week, club_ids)
+
+        # get the remaining schedule from the sleeper matchups of every future regular season week
+        schedule = get_schedule(client, sleeper_league_id, supabase_league_id, range(week + 1, last_week + 1), club_ids, clubs)
+
+        seeds = simulate_seeds(
+            standings["win"].to_numpy().astype(np.float64),
+            standings["pf"].to_numpy().astype(np.float64),
+            mean, std, schedule, playoff_teams, simulations, max_workers, seed
+        )
+
+        return pl.DataFrame({
+            "club_id": club_ids,
+            **{ f"seed_{index + 1}": (100 * seeds[:, index] / simulations).round(1) for index in range(playoff_teams) },
+            "playoff": (100 * seeds.sum(axis=1) / simulations).round(1)
+        })
+
+    except Exception as ex:
+        raise RuntimeError(f"Error getting playoff odds.") from ex
+
+def fit_scores(client: Client, season_id: str, week: int, club_ids: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Fits the mean and standard deviation of the scores of each club to its played regular season matchups up to a given week.
+    The mean of each club is blended with the league mean by 'PRIOR_GAMES' so clubs with few games are not extreme,
+    and every club shares the standard deviation of the league.
+
+    Args:
+        client (Client): The Supabase client.
+        season_id (str): The Supabase UUID of the season.
+        week (int): The last played week number.
+        club_ids (list[str]): The Supabase UUIDs of the clubs in simulation order.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: The mean and standard deviation of the score of each club.
+    """
+    if (matchups := get_matchups_frame(client, season_id, max_workers=4)) is None:
+        raise RuntimeError(f"No matchup records were returned for {season_id=}.")
+
+    played = matchups.filter(
+        (pl.col("stage") == get_enum("stage")["regular"])
+        & (pl.col("week") <= week)
+        & ((pl.col("score_x") != 0) | (pl.col("score_y") != 0))
+    )
+
+    scores = pl.concat([
+        played.select([pl.col("club_x").alias("club"), pl.col("score_x").cast(pl.Float64).alias("score")]),
+        played.select([pl.col("club_y").alias("club"), pl.col("score_y").cast(pl.Float64).alias("score")])
+    ])
+
+    league_mean = scores["score"].mean() if scores.height else 100.0
+    league_std = scores["score"].std() if scores.height > 1 else 20.0
+
+    fits = (
+        pl.DataFrame({ "club": club_ids })
+        .join(scores.group_by("club").agg([pl.col("score").sum().alias("total"), pl.len().alias("games")]), on="club", how="left", maintain_order="left")
+        .with_columns(((pl.col("total").fill_null(0.0) + PRIOR_GAMES * league_mean) / (pl.col("games").fill_null(0) + PRIOR_GAMES)).alias("mean"))
+    )
+
+    return fits["mean"].to_numpy(), np.full(len(club_ids), league_std)
+
+def get_schedule(client: Client, sleeper_league_id: str, supabase_league_id: str, weeks: range, club_ids: list[str], clubs: list[dict[str, Any]] | None = None, max_workers: int = 8) -> np.ndarray:
+    """
+    Gets the remaining regular season schedule as pairs of club indices from the Sleeper matchups of the given weeks.
+
+    Args:
+        client (Client): The Supabase client.
+        sleeper_league_id (str): The Sleeper id of the league.
+        supabase_league_id (str): The Supabase UUID of the league.
+        weeks (range): The week numbers of the remaining regular season.
+        club_ids (list[str]): The Supabase UUIDs of the clubs in simulation order.
+        clubs (list[dict[str, Any]] | None = None): The optional club rows already returned by 'get_clubs'.
+        max_workers (int = 8): The maximum number of concurrent Sleeper API requests.
+
+    Returns:
+        numpy.ndarray: An array of shape (games, 2) with the indices of the two clubs of every remaining game.
+    """
+    if not weeks:
+        return np.empty((0, 2), dtype=np.int64)
+
+    club_lookup = create_club_lookup(clubs if clubs is not None else get_club_rows(client, supabase_league_id))
+    index = { club_id: position for position, club_id in enumerate(club_ids) }
+
+    roster_data = get_sleeper_roster_data(sleeper_league_id)
+    responses = fetch_concurrently(lambda week: get_sleeper_matchups(sleeper_league_id, week, roster_data), weeks, max_workers)
+
+    return np.array([
+        (index[club_lookup[matchup["sleeper_id_x"]]], index[club_lookup[matchup["sleeper_id_y"]]])
+        for _, sleeper_matchups in responses
+        for matchup in sleeper_matchups
+        if club_lookup.get(matchup["sleeper_id_x"]) in index and club_lookup.get(matchup["sleeper_id_y"]) in index
+    ], dtype=np.int64).reshape(-1, 2)
+
+def simulate_seeds(wins: np.ndarray, pf: np.ndarray, mean: np.ndarray, std: np.ndarray, schedule: np.ndarray, playoff_teams: int, simulations: int, max_workers: int | None = None, seed: int | None = None) -> np.ndarray:
+    """
+    Simulates the rest of the regular season in vectorized batches spread over a process pool and counts the seed of each club.
+    Clubs are ranked by wins and then points for, the same ordering as 'get_sleeper_rosters'.
+
+    Args:
+        wins (numpy.ndarray): The current wins of each club.
+        pf (numpy.ndarray): The current points for of each club.
+        mean (numpy.ndarray): The mean score of each club.
+        std (numpy.ndarray): The standard deviation of the score of each club.
+        schedule (numpy.ndarray): An array of shape (games, 2) with the club indices of every remaining game.
+        playoff_teams (int): The number of playoff seeds.
+        simulations (int): The number of simulated seasons.
+        max_workers (int | None = None): The maximum number of simulating processes, defaults to the number of CPUs.
+        seed (int | None = None): The optional seed of the random number generator.
+
+    Returns:
+        numpy.ndarray: An array of shape (clubs, playoff_teams) with the number of simulations in which each club got each seed.
+    """
+    with span("playoff_odds.core.simulate_seeds", simulations=simulations, games=len(schedule)) as record:
+        batches = [min(BATCH_SIZE, simulations - start) for start in range(0, simulations, BATCH_SIZE)]
+        streams = np.random.SeedSequence(seed).spawn(len(batches))
+        tasks = [(wins, pf, mean, std, schedule, playoff_teams, size, stream) for size, stream in zip(batches, streams)]
+
+        # a single batch is not worth starting processes for
+        workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+        if workers <= 1:
+            counts = [simulate_batch(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                counts = list(executor.map(simulate_batch, *zip(*tasks)))
+
+        record.update(workers=workers)
+
+        return np.sum(counts, axis=0)
+
+def simulate_batch(wins: np.ndarray, pf: np.ndarray, mean: np.ndarray, std: np.ndarray, schedule: np.ndarray, playoff_teams: int, size: int, stream: np.random.SeedSequence) -> np.ndarray:
+    """
+    Simulates one batch of seasons with every game of every season drawn at once.
+
+    Returns:
+        numpy.ndarray: An array of shape (clubs, playoff_teams) with the number of simulations in which each club got each seed.
+    """
+    rng = np.random.default_rng(stream)
+    clubs = len(wins)
+    home, away = schedule[:, 0], schedule[:, 1]
+
+    # draw the scores of every game, shape (size, games)
+    score_home = rng.normal(mean[home], std[home], size=(size, len(schedule)))
+    score_away = rng.normal(mean[away], std[away], size=(size, len(schedule)))
+
+    # add the simulated results to the current totals with one-hot matrices of the clubs of each game, shape (size, clubs)
+    one_hot_home = np.eye(clubs)[home]
+    one_hot_away = np.eye(clubs)[away]
+    home_win = (score_home > score_away).astype(np.float64)
+    away_win = (score_away > score_home).astype(np.float64)
+
+    total_wins = wins + home_win @ one_hot_home + away_win @ one_hot_away
+    total_pf = pf + score_home @ one_hot_home + score_away @ one_hot_away
+
+    # rank by wins and then points for, the last key of 'lexsort' sorts first
+    ranking = np.lexsort((-total_pf, -total_wins), axis=1)
+
+    return np.stack([np.bincount(ranking[:, seed], minlength=clubs) for seed in range(playoff_teams)], axis=1)
+
+def add_playoff_odds(league_table: pl.DataFrame, odds: pl.DataFrame) -> pl.DataFrame:
+    """
+    Adds the seed and playoff odds of each club to a league table.
+
+    Args:
+        league_table (polars.DataFrame): The league table returned by 'get_league_table'.
+        odds (polars.DataFrame): The odds returned by 'get_playoff_odds'.
+
+    Returns:
+        polars.DataFrame: The league table with the 'seed_{n}' and 'playoff' columns.
+    """
+    return league_table.join(odds, on="club_id", how="left")
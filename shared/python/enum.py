@@ -2,6 +2,7 @@
 import json
 
 # function imports
+from functools import cache
 from pathlib import Path
 
 ENUM_PATH = Path(__file__).parent.parent / "enum.json"
@@ -14,6 +15,8 @@ def get_enum(enum: str) -> dict[str, str]:
     
     return enums.get(enum, {})
 
+@cache
 def get_enums() -> dict[str, dict[str, str]]:
+    # parsed once per process, call 'get_enums.cache_clear()' after editing enum.json
     with open(ENUM_PATH, "r", encoding="utf-8") as file:
-        return json.load(file)
\ No newline at end of file
+        return json.load(file)
@@ -0,0 +1,52 @@
+# package imports
+import os
+
+def get_env(name: str, description: str) -> str:
+    """
+    Gets a required environment variable, loading the .env file on first use.
+
+    Args:
+        name (str): The name of the environment variable.
+        description (str): The description of the variable used in the error message.
+
+    Returns:
+        str: The value of the environment variable.
+    """
+    # imported lazily so commands that never read the environment skip python-dotenv
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    if not (value := os.getenv(name)):
+        raise ValueError(f"Failed to retrieve the environment variable for {description}.")
+
+    return value
+
+def get_league_env(league: str, season: str) -> dict[str, str]:
+    """
+    Gets the Supabase and Sleeper ids of a league and season from the environment.
+
+    Args:
+        league (str): The key of the league, e.g. 'HOMIES'.
+        season (str): The season year, e.g. '2025'.
+
+    Returns:
+        dict[str, str]: The 'season_id', 'sleeper_league_id' and 'supabase_league_id' of the league and season.
+    """
+    return {
+        "season_id": get_season_env(league, season),
+        "sleeper_league_id": get_env(f"{league}_{season}_SLEEPER", "sleeper league id"),
+        "supabase_league_id": get_env(f"{league}_ID", "supabase league id")
+    }
+
+def get_season_env(league: str, season: str) -> str:
+    """
+    Gets the Supabase UUID of a league season from the '{league}_{season}_SUPABASE' environment variable.
+
+    Args:
+        league (str): The key of the league, e.g. 'HOMIES'.
+        season (str): The season year, e.g. '2024'.
+
+    Returns:
+        str: The Supabase UUID of the season.
+    """
+    return get_env(f"{league}_{season}_SUPABASE", "season id")
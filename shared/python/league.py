@@ -0,0 +1,93 @@
+# package imports
+import json
+import os
+import re
+
+# function imports
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+# local imports
+from shared.python.env import get_env, get_league_env, get_season_env
+
+LEAGUE_PATH = Path(os.getenv("LEAGUE_PATH", Path(__file__).parent.parent / "leagues.json"))
+
+def get_league_keys() -> list[str]:
+    """
+    Gets the keys of every league in the league registry.
+
+    Returns:
+        list[str]: The league keys in the order of leagues.json, e.g. ['HOMIES'].
+    """
+    return list(get_leagues())
+
+def get_league(league: str, season: str | None = None) -> dict[str, str]:
+    """
+    Gets the Supabase and Sleeper ids of a league and season from the league registry.
+    Values written as '${NAME}' are read from the environment, and leagues missing from the registry fall back to the
+    '{league}_{season}_SUPABASE', '{league}_{season}_SLEEPER' and '{league}_ID' environment variables. Seasons of a
+    registered league that are missing from the registry fall back to the '{league}_{season}_*' variables.
+
+    Args:
+        league (str): The key of the league, e.g. 'HOMIES'.
+        season (str | None = None): The season year, defaults to the most recent season of the league.
+
+    Returns:
+        dict[str, str]: The 'league', 'season', 'season_id', 'sleeper_league_id' and 'supabase_league_id' of the league and season.
+    """
+    if (entry := get_leagues().get(league)) is None:
+        if season is None:
+            raise ValueError(f"{league=} does not exist in leagues.json, so a season is required.")
+
+        return { "league": league, "season": season, **get_league_env(league, season) }
+
+    season = season if season is not None else max(entry["seasons"])
+    if season not in entry["seasons"]:
+        return {
+            "league": league,
+            "season": season,
+            "season_id": get_season_env(league, season),
+            "sleeper_league_id": get_env(f"{league}_{season}_SLEEPER", "sleeper league id"),
+            "supabase_league_id": _expand(entry["supabase_league_id"])
+        }
+
+    return {
+        "league": league,
+        "season": season,
+        "season_id": _expand(entry["seasons"][season]["season_id"]),
+        "sleeper_league_id": _expand(entry["seasons"][season]["sleeper_league_id"]),
+        "supabase_league_id": _expand(entry["supabase_league_id"])
+    }
+
+def get_season_ids(league: str, seasons: list[str]) -> dict[str, str]:
+    """
+    Gets the Supabase UUID of each season of a league from the league registry, or from the '{league}_{season}_SUPABASE'
+    environment variable for seasons missing from it. Only the season id is resolved, since the Sleeper league of a past
+    season is found through the 'previous_league_id' chain.
+
+    Args:
+        league (str): The key of the league, e.g. 'HOMIES'.
+        seasons (list[str]): The season years.
+
+    Returns:
+        dict[str, str]: A dictionary of season year to the Supabase UUID of the season.
+    """
+    seasons_registry = get_leagues().get(league, {}).get("seasons", {})
+    return {
+        season: _expand(seasons_registry[season]["season_id"]) if season in seasons_registry else get_season_env(league, season)
+        for season in seasons
+    }
+
+@cache
+def get_leagues() -> dict[str, dict[str, Any]]:
+    # parsed once per process, call 'get_leagues.cache_clear()' after editing leagues.json
+    if not LEAGUE_PATH.exists():
+        return {}
+
+    with open(LEAGUE_PATH, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+def _expand(value: str) -> str:
+    # ids are kept in the environment and referenced as '${NAME}'
+    return re.sub(r"\$\{(\w+)\}", lambda match: get_env(match[1], match[1]), value)
@@ -0,0 +1,90 @@
+# package imports
+import os
+import polars as pl
+import threading
+
+# function imports
+from pathlib import Path
+
+OUTPUT_PATH = Path(os.getenv("OUTPUT_PATH", "output"))
+
+# the file of a partition in each format, Arrow IPC is written uncompressed so readers can memory-map it
+FORMATS: dict[str, str] = {
+    "parquet": "part.parquet",
+    "ipc": "part.arrow"
+}
+
+PARTITIONS: list[str] = ["league", "season", "week"]
+
+def write_output(frame: pl.DataFrame, table: str, league: str, season: str, week: int, format: str = "parquet", csv_path: str | Path | None = None, root: Path | None = None) -> Path:
+    """
+    Writes an output table to its league, season and week partition of a columnar dataset, replacing the partition atomically.
+    Partition columns already in the frame are dropped since they are stored in the path.
+
+    Args:
+        frame (polars.DataFrame): The output table, e.g. the league table of the week.
+        table (str): The name of the dataset, e.g. 'league_table'.
+        league (str): The key of the league, e.g. 'HOMIES'.
+        season (str): The season year, e.g. '2025'.
+        week (int): The week number.
+        format (str = "parquet"): The format of the dataset, 'parquet' or 'ipc'.
+        csv_path (str | Path | None = None): The optional path to also export the table to as a CSV file, replaced atomically.
+        root (Path | None = None): The root directory of every dataset, defaults to 'OUTPUT_PATH'.
+
+    Returns:
+        Path: The path of the written partition.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"{format=} must be one of {list(FORMATS)}.")
+
+    path = (root or OUTPUT_PATH) / table / f"league={league}" / f"season={season}" / f"week={week}" / FORMATS[format]
+    write_atomic(frame.drop(PARTITIONS, strict=False), path, format)
+
+    if csv_path is not None:
+        write_atomic(frame, Path(csv_path), "csv")
+
+    return path
+
+def scan_output(table: str, format: str = "parquet", root: Path | None = None) -> pl.LazyFrame:
+    """
+    Scans an output dataset lazily so filters on 'league', 'season' and 'week' only read the matching partitions.
+    Arrow IPC partitions are memory-mapped.
+
+    Args:
+        table (str): The name of the dataset, e.g. 'league_table'.
+        format (str = "parquet"): The format of the dataset, 'parquet' or 'ipc'.
+        root (Path | None = None): The root directory of every dataset, defaults to 'OUTPUT_PATH'.
+
+    Returns:
+        polars.LazyFrame: A LazyFrame over every partition of the dataset.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"{format=} must be one of {list(FORMATS)}.")
+
+    path = (root or OUTPUT_PATH) / table
+    if not any(path.glob(f"league=*/season=*/week=*/{FORMATS[format]}")):
+        raise RuntimeError(f"The output dataset at {path=} has no {format} partitions.")
+
+    hive_schema = { "league": pl.String, "season": pl.String, "week": pl.Int64 }
+    if format == "ipc":
+        return pl.scan_ipc(path / "**" / FORMATS[format], hive_partitioning=True, hive_schema=hive_schema, memory_map=True)
+
+    return pl.scan_parquet(path / "**" / FORMATS[format], hive_partitioning=True, hive_schema=hive_schema)
+
+def write_atomic(frame: pl.DataFrame, path: Path, format: str) -> None:
+    # write to a temporary file in the same directory first so readers never see a partial file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    try:
+        if format == "parquet":
+            frame.write_parquet(temp_path)
+        elif format == "ipc":
+            frame.write_ipc(temp_path, compression="uncompressed")
+        else:
+            frame.write_csv(temp_path)
+
+        os.replace(temp_path, path)
+
+    finally:
+        temp_path.unlink(missing_ok=True)
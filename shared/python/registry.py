@@ -0,0 +1,205 @@
+# package imports
+import json
+import os
+import polars as pl
+import threading
+import weakref
+
+# function imports
+from pathlib import Path
+from supabase import Client
+from typing import Any
+
+# local imports
+from shared.python.enum import get_enums
+from shared.supabase.club import get_clubs
+
+REGISTRY_PATH = Path(os.getenv("REGISTRY_PATH", Path.home() / ".cache" / "leaguedb" / "registry"))
+
+# the club columns used by the lookups and club frames, the manager 'name' and 'sleeper' id are always selected
+CLUB_COLUMNS: str = "id, name"
+
+# club rows and lookups are memoized per client and league, so a process using both the Supabase and the SQLite
+# client never gets the rows of the other backend, and are dropped with their client
+_lock = threading.Lock()
+_league_locks: dict[str | None, threading.Lock] = {}
+_clubs: weakref.WeakKeyDictionary[Client, dict[str | None, list[dict[str, Any]]]] = weakref.WeakKeyDictionary()
+_club_lookups: weakref.WeakKeyDictionary[Client, dict[str | None, dict[str, str]]] = weakref.WeakKeyDictionary()
+_manager_lookups: weakref.WeakKeyDictionary[Client, dict[str | None, dict[str, str]]] = weakref.WeakKeyDictionary()
+_club_enums: dict[tuple[str, ...], pl.Enum] = {}
+
+def get_club_rows(client: Client, league_id: str | None = None, snapshot: bool = False) -> list[dict[str, Any]]:
+    """
+    Gets the club rows of a league once per process and client and memoizes them.
+
+    Args:
+        client (Client): The Supabase client instance.
+        league_id (str | None = None): The optional Supabase UUID of the league.
+        snapshot (bool = False): Whether to read the club rows from and write them to an on-disk snapshot.
+        A snapshot is kept until 'invalidate' is called.
+
+    Returns:
+        list[dict[str, Any]]: The club rows returned by 'get_clubs'.
+    """
+    # each league has its own lock so concurrent leagues fetch their clubs at the same time
+    with _lock:
+        league_lock = _league_locks.setdefault(league_id, threading.Lock())
+
+    with league_lock:
+        with _lock:
+            if (clubs := _memo(_clubs, client).get(league_id)) is not None:
+                return clubs
+
+        path = REGISTRY_PATH / f"clubs_{league_id or 'all'}.json"
+        if snapshot and path.exists():
+            with open(path, "r", encoding="utf-8") as file:
+                clubs = json.load(file)
+
+        elif (clubs := get_clubs(client, league_id, CLUB_COLUMNS)) is None:
+            raise RuntimeError(f"No club records were returned for {league_id=}.")
+
+        elif snapshot:
+            write_snapshot(path, clubs)
+
+        with _lock:
+            _memo(_clubs, client)[league_id] = clubs
+
+        return clubs
+
+def get_club_lookup(client: Client, league_id: str | None = None, snapshot: bool = False) -> dict[str, str]:
+    """
+    Gets a memoized lookup of Sleeper owner id to the Supabase UUID of the club.
+
+    Args:
+        client (Client): The Supabase client instance.
+        league_id (str | None = None): The optional Supabase UUID of the league.
+        snapshot (bool = False): Whether to use the on-disk snapshot of the club rows.
+
+    Returns:
+        dict[str, str]: A dictionary of Sleeper owner id to the Supabase UUID of the club.
+    """
+    with _lock:
+        if (lookup := _memo(_club_lookups, client).get(league_id)) is not None:
+            return lookup
+
+    lookup = create_club_lookup(get_club_rows(client, league_id, snapshot))
+
+    with _lock:
+        return _memo(_club_lookups, client).setdefault(league_id, lookup)
+
+def create_club_lookup(clubs: list[dict[str, Any]]) -> dict[str, str]:
+    """
+    Creates a lookup of Sleeper owner id to the Supabase UUID of the club from club rows.
+
+    Args:
+        clubs (list[dict[str, Any]]): The club rows returned by 'get_clubs'.
+
+    Returns:
+        dict[str, str]: A dictionary of Sleeper owner id to the Supabase UUID of the club.
+    """
+    return { club["sleeper"]: club["id"] for club in clubs if club.get("sleeper") }
+
+def get_manager_lookup(client: Client, league_id: str | None = None, snapshot: bool = False) -> dict[str, str]:
+    """
+    Gets a memoized lookup of the Supabase UUID of the club to the name of its manager.
+
+    Args:
+        client (Client): The Supabase client instance.
+        league_id (str | None = None): The optional Supabase UUID of the league.
+        snapshot (bool = False): Whether to use the on-disk snapshot of the club rows.
+
+    Returns:
+        dict[str, str]: A dictionary of the Supabase UUID of the club to the name of its manager.
+    """
+    with _lock:
+        if (lookup := _memo(_manager_lookups, client).get(league_id)) is not None:
+            return lookup
+
+    lookup = { club["id"]: club["manager"] for club in get_club_rows(client, league_id, snapshot) }
+
+    with _lock:
+        return _memo(_manager_lookups, client).setdefault(league_id, lookup)
+
+def get_club_enum(clubs: list[dict[str, Any]]) -> pl.Enum:
+    """
+    Gets a memoized polars Enum of the club UUIDs, so club columns are stored as compact integer codes.
+    Joins, group-bys and pair keys on encoded columns run on the integer codes, and casting back to 'pl.String' decodes them.
+
+    Args:
+        clubs (list[dict[str, Any]]): The club rows returned by 'get_clubs'.
+
+    Returns:
+        polars.Enum: An Enum dtype with the UUID of every club as its categories, in sorted order.
+    """
+    ids = tuple(sorted({ club["id"] for club in clubs }))
+
+    with _lock:
+        if (dtype := _club_enums.get(ids)) is None:
+            dtype = _club_enums[ids] = pl.Enum(ids)
+
+        return dtype
+
+def get_club_frame(clubs: list[dict[str, Any]]) -> pl.DataFrame:
+    """
+    Gets the club rows as a polars DataFrame with the 'id' column encoded by 'get_club_enum'.
+
+    Args:
+        clubs (list[dict[str, Any]]): The club rows returned by 'get_clubs'.
+
+    Returns:
+        polars.DataFrame: A DataFrame with 'id', 'name' and 'manager' columns.
+    """
+    return pl.DataFrame(clubs).select([pl.col("id").cast(get_club_enum(clubs)), "name", "manager"])
+
+def encode_clubs(dtype: pl.Enum, *columns: str) -> list[pl.Expr]:
+    """
+    Gets the expressions that encode club UUID columns with a club Enum.
+    UUIDs of clubs outside the Enum, e.g. of another league, are encoded as null.
+
+    Args:
+        dtype (polars.Enum): The club Enum returned by 'get_club_enum'.
+        *columns (str): The names of the club columns.
+
+    Returns:
+        list[polars.Expr]: An expression per column.
+    """
+    return [pl.col(column).cast(pl.String).cast(dtype, strict=False) for column in columns]
+
+def invalidate(league_id: str | None = None) -> None:
+    """
+    Clears the memoized enums, club rows and lookups and removes the on-disk snapshots, e.g. after a club or manager changes.
+
+    Args:
+        league_id (str | None = None): The optional Supabase UUID of the league to invalidate.
+        Every league is invalidated if not given.
+    """
+    with _lock:
+        get_enums.cache_clear()
+
+        if league_id is None:
+            _clubs.clear()
+            _club_lookups.clear()
+            _manager_lookups.clear()
+            _club_enums.clear()
+            paths = list(REGISTRY_PATH.glob("clubs_*.json"))
+        else:
+            for memos in (_clubs, _club_lookups, _manager_lookups):
+                for memo in memos.values():
+                    memo.pop(league_id, None)
+            paths = [REGISTRY_PATH / f"clubs_{league_id}.json"]
+
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+def _memo(memos: weakref.WeakKeyDictionary[Client, dict[str | None, Any]], client: Client) -> dict[str | None, Any]:
+    # the memo of a client, called with '_lock' held
+    return memos.setdefault(client, {})
+
+def write_snapshot(path: Path, clubs: list[dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".tmp")
+
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(clubs, file)
+
+    os.replace(temp_path, path)
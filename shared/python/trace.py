@@ -0,0 +1,201 @@
+# package imports
+import cProfile
+import functools
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+
+# function imports
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# a path to append spans to as JSON lines, or '-' for stderr
+TRACE_PATH: str | None = os.getenv("LEAGUEDB_TRACE") or None
+
+# 'cprofile' or 'sampling'
+PROFILE: str | None = os.getenv("LEAGUEDB_PROFILE") or None
+
+# the most recent exported spans kept in memory, so long-running commands such as 'live' do not grow without bound
+MAX_SPANS: int = int(os.getenv("LEAGUEDB_MAX_SPANS", 10000))
+
+_lock = threading.Lock()
+_local = threading.local()
+_spans: deque[dict[str, Any]] = deque(maxlen=MAX_SPANS)
+
+def enable_tracing(path: str = "-") -> None:
+    """
+    Enables exporting spans for the rest of the process.
+
+    Args:
+        path (str = "-"): The path to append spans to as JSON lines, or '-' for stderr.
+    """
+    global TRACE_PATH
+    TRACE_PATH = path
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[dict[str, Any]]:
+    """
+    Times a block of work as a span and exports it when tracing is enabled.
+    The yielded record can be given extra attributes such as 'rows' or 'bytes' inside the block.
+
+    Args:
+        name (str): The name of the span, e.g. 'shared.sleeper.matchup.get_sleeper_matchups'.
+        **attributes (Any): Extra attributes of the span.
+
+    Yields:
+        dict[str, Any]: The record of the span.
+    """
+    stack: list[dict[str, Any]] = _local.__dict__.setdefault("stack", [])
+    record: dict[str, Any] = { "name": name, "parent": stack[-1]["name"] if stack else None, "thread": threading.current_thread().name, **attributes }
+
+    stack.append(record)
+    start = time.perf_counter()
+    try:
+        yield record
+
+    except BaseException as ex:
+        record["error"] = type(ex).__name__
+        raise
+
+    finally:
+        record["seconds"] = round(time.perf_counter() - start, 6)
+        stack.pop()
+
+        if TRACE_PATH is not None:
+            export(record)
+
+def annotate(**attributes: Any) -> None:
+    """
+    Adds attributes to the innermost open span of the current thread, such as the write counts of a 'traced' function.
+    Nothing is recorded outside a span.
+
+    Args:
+        **attributes (Any): The attributes to add to the span.
+    """
+    if stack := _local.__dict__.get("stack"):
+        stack[-1].update(attributes)
+
+def traced(function: F) -> F:
+    """
+    Decorates a function to run in a span named after its module and name.
+    The number of returned rows is recorded for lists and polars DataFrames.
+    """
+    name = f"{function.__module__}.{function.__qualname__}"
+
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with span(name) as record:
+            result = function(*args, **kwargs)
+
+            if isinstance(result, list):
+                record["rows"] = len(result)
+            elif hasattr(result, "height"):
+                record["rows"] = result.height
+
+            return result
+
+    return wrapper  # type: ignore[return-value]
+
+def export(record: dict[str, Any]) -> None:
+    line = json.dumps(record, default=str)
+
+    with _lock:
+        _spans.append(record)
+
+        if TRACE_PATH == "-":
+            print(line, file=sys.stderr)
+        elif TRACE_PATH:
+            with open(TRACE_PATH, "a", encoding="utf-8") as file:
+                file.write(f"{line}\n")
+
+def get_spans() -> list[dict[str, Any]]:
+    """
+    Gets the most recent spans exported by this process, up to 'MAX_SPANS'.
+
+    Returns:
+        list[dict[str, Any]]: The record of every kept span in the order they finished.
+    """
+    with _lock:
+        return list(_spans)
+
+def summarize_spans() -> dict[str, dict[str, float]]:
+    """
+    Summarizes the exported spans by name.
+
+    Returns:
+        dict[str, dict[str, float]]: A dictionary of span name to its 'count', total 'seconds', 'rows' and 'bytes'.
+    """
+    summary: dict[str, dict[str, float]] = {}
+    for record in get_spans():
+        totals = summary.setdefault(record["name"], { "count": 0, "seconds": 0.0, "rows": 0, "bytes": 0 })
+        totals["count"] += 1
+        totals["seconds"] += record["seconds"]
+        totals["rows"] += record.get("rows", 0)
+        totals["bytes"] += record.get("bytes", 0)
+
+    return summary
+
+@contextmanager
+def profile(mode: str | None = PROFILE, path: str = "leaguedb.prof", interval: float = 0.005) -> Iterator[None]:
+    """
+    Profiles a block of work when a profiler mode is given.
+    'cprofile' writes deterministic profiler stats to the path and prints the top functions.
+    'sampling' samples the stack of every thread at the interval and writes collapsed stacks to the path for flame graphs.
+
+    Args:
+        mode (str | None = PROFILE): The profiler mode, 'cprofile' or 'sampling'. Nothing is profiled if None.
+        path (str = "leaguedb.prof"): The path to write the profile to.
+        interval (float = 0.005): The seconds between samples of the sampling profiler.
+    """
+    if not mode:
+        yield
+        return
+
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(20)
+        return
+
+    if mode != "sampling":
+        raise ValueError(f"{mode=} must be 'cprofile' or 'sampling'.")
+
+    samples: Counter[str] = Counter()
+    stop = threading.Event()
+    sampler_id: list[int] = []
+
+    def sample() -> None:
+        sampler_id.append(threading.get_ident())
+        while not stop.wait(interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id in sampler_id:
+                    continue
+
+                stack: list[str] = []
+                while frame is not None:
+                    stack.append(f"{frame.f_code.co_filename}:{frame.f_code.co_name}")
+                    frame = frame.f_back
+                samples[";".join(reversed(stack))] += 1
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        sampler.join()
+
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, count in samples.most_common():
+                file.write(f"{stack} {count}\n")
@@ -1,6 +1,9 @@
 # package imports
 import sys
 
+# the last week of a fantasy season including the playoffs
+MAX_WEEK: int = 18
+
 def get_week() -> int:
     """
     Gets the fantasy football week from user input.
@@ -16,11 +19,11 @@ def get_week() -> int:
                 sys.exit()
 
             week = int(user_input)
-            if week < 1 or week > 14:
-                print(f"Please enter a valid week of the fantasy season between 1 and 14.")
+            if week < 1 or week > MAX_WEEK:
+                print(f"Please enter a valid week of the fantasy season between 1 and {MAX_WEEK}.")
                 continue
 
             return week
         
         except Exception as ex:
-            print(f"Invalid input. Please enter a positive integer between one (1) and fourteen (14) representing a week of the fantasy season.")
\ No newline at end of file
+            print(f"Invalid input. Please enter a positive integer between 1 and {MAX_WEEK} representing a week of the fantasy season.")
\ No newline at end of file
@@ -0,0 +1,307 @@
+# package imports
+import hashlib
+import io
+import json
+import os
+import polars as pl
+import random
+import requests
+import threading
+import time
+
+# function imports
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+# local imports
+from shared.python.trace import span
+
+SLEEPER_URL = os.getenv("SLEEPER_URL", "https://api.sleeper.app/v1")
+CACHE_PATH = Path(os.getenv("SLEEPER_CACHE_PATH", Path.home() / ".cache" / "leaguedb" / "sleeper"))
+
+# time to live in seconds for data that can still change
+IN_PROGRESS_TTL: float = 300.0
+DAY_TTL: float = 86400.0
+
+# sleeper asks clients to stay under 1000 requests per minute
+RATE_LIMIT: float = float(os.getenv("SLEEPER_RATE_LIMIT", 1000 / 60))
+BURST: int = 20
+
+# connect and read timeouts in seconds of a single request
+TIMEOUT: tuple[float, float] = (5.0, 30.0)
+
+# retries of a failed request with exponential backoff and full jitter
+MAX_RETRIES: int = 4
+BACKOFF: float = 0.5
+MAX_BACKOFF: float = 30.0
+RETRY_STATUSES: frozenset[int] = frozenset({ 429, 500, 502, 503, 504 })
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+_lock = threading.Lock()
+
+# cached responses fetched before this time are revalidated even if final or fresh, set by 'refresh_cache'
+_refreshed_at: float = 0.0
+
+_stats: dict[str, float] = {
+    "hits": 0,
+    "misses": 0,
+    "revalidated": 0,
+    "retries": 0,
+    "network_seconds": 0.0,
+    "saved_seconds": 0.0,
+    "throttled_seconds": 0.0
+}
+
+class TokenBucket:
+    """
+    A thread-safe token bucket that allows bursts of up to 'capacity' requests and refills at 'rate' requests per second.
+    """
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Takes a token, waiting until one is available.
+
+        Returns:
+            float: The seconds waited for the token.
+        """
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+
+                delay = (1 - self.tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+bucket = TokenBucket(RATE_LIMIT, BURST)
+
+def get_json(endpoint: str, ttl: float | None = IN_PROGRESS_TTL) -> Any:
+    """
+    Gets the JSON response of a Sleeper API endpoint through the on-disk response cache.
+    A cached response is returned while it is final or younger than the time to live, otherwise it is revalidated with
+    the 'ETag' and 'Last-Modified' headers of the cached response when the Sleeper API supports them.
+    Call 'refresh_cache' to revalidate final responses too, e.g. after a stat correction.
+
+    Args:
+        endpoint (str): The Sleeper API endpoint relative to the base url, e.g. 'league/{sleeper_league_id}/rosters'.
+        ttl (float | None = IN_PROGRESS_TTL): The time to live of the cached response in seconds.
+        None caches the response permanently, for data that can no longer change such as completed weeks.
+
+    Returns:
+        Any: The parsed JSON response.
+    """
+    return json.loads(get_body(endpoint, ttl))
+
+def get_json_frame(endpoint: str, schema: dict[str, pl.DataType], ttl: float | None = IN_PROGRESS_TTL) -> pl.DataFrame:
+    """
+    Gets the JSON array response of a Sleeper API endpoint through the on-disk response cache as a polars DataFrame.
+    The response body is parsed straight into the declared schema, so fields outside the schema are skipped and no
+    Python object is created per row. Nested objects are declared as 'pl.Struct' and missing fields are null.
+
+    Args:
+        endpoint (str): The Sleeper API endpoint relative to the base url, e.g. 'league/{sleeper_league_id}/rosters'.
+        schema (dict[str, polars.DataType]): The columns and dtypes to parse.
+        ttl (float | None = IN_PROGRESS_TTL): The time to live of the cached response in seconds.
+
+    Returns:
+        polars.DataFrame: A DataFrame with a row per element of the response array.
+    """
+    return pl.read_json(io.BytesIO(get_body(endpoint, ttl).encode()), schema=schema)
+
+def get_body(endpoint: str, ttl: float | None = IN_PROGRESS_TTL) -> str:
+    """
+    Gets the raw JSON body of a Sleeper API endpoint through the on-disk response cache, see 'get_json'.
+
+    Args:
+        endpoint (str): The Sleeper API endpoint relative to the base url, e.g. 'league/{sleeper_league_id}/rosters'.
+        ttl (float | None = IN_PROGRESS_TTL): The time to live of the cached response in seconds.
+
+    Returns:
+        str: The JSON body of the response.
+    """
+    with span("shared.sleeper.client.get_json", endpoint=endpoint) as record:
+        path = CACHE_PATH / f"{hashlib.sha256(endpoint.encode()).hexdigest()}.json"
+        entry = _read_entry(path)
+
+        # return the cached response while it is final or fresh and was fetched since the last refresh
+        if entry is not None and entry["fetched_at"] >= _refreshed_at and (entry["final"] or (ttl is not None and time.time() - entry["fetched_at"] < ttl)):
+            _count(hits=1, saved_seconds=entry["elapsed"])
+            record.update(cache="hit", bytes=len(entry["body"]))
+            return entry["body"]
+
+        # revalidate the cached response where supported
+        headers: dict[str, str] = {}
+        if entry is not None and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry is not None and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        start = time.perf_counter()
+        response = _request(f"{SLEEPER_URL}/{endpoint}", headers)
+        elapsed = time.perf_counter() - start
+
+        if response.status_code == 304 and entry is not None:
+            _count(revalidated=1, network_seconds=elapsed, saved_seconds=max(entry["elapsed"] - elapsed, 0.0))
+            _write_entry(path, {**entry, "fetched_at": time.time(), "final": ttl is None})
+            record.update(cache="revalidated", bytes=len(entry["body"]))
+            return entry["body"]
+
+        # raise any http error
+        response.raise_for_status()
+
+        _count(misses=1, network_seconds=elapsed)
+        record.update(cache="miss", bytes=len(response.content))
+        _write_entry(path, {
+            "endpoint": endpoint,
+            "fetched_at": time.time(),
+            "final": ttl is None,
+            "elapsed": elapsed,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "body": response.text
+        })
+
+        return response.text
+
+def get_bytes(endpoint: str) -> bytes:
+    """
+    Gets the raw response body of a Sleeper API endpoint without the response cache, for large responses that are
+    converted and cached by the caller, such as the player dump.
+
+    Args:
+        endpoint (str): The Sleeper API endpoint relative to the base url, e.g. 'players/nfl'.
+
+    Returns:
+        bytes: The response body.
+    """
+    with span("shared.sleeper.client.get_bytes", endpoint=endpoint) as record:
+        start = time.perf_counter()
+        response = _request(f"{SLEEPER_URL}/{endpoint}", {})
+        response.raise_for_status()
+
+        _count(misses=1, network_seconds=time.perf_counter() - start)
+        record.update(cache="bypass", bytes=len(response.content))
+
+        return response.content
+
+def fetch_concurrently(function: Callable[[T], R], items: Iterable[T], max_workers: int = 8) -> Iterator[tuple[T, R]]:
+    """
+    Calls a Sleeper request function for every item with bounded concurrency and yields the results as they complete.
+    Every request goes through the shared rate limiter and retries of 'get_json', so many requests can run at once safely.
+
+    Args:
+        function (Callable[[T], R]): The function making the requests, e.g. 'lambda week: get_sleeper_matchups(sleeper_league_id, week)'.
+        items (Iterable[T]): The items to call the function with.
+        max_workers (int = 8): The maximum number of concurrent calls.
+
+    Yields:
+        tuple[T, R]: The item and its result in the order they complete.
+        The error of the first failed call is raised once it completes.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = { executor.submit(function, item): item for item in items }
+
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+        finally:
+            for future in futures:
+                future.cancel()
+
+def cache_stats() -> dict[str, float]:
+    """
+    Gets the hit and miss counters of the Sleeper response cache for this process.
+
+    Returns:
+        dict[str, float]: The number of cache hits, misses, revalidations and retries, the seconds spent on the network,
+        the estimated network seconds saved by the cache and the seconds spent waiting on the rate limiter.
+    """
+    with _lock:
+        return dict(_stats)
+
+def refresh_cache() -> None:
+    """
+    Revalidates every cached Sleeper API response the next time it is requested, including the final responses of
+    completed weeks, so stat corrections made after a week was cached are picked up. Each response is fetched at most
+    once after the refresh and is cached as usual from then on.
+    """
+    global _refreshed_at
+
+    with _lock:
+        _refreshed_at = time.time()
+
+def clear_cache() -> None:
+    """
+    Removes every cached Sleeper API response from disk.
+    """
+    for path in CACHE_PATH.glob("*.json"):
+        path.unlink(missing_ok=True)
+
+def _count(**increments: float) -> None:
+    with _lock:
+        for key, value in increments.items():
+            _stats[key] += value
+
+def _request(url: str, headers: dict[str, str]) -> requests.Response:
+    # retry rate limited, failing and timed out requests with exponential backoff and full jitter
+    for attempt in range(MAX_RETRIES + 1):
+        _count(throttled_seconds=bucket.acquire())
+
+        try:
+            response = session.get(url, headers=headers, timeout=TIMEOUT)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+
+            retry_after = response.headers.get("Retry-After")
+
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == MAX_RETRIES:
+                raise
+
+            retry_after = None
+
+        _count(retries=1)
+        delay = random.uniform(0, min(MAX_BACKOFF, BACKOFF * 2 ** attempt))
+        time.sleep(max(delay, min(float(retry_after), MAX_BACKOFF)) if retry_after and retry_after.isdigit() else delay)
+
+    raise RuntimeError(f"Retries were exhausted for {url=}.")
+
+def _read_entry(path: Path) -> dict[str, Any] | None:
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    except (OSError, ValueError):
+        return None
+
+def _write_entry(path: Path, entry: dict[str, Any]) -> None:
+    # write to a temporary file first so concurrent readers never see a partial entry
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(entry, file)
+
+    os.replace(temp_path, path)
@@ -0,0 +1,136 @@
+# function imports
+from typing import Any
+
+# local imports
+from shared.python.trace import traced
+from shared.python.utils import MAX_WEEK
+from shared.sleeper.client import DAY_TTL, IN_PROGRESS_TTL, get_json
+
+@traced
+def get_sleeper_league(sleeper_league_id: str) -> dict[str, Any]:
+    """
+    Gets league data from the Sleeper API for a given league.
+
+    Args:
+        sleeper_league_id (str): The Sleeper id of the league.
+
+    Returns:
+        dict[str, Any]: A dictionary with Sleeper league data.
+    """
+    try:
+        # get league data from sleeper api
+        if not (league := get_json(f"league/{sleeper_league_id}", ttl=DAY_TTL)):
+            raise RuntimeError(f"No league data returned from the Sleeper API for {sleeper_league_id=}.")
+
+        return league
+
+    except Exception as ex:
+        raise RuntimeError(f"Querying the Sleeper API failed for {sleeper_league_id=}.") from ex
+
+def get_sleeper_league_chain(sleeper_league_id: str) -> dict[str, str]:
+    """
+    Follows the 'previous_league_id' chain of a Sleeper league back to its first season.
+
+    Args:
+        sleeper_league_id (str): The Sleeper id of the most recent league.
+
+    Returns:
+        dict[str, str]: A dictionary of season year to the Sleeper id of the league for that season.
+    """
+    chain: dict[str, str] = {}
+
+    league_id: str | None = sleeper_league_id
+    while league_id and league_id != "0" and league_id not in chain.values():
+        league = get_sleeper_league(league_id)
+        chain[str(league["season"])] = league_id
+        league_id = league.get("previous_league_id")
+
+    return chain
+
+def is_week_complete(sleeper_league_id: str, week: int) -> bool:
+    """
+    Checks whether the scores of a week can no longer change, leaving the most recent week open for stat corrections.
+
+    Args:
+        sleeper_league_id (str): The Sleeper id of the league.
+        week (int): The week number.
+
+    Returns:
+        bool: True if the week is complete, otherwise False.
+    """
+    league = get_sleeper_league(sleeper_league_id)
+    if league.get("status") == "complete":
+        return True
+
+    state = get_json("state/nfl", ttl=IN_PROGRESS_TTL)
+
+    return str(league["season"]) < str(state["season"]) or week < int(state["week"]) - 1
+
+def is_week_over(sleeper_league_id: str, week: int) -> bool:
+    """
+    Checks whether the games of a week are over, once the nfl state has moved past the week or the league is complete.
+    Unlike 'is_week_complete' it does not wait out the stat correction window, so it ends live polling of a week.
+
+    Args:
+        sleeper_league_id (str): The Sleeper id of the league.
+        week (int): The week number.
+
+    Returns:
+        bool: True if the week is over, otherwise False.
+    """
+    league = get_sleeper_league(sleeper_league_id)
+    if league.get("status") == "complete":
+        return True
+
+    state = get_json("state/nfl", ttl=IN_PROGRESS_TTL)
+
+    return str(league["season"]) < str(state["season"]) or week < int(state["week"])
+
+def is_season_over(sleeper_league_id: str) -> bool:
+    """
+    Checks whether the games of the final playoff week of a league are over.
+
+    Args:
+        sleeper_league_id (str): The Sleeper id of the league.
+
+    Returns:
+        bool: True if the season is over, otherwise False.
+    """
+    return is_week_over(sleeper_league_id, get_final_week(sleeper_league_id))
+
+def get_final_week(sleeper_league_id: str) -> int:
+    """
+    Gets the final playoff week of a league from its playoff start week, number of playoff teams and playoff round type.
+    A round type of 1 plays the final over two weeks and a round type of 2 plays every round over two weeks.
+
+    Args:
+        sleeper_league_id (str): The Sleeper id of the league.
+
+    Returns:
+        int: The week number of the final playoff week, at most 'MAX_WEEK'.
+    """
+    settings = get_sleeper_league(sleeper_league_id).get("settings", {})
+
+    rounds = max(int(settings.get("playoff_teams") or 6) - 1, 1).bit_length()
+    round_type = int(settings.get("playoff_round_type") or 0)
+    weeks = rounds * (2 if round_type == 2 else 1) + (1 if round_type == 1 else 0)
+
+    return min(int(settings.get("playoff_week_start") or 15) + weeks - 1, MAX_WEEK)
+
+def get_last_week(sleeper_league_id: str) -> int:
+    """
+    Gets the most recent week of a league whose games are over, the default week of runs that are not given one.
+
+    Args:
+        sleeper_league_id (str): The Sleeper id of the league.
+
+    Returns:
+        int: The week before the current nfl week, or the last scored week of a finished season.
+    """
+    league = get_sleeper_league(sleeper_league_id)
+    state = get_json("state/nfl", ttl=IN_PROGRESS_TTL)
+
+    if league.get("status") == "complete" or str(league["season"]) < str(state["season"]):
+        return int(league.get("settings", {}).get("last_scored_leg") or MAX_WEEK)
+
+    return min(max(int(state["week"]) - 1, 1), MAX_WEEK)
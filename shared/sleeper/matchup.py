@@ -1,17 +1,43 @@
-# package imports
-import requests
-
 # function imports
 from collections import defaultdict
 from typing import Any
 
-def get_sleeper_matchups(sleeper_league_id: str, week: int) -> list[dict[str, Any]]:
+# local imports
+from shared.python.trace import traced
+from shared.sleeper.client import IN_PROGRESS_TTL, get_json
+from shared.sleeper.league import is_week_complete
+from shared.sleeper.roster import get_sleeper_roster_data
+
+@traced
+def get_sleeper_matchup_data(sleeper_league_id: str, week: int, live: bool = False) -> list[dict[str, Any]]:
+    """
+    Gets the raw matchup data of a week from the Sleeper API, with the 'starters', 'players' and 'players_points' of each roster.
+
+    Args:
+        sleeper_league_id (str): The Sleeper id of the league.
+        week (int): The week number of the matchups.
+        live (bool = False): Whether to revalidate the cached matchups on every call for live scoring.
+
+    Returns:
+        list[dict[str, Any]]: The matchup objects of the Sleeper API response, one per roster.
+    """
+    # cached permanently once the week is complete and revalidated every call when live
+    ttl = None if is_week_complete(sleeper_league_id, week) else 0.0 if live else IN_PROGRESS_TTL
+    if not (matchup_data := get_json(f"league/{sleeper_league_id}/matchups/{week}", ttl=ttl)):
+        raise RuntimeError(f"No matchup data returned from the Sleeper API for {sleeper_league_id=} and {week=}.")
+
+    return matchup_data
+
+@traced
+def get_sleeper_matchups(sleeper_league_id: str, week: int, roster_data: list[dict[str, Any]] | None = None, live: bool = False) -> list[dict[str, Any]]:
     """
     Gets matchup data from the Sleeper API for a given week and returns a list of SleeperMatchup objects with roster ids mapped.
 
     Args:
         sleeper_league_id (str): The Sleeper id of the league.
         week (int): The week number of the matchups.
+        roster_data (list[dict[str, Any]] | None = None): The optional raw roster data already returned by 'get_sleeper_roster_data'.
+        live (bool = False): Whether to revalidate the cached matchups on every call for live scoring.
 
     Returns:
         list[dict[str, Any]] | None: A list of dictionaries with Sleeper matchup data.
@@ -19,23 +45,14 @@ def get_sleeper_matchups(sleeper_league_id: str, week: int) -> list[dict[str, An
     """
     try:
         # get matchup data from sleeper api
-        matchup_response = requests.get(f"https://api.sleeper.app/v1/league/{sleeper_league_id}/matchups/{week}")
-        matchup_response.raise_for_status()
-
-        if not (matchup_data := matchup_response.json()):
-            raise RuntimeError(f"No matchup data returned from the Sleeper API for {sleeper_league_id=} and {week=}.")
+        matchup_data = get_sleeper_matchup_data(sleeper_league_id, week, live)
 
         matchups: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
         for matchup in matchup_data:
             matchups[matchup["matchup_id"]].append(matchup)
 
         # get roster data from sleeper api
-        roster_response = requests.get(f"https://api.sleeper.app/v1/league/{sleeper_league_id}/rosters")
-        roster_response.raise_for_status()
-
-        rosters = roster_response.json()
-        if not (rosters := roster_response.json()):
-            raise RuntimeError(f"No matchup data returned from the Sleeper API for {sleeper_league_id=}.")
+        rosters = roster_data if roster_data is not None else get_sleeper_roster_data(sleeper_league_id)
 
         # roster id to sleeper id lookup
         sleeper_lookup = { roster["roster_id"]: roster["owner_id"] for roster in rosters }
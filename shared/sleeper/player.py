@@ -0,0 +1,139 @@
+# package imports
+import json
+import os
+import polars as pl
+import threading
+import time
+import warnings
+
+# function imports
+from pathlib import Path
+from typing import Any, Iterable
+
+# local imports
+from shared.python.output import write_atomic
+from shared.python.trace import traced
+from shared.sleeper.client import DAY_TTL, get_bytes
+
+PLAYER_PATH = Path(os.getenv("SLEEPER_PLAYER_PATH", Path.home() / ".cache" / "leaguedb" / "player"))
+CATALOG_FILE = "players.arrow"
+
+PLAYER_SCHEMA: dict[str, pl.DataType] = {
+    "player_id": pl.String(),
+    "name": pl.String(),
+    "position": pl.String(),
+    "team": pl.String()
+}
+
+_lock = threading.Lock()
+_sync_locks: dict[Path, threading.Lock] = {}
+_catalogs: dict[Path, tuple[int, pl.DataFrame]] = {}
+
+@traced
+def sync_players(root: Path | None = None, ttl: float = DAY_TTL) -> Path:
+    """
+    Downloads the Sleeper player dump when the local catalog is missing or older than the time to live, and converts it to
+    an uncompressed Arrow IPC file sorted by 'player_id' so it can be memory-mapped.
+    A failed refresh keeps serving an existing catalog with a warning and only raises when there is no catalog yet.
+
+    Args:
+        root (Path | None = None): The directory of the player catalog, defaults to 'PLAYER_PATH'.
+        ttl (float = DAY_TTL): The time to live of the catalog in seconds.
+
+    Returns:
+        Path: The path of the player catalog.
+    """
+    path = (root or PLAYER_PATH) / CATALOG_FILE
+
+    # each catalog has its own lock so one download never blocks readers of the memoized catalogs or other paths
+    with _lock:
+        sync_lock = _sync_locks.setdefault(path, threading.Lock())
+
+    with sync_lock:
+        if path.exists() and time.time() - path.stat().st_mtime < ttl:
+            return path
+
+        try:
+            # the dump is parsed once here and never kept, only the compact catalog is
+            catalog = create_catalog(json.loads(get_bytes("players/nfl")))
+            write_atomic(catalog, path, "ipc")
+
+            return path
+
+        except Exception as ex:
+            if not path.exists():
+                raise RuntimeError(f"Error syncing the Sleeper player catalog at {path=}.") from ex
+
+            warnings.warn(f"Refreshing the Sleeper player catalog at {path=} failed, using the stale catalog: {ex!r}", RuntimeWarning, stacklevel=2)
+            return path
+
+def create_catalog(players: dict[str, dict[str, Any]]) -> pl.DataFrame:
+    """
+    Creates the player catalog from the Sleeper player dump.
+
+    Args:
+        players (dict[str, dict[str, Any]]): The Sleeper player dump keyed by player id.
+
+    Returns:
+        polars.DataFrame: A DataFrame with the 'player_id', 'name', 'position' and 'team' of every player, sorted by 'player_id'.
+    """
+    # team defenses have no full name, only a first and last name such as 'Detroit' and 'Lions'
+    return pl.DataFrame({
+        "player_id": list(players),
+        "name": [player.get("full_name") or " ".join(filter(None, (player.get("first_name"), player.get("last_name")))) or None for player in players.values()],
+        "position": [player.get("position") for player in players.values()],
+        "team": [player.get("team") for player in players.values()]
+    }, schema=PLAYER_SCHEMA).sort("player_id")
+
+def get_players(root: Path | None = None, ttl: float = DAY_TTL) -> pl.DataFrame:
+    """
+    Gets the memory-mapped player catalog, syncing it first when it is missing or stale.
+    The mapped catalog is memoized until its file is replaced.
+
+    Args:
+        root (Path | None = None): The directory of the player catalog, defaults to 'PLAYER_PATH'.
+        ttl (float = DAY_TTL): The time to live of the catalog in seconds.
+
+    Returns:
+        polars.DataFrame: A DataFrame with the 'player_id', 'name', 'position' and 'team' of every player.
+    """
+    path = sync_players(root, ttl)
+    modified = path.stat().st_mtime_ns
+
+    with _lock:
+        if (cached := _catalogs.get(path)) is not None and cached[0] == modified:
+            return cached[1]
+
+        catalog = pl.read_ipc(path, memory_map=True)
+        _catalogs[path] = (modified, catalog)
+
+        return catalog
+
+def scan_players(root: Path | None = None, ttl: float = DAY_TTL) -> pl.LazyFrame:
+    """
+    Scans the memory-mapped player catalog lazily, syncing it first when it is missing or stale.
+
+    Args:
+        root (Path | None = None): The directory of the player catalog, defaults to 'PLAYER_PATH'.
+        ttl (float = DAY_TTL): The time to live of the catalog in seconds.
+
+    Returns:
+        polars.LazyFrame: A LazyFrame over the player catalog.
+    """
+    return pl.scan_ipc(sync_players(root, ttl), memory_map=True)
+
+def lookup_players(player_ids: Iterable[str] | pl.Series, root: Path | None = None) -> pl.DataFrame:
+    """
+    Looks up the name, position and team of many players at once with a join against the player catalog.
+
+    Args:
+        player_ids (Iterable[str] | polars.Series): The Sleeper player ids, e.g. the 'starters' of a matchup.
+        root (Path | None = None): The directory of the player catalog, defaults to 'PLAYER_PATH'.
+
+    Returns:
+        polars.DataFrame: A DataFrame with the 'player_id', 'name', 'position' and 'team' of each given id in the given order.
+        Unknown ids have null values.
+    """
+    ids = player_ids.cast(pl.String).alias("player_id") if isinstance(player_ids, pl.Series) else pl.Series("player_id", list(player_ids), dtype=pl.String)
+
+    return ids.to_frame().join(get_players(root), on="player_id", how="left", maintain_order="left")
@@ -1,47 +1,113 @@
 # package imports
-import requests
+import polars as pl
 
-def get_sleeper_rosters(sleeper_league_id: str) -> list[dict[str, str]]:
+# function imports
+from typing import Any
+
+# local imports
+from shared.python.trace import traced
+from shared.sleeper.client import get_json, get_json_frame
+
+# the fields of a Sleeper roster read by 'get_sleeper_rosters_frame', every other field of the response is skipped
+ROSTER_SCHEMA: dict[str, pl.DataType] = {
+    "roster_id": pl.Int64(),
+    "owner_id": pl.String(),
+    "settings": pl.Struct({
+        field: pl.Int64()
+        for field in ("wins", "losses", "ties", "fpts", "fpts_decimal", "fpts_against", "fpts_against_decimal", "ppts", "ppts_decimal")
+    })
+}
+
+@traced
+def get_sleeper_roster_data(sleeper_league_id: str) -> list[dict[str, Any]]:
     """
-    Gets current roster data for a Sleeper league from the Sleeper API.
+    Gets the raw roster data for a Sleeper league from the Sleeper API so it can be shared between readers.
 
     Args:
         sleeper_league_id (str): The Sleeper id of the league.
 
     Returns:
-        list[dict[str, str]] | None: A list of dictionaries with Sleeper roster data.
-        Returns None if no rosters are returned in the API response.
+        list[dict[str, Any]]: The roster objects of the Sleeper API response.
     """
     try:
         # get roster data from sleeper api
-        response = requests.get(f"https://api.sleeper.app/v1/league/{sleeper_league_id}/rosters")
-        
-        # raise any http error
-        response.raise_for_status()
-
-        if not response.json():
-            raise RuntimeError(f"No matchup data returned from the Sleeper API for {sleeper_league_id=}.")
-
-        # map the response data to a list of dictionaries
-        rosters = [
-            {
-                "id": item["owner_id"],
-                "win": item["settings"]["wins"],
-                "loss": item["settings"]["losses"],
-                "draw": item["settings"]["ties"],
-                "pf": item["settings"]["fpts"] + item["settings"]["fpts_decimal"] / 100,
-                "pa": item["settings"]["fpts_against"] + item["settings"]["fpts_against_decimal"] / 100,
-                "mpf": item["settings"]["ppts"] + item["settings"]["ppts_decimal"] / 100
-            } for item in response.json()
-        ]
+        if not (roster_data := get_json(f"league/{sleeper_league_id}/rosters")):
+            raise RuntimeError(f"No roster data returned from the Sleeper API for {sleeper_league_id=}.")
+
+        return roster_data
+
+    except Exception as ex:
+        raise RuntimeError(f"Querying the Sleeper API failed for {sleeper_league_id=}.") from ex
+
+@traced
+def get_sleeper_rosters(sleeper_league_id: str, roster_data: list[dict[str, Any]] | None = None) -> list[dict[str, Any]]:
+    """
+    Gets current roster data for a Sleeper league from the Sleeper API as the rows of 'get_sleeper_rosters_frame'.
+
+    Args:
+        sleeper_league_id (str): The Sleeper id of the league.
+        roster_data (list[dict[str, Any]] | None = None): The optional raw roster data already returned by 'get_sleeper_roster_data'.
+
+    Returns:
+        list[dict[str, Any]]: A list of dictionaries with Sleeper roster data.
+        Raises a RuntimeError if no rosters are returned in the API response.
+    """
+    try:
+        return get_sleeper_rosters_frame(sleeper_league_id, roster_data).to_dicts()
+
+    except Exception as ex:
+        raise RuntimeError(f"Querying the Sleeper API failed for {sleeper_league_id=}.") from ex
+
+@traced
+def get_sleeper_rosters_frame(sleeper_league_id: str, roster_data: list[dict[str, Any]] | None = None) -> pl.DataFrame:
+    """
+    Gets current roster data for a Sleeper league from the Sleeper API as a polars DataFrame.
+    The response is parsed straight into 'ROSTER_SCHEMA' and the settings are flattened with vectorized expressions.
+
+    Args:
+        sleeper_league_id (str): The Sleeper id of the league.
+        roster_data (list[dict[str, Any]] | None = None): The optional raw roster data already returned by 'get_sleeper_roster_data'.
+
+    Returns:
+        polars.DataFrame: A DataFrame with the 'id', 'win', 'loss', 'draw', 'pf', 'pa', 'mpf' and 'standing' of each roster,
+        sorted by standing. The 'mpf' is null when Sleeper has not calculated the max points for. Raises a RuntimeError if no rosters are returned in the API response.
+    """
+    try:
+        # get roster data from sleeper api
+        if roster_data is None:
+            rosters = get_json_frame(f"league/{sleeper_league_id}/rosters", ROSTER_SCHEMA)
+        else:
+            rosters = pl.DataFrame(roster_data, schema=ROSTER_SCHEMA)
+
+        if rosters.is_empty():
+            raise RuntimeError(f"No roster data returned from the Sleeper API for {sleeper_league_id=}.")
+
+        settings = pl.col("settings").struct
 
         # sort by wins and points for to add standing
-        rosters.sort(key=lambda x: (x["win"], x["pf"]), reverse=True)
+        return (
+            rosters
+            .select([
+                pl.col("owner_id").alias("id"),
+                settings.field("wins").fill_null(0).alias("win"),
+                settings.field("losses").fill_null(0).alias("loss"),
+                settings.field("ties").fill_null(0).alias("draw"),
+                _points("fpts").alias("pf"),
+                _points("fpts_against").alias("pa"),
+                _points("ppts", fill_null=False).alias("mpf")
+            ])
+            .sort(["win", "pf"], descending=True, maintain_order=True)
+            .with_row_index("standing", offset=1)
+            .select(["id", "win", "loss", "draw", "pf", "pa", "mpf", pl.col("standing").cast(pl.Int64)])
+        )
 
-        for index, roster in enumerate(rosters, start=1):
-            roster["standing"] = index
-        
-        return rosters
-    
     except Exception as ex:
-        raise RuntimeError(f"Querying the Sleeper API failed for {sleeper_league_id=}.") from ex
\ No newline at end of file
+        raise RuntimeError(f"Querying the Sleeper API failed for {sleeper_league_id=}.") from ex
+
+def _points(field: str, fill_null: bool = True) -> pl.Expr:
+    # sleeper leaves out the decimal settings before any points are scored, and the max points for stay null when not
+    # filled so they are never mistaken for zero
+    settings = pl.col("settings").struct
+    points = settings.field(field).fill_null(0) if fill_null else settings.field(field)
+
+    return points + settings.field(f"{field}_decimal").fill_null(0) / 100
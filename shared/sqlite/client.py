@@ -0,0 +1,264 @@
+# package imports
+import json
+import os
+import re
+import sqlite3
+import threading
+
+# function imports
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from postgrest import ReturnMethod
+from typing import Any
+
+SQLITE_PATH = Path(os.getenv("SQLITE_PATH", Path.home() / ".cache" / "leaguedb" / "leaguedb.db"))
+SCHEMA_PATH = Path(__file__).parent / "schema.sql"
+
+# head-to-head wins and draws across every season for each pair playing in a given season and week,
+# the same aggregation as 'shared/supabase/sql/get_head_to_head.sql'
+HEAD_TO_HEAD_SQL = """
+    select
+        current.club_x,
+        current.club_y,
+        count(*) filter (where history.winner = current.club_x) as wins_x,
+        count(*) filter (where history.winner = current.club_y) as wins_y,
+        count(*) filter (where history.winner is null and history.score_x <> 0 and history.score_y <> 0) as draws
+    from matchup as current
+    join matchup as history
+        on min(history.club_x, history.club_y) = min(current.club_x, current.club_y)
+        and max(history.club_x, history.club_y) = max(current.club_x, current.club_y)
+    where current.season = :season_id
+        and current.week = :week_number
+    group by current.club_x, current.club_y
+"""
+
+# the comparison operator of each filter method
+OPERATORS: dict[str, str] = { "eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<=" }
+
+@dataclass
+class Response:
+    """
+    The response of an executed query, with the same 'data' and 'count' attributes as a Supabase response.
+    """
+    data: list[dict[str, Any]]
+    count: int | None = None
+
+class SQLiteClient:
+    """
+    An embedded SQLite backend with the 'manager', 'club', 'standing' and 'matchup' schema of the Supabase database.
+    It implements the part of the Supabase client used by 'shared.supabase', so every reader and writer runs against
+    it unchanged: 'table' with 'select', 'eq', 'neq', 'gt', 'gte', 'lt', 'lte', 'in_', 'order', 'range' and 'upsert'
+    with 'on_conflict', and 'rpc' for 'get_head_to_head'.
+    """
+    def __init__(self, path: str | Path = SQLITE_PATH) -> None:
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+
+        # one connection is shared by every thread, statements are serialized by the lock
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+
+        with self.lock:
+            # foreign keys are off by default in SQLite, and are enabled so the 'references' clauses are enforced
+            self.connection.execute("pragma foreign_keys = on")
+            self.connection.execute("pragma journal_mode = wal")
+            self.connection.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+
+            self.columns: dict[str, dict[str, str]] = {
+                table: { column["name"]: column["type"].lower() for column in self.connection.execute(f"pragma table_info({table})") }
+                for (table,) in self.connection.execute("select name from sqlite_master where type = 'table' and name not like 'sqlite_%'")
+            }
+
+        # 'create table if not exists' keeps the integer ids of databases created before ids were uuid text
+        if any(self.columns[table]["id"] == "integer" for table in ("standing", "matchup")):
+            self.connection.close()
+            raise RuntimeError(f"The SQLite database at {path=} has integer 'standing' and 'matchup' ids from an older schema, remove it and run 'leaguedb mirror' again.")
+
+    def table(self, name: str) -> "Query":
+        if name not in self.columns:
+            raise ValueError(f"The table {name=} is not in the SQLite schema.")
+
+        return Query(self, name)
+
+    def rpc(self, name: str, params: dict[str, Any]) -> "Rpc":
+        if name != "get_head_to_head":
+            raise ValueError(f"The function {name=} is not in the SQLite schema.")
+
+        return Rpc(self, HEAD_TO_HEAD_SQL, params)
+
+    def execute(self, sql: str, params: list[Any] | dict[str, Any], many: bool = False) -> list[dict[str, Any]]:
+        with self.lock:
+            if not many:
+                return [dict(row) for row in self.connection.execute(sql, params)]
+
+            # every row of a write runs in one transaction, so a failed row rolls back the whole write
+            self.connection.execute("begin")
+            try:
+                rows = [dict(row) for values in params for row in self.connection.execute(sql, values)]
+                self.connection.execute("commit")
+
+                return rows
+
+            except Exception:
+                self.connection.execute("rollback")
+                raise
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+class Query:
+    """
+    A query on one table of a 'SQLiteClient', built and executed like a Supabase query.
+    """
+    def __init__(self, client: SQLiteClient, table: str) -> None:
+        self.client = client
+        self.name = table
+        self.columns = client.columns[table]
+        self.selected = "*"
+        self.embeds: dict[str, list[str]] = {}
+        self.count: str | None = None
+        self.filters: list[tuple[str, list[Any]]] = []
+        self.orders: list[tuple[str, bool]] = []
+        self.limit: tuple[int, int] | None = None
+        self.rows: list[dict[str, Any]] | None = None
+        self.on_conflict: list[str] = []
+        self.returning = ReturnMethod.representation
+
+    def select(self, columns: str = "*", count: str | None = None) -> "Query":
+        # embedded resources are written as 'table(column, column)'
+        self.embeds = { table: [column.strip() for column in embed.split(",")] for table, embed in re.findall(r"(\w+)\(([^)]*)\)", columns) }
+        self.selected = ", ".join(column.strip() for column in re.sub(r"\w+\([^)]*\)", "", columns).split(",") if column.strip()) or "*"
+        self.count = count
+
+        return self
+
+    def eq(self, column: str, value: Any) -> "Query":
+        return self._filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "Query":
+        return self._filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "Query":
+        return self._filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "Query":
+        return self._filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "Query":
+        return self._filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "Query":
+        return self._filter(column, "lte", value)
+
+    def in_(self, column: str, values: list[Any]) -> "Query":
+        placeholders = ", ".join("?" for _ in values) or "null"
+        self.filters.append((f"{self.name}.{self._column(column)} in ({placeholders})", [self._encode(value) for value in values]))
+        return self
+
+    def order(self, column: str, desc: bool = False) -> "Query":
+        self.orders.append((self._column(column), desc))
+        return self
+
+    def range(self, start: int, end: int) -> "Query":
+        self.limit = (start, end)
+        return self
+
+    def upsert(self, rows: dict[str, Any] | list[dict[str, Any]], on_conflict: str = "id", returning: ReturnMethod = ReturnMethod.representation) -> "Query":
+        self.rows = rows if isinstance(rows, list) else [rows]
+        self.on_conflict = [self._column(column.strip()) for column in on_conflict.split(",")]
+        self.returning = returning
+
+        return self
+
+    def execute(self) -> Response:
+        if self.rows is not None:
+            return self._execute_upsert()
+
+        where = " and ".join(condition for condition, _ in self.filters) or "1"
+        params = [value for _, values in self.filters for value in values]
+
+        # an embed replaces its foreign key column with a json object of the row the key points to
+        selected = [column for column in self.columns if column not in self.embeds] if self.selected == "*" else [self._column(column) for column in self.selected.split(", ")]
+        columns = ", ".join([*(f"{self.name}.{column}" for column in selected), *(self._embed(table, embed) for table, embed in self.embeds.items())])
+
+        sql = f"select {columns} from {self.name} where {where}"
+        if self.orders:
+            sql += " order by " + ", ".join(f"{self.name}.{column} {'desc' if desc else 'asc'}" for column, desc in self.orders)
+        if self.limit is not None:
+            sql += f" limit {self.limit[1] - self.limit[0] + 1} offset {self.limit[0]}"
+
+        rows = [self._decode(row) for row in self.client.execute(sql, params)]
+        count = self.client.execute(f"select count(*) as count from {self.name} where {where}", params)[0]["count"] if self.count else None
+
+        return Response(rows, count)
+
+    def _execute_upsert(self) -> Response:
+        rows = self.rows or []
+        if not rows:
+            return Response([])
+
+        # rows without an 'updated_at' are stamped like the trigger of 'shared/supabase/sql/matchup_updated_at.sql'
+        if "updated_at" in self.columns:
+            now = datetime.now(timezone.utc).isoformat()
+            rows = [{ "updated_at": now, **row } for row in rows]
+
+        columns = [self._column(column) for column in dict.fromkeys(key for row in rows for key in row)]
+        updates = [column for column in columns if column not in self.on_conflict] or self.on_conflict
+
+        sql = (
+            f"insert into {self.name} ({', '.join(columns)}) values ({', '.join('?' for _ in columns)}) "
+            f"on conflict ({', '.join(self.on_conflict)}) do update set {', '.join(f'{column} = excluded.{column}' for column in updates)} "
+            f"returning *"
+        )
+
+        written = self.client.execute(sql, [[self._encode(row.get(column)) for column in columns] for row in rows], many=True)
+
+        return Response([] if self.returning == ReturnMethod.minimal else [self._decode(row) for row in written])
+
+    def _filter(self, column: str, operator: str, value: Any) -> "Query":
+        self.filters.append((f"{self.name}.{self._column(column)} {OPERATORS[operator]} ?", [self._encode(value)]))
+        return self
+
+    def _column(self, column: str) -> str:
+        # columns are interpolated into the sql, so only columns of the table are allowed
+        if column not in self.columns:
+            raise ValueError(f"The column {column=} is not in the SQLite table '{self.name}'.")
+
+        return column
+
+    def _embed(self, table: str, columns: list[str]) -> str:
+        if table not in self.client.columns:
+            raise ValueError(f"The embedded table {table=} is not in the SQLite schema.")
+
+        fields = ", ".join(f"'{column}', {table}.{column}" for column in columns if column in self.client.columns[table])
+        return f"(select json_object({fields}) from {table} where {table}.id = {self.name}.{self._column(table)}) as {table}"
+
+    def _encode(self, value: Any) -> Any:
+        return json.dumps(value) if isinstance(value, (dict, list)) else value
+
+    def _decode(self, row: dict[str, Any]) -> dict[str, Any]:
+        # booleans are stored as integers and embeds as json text
+        for column, value in row.items():
+            if column in self.embeds and value is not None:
+                row[column] = json.loads(value)
+            elif self.columns.get(column) == "boolean" and value is not None:
+                row[column] = bool(value)
+
+        return row
+
+class Rpc:
+    """
+    A function call of a 'SQLiteClient', executed like a Supabase rpc.
+    """
+    def __init__(self, client: SQLiteClient, sql: str, params: dict[str, Any]) -> None:
+        self.client = client
+        self.sql = sql
+        self.params = params
+
+    def execute(self) -> Response:
+        return Response(self.client.execute(self.sql, self.params))
@@ -0,0 +1,59 @@
+# function imports
+from supabase import Client
+from typing import Any
+
+# local imports
+from shared.python.trace import traced
+from shared.sqlite.client import SQLiteClient
+from shared.supabase.page import get_pages
+from shared.supabase.write import CHUNK_SIZE
+
+# the unique constraint of each mirrored table in write order, so foreign keys exist before the rows that reference them
+TABLE_KEYS: dict[str, list[str]] = {
+    "manager": ["id"],
+    "club": ["id"],
+    "standing": ["season", "club", "week"],
+    "matchup": ["season", "club_x", "club_y", "week"]
+}
+
+@traced
+def mirror_tables(source: Client | SQLiteClient, target: Client | SQLiteClient, tables: list[str] | None = None, ids: bool = True, chunk_size: int = CHUNK_SIZE) -> dict[str, int]:
+    """
+    Mirrors the rows of every given table from one backend to another, upserting on the unique constraint of each table.
+    Pull hosted Supabase into a local SQLite database with 'mirror_tables(client, SQLiteClient())', or push local rows
+    to Supabase with 'mirror_tables(SQLiteClient(), client, ids=False)'.
+
+    Args:
+        source (Client | SQLiteClient): The backend to read from.
+        target (Client | SQLiteClient): The backend to write to.
+        tables (list[str] | None = None): The tables to mirror, defaults to every table in 'TABLE_KEYS'.
+        ids (bool = True): Whether to keep the 'id' of 'standing' and 'matchup' rows, otherwise the target assigns its own.
+        chunk_size (int = CHUNK_SIZE): The maximum number of rows per upsert request.
+
+    Returns:
+        dict[str, int]: The number of rows mirrored of each table.
+    """
+    counts: dict[str, int] = {}
+
+    for table in [table for table in TABLE_KEYS if table in (tables or TABLE_KEYS)]:
+        try:
+            keys = TABLE_KEYS[table]
+            columns = target.columns[table] if isinstance(target, SQLiteClient) else None
+
+            # surrogate ids and timestamps are left to the target when the rows are matched on a natural key
+            dropped = set() if ids or keys == ["id"] else { "id", "updated_at" }
+
+            counts[table] = 0
+            for page in get_pages(lambda count: source.table(table).select("*", count=count).order("id"), page_size=chunk_size):
+                rows: list[dict[str, Any]] = [
+                    { key: value for key, value in row.items() if key not in dropped and (columns is None or key in columns) }
+                    for row in page
+                ]
+
+                target.table(table).upsert(rows, on_conflict=", ".join(keys)).execute()
+                counts[table] += len(rows)
+
+        except Exception as ex:
+            raise RuntimeError(f"Error mirroring the {table=}.") from ex
+
+    return counts
@@ -0,0 +1,54 @@
+-- the 'manager', 'club', 'standing' and 'matchup' tables of the Supabase schema for the embedded SQLite backend
+-- created by shared.sqlite.client.SQLiteClient when a database is opened
+-- ids are uuid text like the Postgres schema, so mirrored rows keep their keys, and rows inserted locally get a random v4 uuid
+create table if not exists manager (
+    id text primary key,
+    name text,
+    sleeper text
+);
+
+create table if not exists club (
+    id text primary key,
+    league text,
+    name text,
+    founded text,
+    title integer not null default 0,
+    active boolean not null default 1,
+    manager text references manager (id)
+);
+
+create index if not exists club_league_idx on club (league);
+
+create table if not exists standing (
+    id text not null primary key default (lower(hex(randomblob(4)) || '-' || hex(randomblob(2)) || '-4' || substr(hex(randomblob(2)), 2) || '-' || substr('89ab', 1 + abs(random()) % 4, 1) || substr(hex(randomblob(2)), 2) || '-' || hex(randomblob(6)))),
+    season text not null,
+    club text not null references club (id),
+    week integer not null,
+    standing integer,
+    win integer,
+    loss integer,
+    draw integer,
+    pf real,
+    pa real,
+    mpf real,
+    unique (season, club, week)
+);
+
+create table if not exists matchup (
+    id text not null primary key default (lower(hex(randomblob(4)) || '-' || hex(randomblob(2)) || '-4' || substr(hex(randomblob(2)), 2) || '-' || substr('89ab', 1 + abs(random()) % 4, 1) || substr(hex(randomblob(2)), 2) || '-' || hex(randomblob(6)))),
+    season text not null,
+    week integer not null,
+    club_x text not null references club (id),
+    score_x real,
+    club_y text not null references club (id),
+    score_y real,
+    winner text,
+    stage text,
+    round text,
+    updated_at text not null default (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')),
+    unique (season, club_x, club_y, week)
+);
+
+-- supports the watermark of shared.store.matchup.sync_matchups and the pair lookup of get_head_to_head
+create index if not exists matchup_updated_at_idx on matchup (updated_at);
+create index if not exists matchup_pair_idx on matchup (min(club_x, club_y), max(club_x, club_y));
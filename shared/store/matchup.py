@@ -0,0 +1,149 @@
+# package imports
+import json
+import os
+import polars as pl
+
+# function imports
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from supabase import Client
+
+# local imports
+from shared.python.trace import traced
+from shared.supabase.matchup import MATCHUP_SCHEMA, get_matchups_frame
+
+STORE_PATH = Path(os.getenv("MATCHUP_STORE_PATH", Path.home() / ".cache" / "leaguedb" / "matchup"))
+WATERMARK_FILE = "_watermark.json"
+WATERMARK_MARGIN = timedelta(minutes=10)
+FULL_SYNC_INTERVAL = timedelta(days=7)
+
+@traced
+def sync_matchups(client: Client, root: Path = STORE_PATH, full: bool = False) -> int:
+    """
+    Syncs the local Parquet copy of the Supabase 'matchup' table, partitioned by season and week.
+    Only the rows updated at or after the stored 'updated_at' watermark, less 'WATERMARK_MARGIN', are fetched and merged
+    into their partitions by 'id'. The margin catches rows committed after the last sync by a transaction that started
+    before it, since 'updated_at' is set when the transaction starts.
+    Rows deleted from the 'matchup' table are not seen by an incremental sync, so the whole store is rewritten from a full
+    read every 'FULL_SYNC_INTERVAL', which drops deleted rows and emptied partitions.
+
+    Args:
+        client (Client): The Supabase client instance.
+        root (Path = STORE_PATH): The root directory of the local matchup store.
+        full (bool = False): Whether to rewrite the whole store even if the last full sync is recent.
+
+    Returns:
+        int: The number of matchup rows fetched and synced.
+    """
+    try:
+        watermark = get_watermark(root)
+        full = full or watermark is None or _is_full_sync_due(root)
+        updated_since = None if full else (datetime.fromisoformat(watermark) - WATERMARK_MARGIN).isoformat()
+        synced_at = datetime.now(timezone.utc).isoformat()
+
+        # get matchups updated since the last sync, or every matchup on a full sync
+        if (updates := get_matchups_frame(client, updated_since=updated_since, max_workers=4)) is None:
+            updates = pl.DataFrame(schema={ "id": pl.String, **MATCHUP_SCHEMA })
+
+        updates = updates.with_columns([
+            pl.col(column).cast(dtype) for column, dtype in MATCHUP_SCHEMA.items() if column in updates.columns
+        ]).unique("id", keep="last", maintain_order=True)
+
+        # merge the updated rows into each partition they touch, or replace every partition on a full sync
+        paths: set[Path] = set()
+        for (season, week), partition in updates.partition_by(["season", "week"], as_dict=True).items():
+            path = root / f"season={season}" / f"week={week}" / "part.parquet"
+            partition = partition.drop(["season", "week"])
+            paths.add(path)
+
+            if not full and path.exists():
+                stored = pl.read_parquet(path)
+                partition = pl.concat([stored.filter(~pl.col("id").is_in(partition["id"].implode())), partition], how="diagonal_relaxed")
+
+            write_partition(partition, path)
+
+        # a full sync removes the partitions left with only deleted rows
+        if full:
+            for path in root.glob("season=*/week=*/part.parquet"):
+                if path not in paths:
+                    path.unlink()
+
+        # advance the watermark only after every partition is written, it never moves back past the rows already stored
+        if (updated_at := updates["updated_at"].max()) is None or (not full and watermark is not None and watermark > updated_at):
+            updated_at = watermark
+
+        if updated_at is not None:
+            set_watermark(root, updated_at, synced_at if full else _get_full_sync_time(root))
+
+        return updates.height
+
+    except Exception as ex:
+        raise RuntimeError(f"Error syncing the local matchup store at {root=}.") from ex
+
+def scan_matchups(root: Path = STORE_PATH) -> pl.LazyFrame:
+    """
+    Scans the local matchup store lazily so filters on 'season' and 'week' only read the matching partitions.
+
+    Args:
+        root (Path = STORE_PATH): The root directory of the local matchup store.
+
+    Returns:
+        polars.LazyFrame: A LazyFrame over every stored matchup.
+    """
+    if not any(root.glob("season=*/week=*/part.parquet")):
+        raise RuntimeError(f"The local matchup store at {root=} is empty, run 'sync_matchups' first.")
+
+    return pl.scan_parquet(
+        root / "**" / "*.parquet",
+        hive_partitioning=True,
+        hive_schema={ "season": pl.String, "week": pl.Int64 }
+    )
+
+def get_watermark(root: Path = STORE_PATH) -> str | None:
+    """
+    Gets the 'updated_at' watermark of the last sync of the local matchup store.
+
+    Args:
+        root (Path = STORE_PATH): The root directory of the local matchup store.
+
+    Returns:
+        str | None: The ISO timestamp of the most recently updated stored matchup.
+        Returns None if the store has never been synced.
+    """
+    path = root / WATERMARK_FILE
+    if not path.exists():
+        return None
+
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file).get("updated_at")
+
+def set_watermark(root: Path, updated_at: str, full_synced_at: str | None = None) -> None:
+    root.mkdir(parents=True, exist_ok=True)
+    temp_path = root / f"{WATERMARK_FILE}.tmp"
+
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump({ "updated_at": updated_at, "full_synced_at": full_synced_at }, file)
+
+    os.replace(temp_path, root / WATERMARK_FILE)
+
+def write_partition(partition: pl.DataFrame, path: Path) -> None:
+    # write to a temporary file first so a failed sync never leaves a partial partition
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".tmp")
+
+    partition.write_parquet(temp_path)
+    os.replace(temp_path, path)
+
+def _get_full_sync_time(root: Path) -> str | None:
+    path = root / WATERMARK_FILE
+    if not path.exists():
+        return None
+
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file).get("full_synced_at")
+
+def _is_full_sync_due(root: Path) -> bool:
+    # stores synced before full syncs were recorded are rewritten once
+    full_synced_at = _get_full_sync_time(root)
+
+    return full_synced_at is None or datetime.now(timezone.utc) - datetime.fromisoformat(full_synced_at) >= FULL_SYNC_INTERVAL
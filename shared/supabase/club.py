@@ -1,33 +1,73 @@
+# package imports
+import polars as pl
+
 # function imports
 from supabase import Client
-from typing import Any
+from typing import Any, Callable
+
+# local imports
+from shared.python.trace import traced
+from shared.supabase.page import get_frame, get_pages
+
+# dtype of the embedded manager of each club row
+MANAGER_SCHEMA = pl.Struct({ "name": pl.String(), "sleeper": pl.String() })
 
-def get_clubs(client: Client, league_id: str | None = None) -> list[dict[str, Any]] | None:
+@traced
+def get_clubs(client: Client, league_id: str | None = None, columns: str = "*", max_workers: int = 1) -> list[dict[str, Any]] | None:
     """
-    Gets clubs from the Supabase 'club' table for a given league.
+    Gets clubs from the Supabase 'club' table for a given league as rows of the DataFrame returned by 'get_clubs_frame'.
 
     Args:
         client (Client): The Supabase client instance.
         league_id (str | None = None): The optional Supabase UUID of the league.
+        columns (str = "*"): The club columns to select, the manager 'name' and 'sleeper' id are always selected.
+        max_workers (int = 1): The maximum number of pages fetched concurrently.
 
     Returns:
         list[dict[str, Any]] | None: A list of club rows returned from the Supabase get.
         Returns None if no records are found.
     """
     try:
-        query = client.table("club").select("*, manager(name, sleeper)").eq("league", league_id) if league_id is not None else client.table("club").select("*, manager(name, sleeper)")
-        response = query.execute()
+        clubs = get_clubs_frame(client, league_id, columns, max_workers)
+
+        return clubs.to_dicts() if clubs is not None else None
+
+    except Exception as ex:
+        raise RuntimeError(f"Querying the Supabase database to get clubs failed for {league_id=}.") from ex
 
-        if not response.data:
+@traced
+def get_clubs_frame(client: Client, league_id: str | None = None, columns: str = "*", max_workers: int = 1) -> pl.DataFrame | None:
+    """
+    Gets clubs from the Supabase 'club' table for a given league as a polars DataFrame assembled page by page.
+    The embedded manager is read as a struct and flattened into the 'manager' name and 'sleeper' id columns with expressions.
+
+    Args:
+        client (Client): The Supabase client instance.
+        league_id (str | None = None): The optional Supabase UUID of the league.
+        columns (str = "*"): The club columns to select, the manager 'name' and 'sleeper' id are always selected.
+        max_workers (int = 1): The maximum number of pages fetched concurrently.
+
+    Returns:
+        polars.DataFrame | None: A DataFrame of the club rows with the same columns as 'get_clubs'.
+        Returns None if no records are found.
+    """
+    try:
+        if (clubs := get_frame(get_pages(_club_query(client, league_id, columns), max_workers=max_workers), schema_overrides={ "manager": MANAGER_SCHEMA })) is None:
             return None
-        
-        return [
-            {
-                **{key: value for key, value in row.items() if key != "manager"},
-                "manager": row["manager"]["name"],
-                "sleeper": row["manager"]["sleeper"]
-            } for row in response.data
-        ]
-        
+
+        return clubs.with_columns([
+            pl.col("manager").struct.field("name").alias("manager"),
+            pl.col("manager").struct.field("sleeper").alias("sleeper")
+        ])
+
     except Exception as ex:
-        raise RuntimeError(f"Querying the Supabase database to get clubs failed for {league_id=}.") from ex
\ No newline at end of file
+        raise RuntimeError(f"Querying the Supabase database to get clubs failed for {league_id=}.") from ex
+
+def _club_query(client: Client, league_id: str | None, columns: str) -> Callable[[str | None], Any]:
+    def query(count: str | None) -> Any:
+        query = client.table("club").select(f"{columns}, manager(name, sleeper)", count=count)
+        query = query.eq("league", league_id) if league_id is not None else query
+
+        return query.order("id")
+
+    return query
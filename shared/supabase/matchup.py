@@ -1,28 +1,101 @@
+# package imports
+import polars as pl
+
 # function imports
 from supabase import Client
-from typing import Any
+from typing import Any, Callable
+
+# local imports
+from shared.python.trace import traced
+from shared.supabase.page import get_frame, get_pages
+from shared.supabase.write import CHUNK_SIZE, get_season_weeks, write_rows
+
+# dtypes of the 'matchup' columns, declared so pages are not inferred one by one and an all-null 'round' or whole-number scores keep their dtype
+MATCHUP_SCHEMA: dict[str, pl.DataType] = {
+    "season": pl.String(),
+    "week": pl.Int64(),
+    "club_x": pl.String(),
+    "score_x": pl.Float64(),
+    "club_y": pl.String(),
+    "score_y": pl.Float64(),
+    "winner": pl.String(),
+    "stage": pl.String(),
+    "round": pl.String(),
+    "updated_at": pl.String()
+}
 
-def get_matchups(client: Client, season_id: str | None = None) -> list[dict[str, Any]] | None:
+@traced
+def get_matchups(client: Client, season_id: str | None = None, week: int | list[int] | None = None, updated_since: str | None = None, columns: str = "*", max_workers: int = 1) -> list[dict[str, Any]] | None:
     """
-    Gets matchups from the Supabase 'matchup' table for a given league.
+    Gets matchups from the Supabase 'matchup' table for a given league, one page at a time.
 
     Args:
         client (Client): The Supabase client instance.
         season_id (str | None = None): The optional Supabase UUID of the season.
+        week (int | list[int] | None = None): The optional week number, or week numbers, of the matchups.
+        updated_since (str | None = None): The optional ISO timestamp at or after which the matchups were last updated.
+        columns (str = "*"): The columns to select.
+        max_workers (int = 1): The maximum number of pages fetched concurrently.
 
     Returns:
         list[dict[str, Any]] | None: A list of matchup rows returned from the Supabase get.
         Returns None if no records are found.
     """
     try:
-        query = client.table("matchup").select("*").eq("season", season_id) if season_id is not None else client.table("matchup").select("*")
-        response = query.execute()
+        pages = get_pages(_matchup_query(client, season_id, week, updated_since, columns), max_workers=max_workers)
+
+        return [row for page in pages for row in page] or None
         
+    except Exception as ex:
+        raise RuntimeError(f"Querying the Supabase database to get matchups failed with {season_id=} and {week=}.") from ex
+
+@traced
+def get_matchups_frame(client: Client, season_id: str | None = None, week: int | list[int] | None = None, updated_since: str | None = None, columns: str = "*", max_workers: int = 1) -> pl.DataFrame | None:
+    """
+    Gets matchups from the Supabase 'matchup' table for a given league as a polars DataFrame assembled page by page.
+
+    Args:
+        client (Client): The Supabase client instance.
+        season_id (str | None = None): The optional Supabase UUID of the season.
+        week (int | list[int] | None = None): The optional week number, or week numbers, of the matchups.
+        updated_since (str | None = None): The optional ISO timestamp at or after which the matchups were last updated.
+        columns (str = "*"): The columns to select.
+        max_workers (int = 1): The maximum number of pages fetched concurrently.
+
+    Returns:
+        polars.DataFrame | None: A DataFrame of the matchup rows returned from the Supabase get.
+        Returns None if no records are found.
+    """
+    try:
+        return get_frame(get_pages(_matchup_query(client, season_id, week, updated_since, columns), max_workers=max_workers), schema_overrides=MATCHUP_SCHEMA)
+
+    except Exception as ex:
+        raise RuntimeError(f"Querying the Supabase database to get matchups failed with {season_id=} and {week=}.") from ex
+
+@traced
+def get_head_to_head(client: Client, season_id: str, week: int) -> list[dict[str, Any]] | None:
+    """
+    Gets the head-to-head history across every season for each pair of clubs playing in a given season and week.
+    The aggregation runs in the database through the 'get_head_to_head' function in 'shared/supabase/sql/get_head_to_head.sql'.
+
+    Args:
+        client (Client): The Supabase client instance.
+        season_id (str): The Supabase UUID of the season.
+        week (int): The week number of the matchups.
+
+    Returns:
+        list[dict[str, Any]] | None: A list of 'club_x', 'club_y', 'wins_x', 'wins_y' and 'draws' rows returned from the Supabase rpc.
+        Returns None if no records are found.
+    """
+    try:
+        response = client.rpc("get_head_to_head", { "season_id": season_id, "week_number": week }).execute()
+
         return response.data or None
-        
+
     except Exception as ex:
-        raise RuntimeError(f"Querying the Supabase database to get matchups failed with {season_id=}.") from ex
+        raise RuntimeError(f"Querying the Supabase database to get head-to-head history failed with {season_id=} and {week=}.") from ex
 
+@traced
 def upsert_matchups(client: Client, matchups: list[dict[str, Any]]) -> list[dict[str, Any]] | None:
     """
     Upserts weekly matchups into the Supabase 'matchup' table.
@@ -42,4 +115,44 @@ def upsert_matchups(client: Client, matchups: list[dict[str, Any]]) -> list[dict
         return response.data or None
     
     except Exception as ex:
-        raise RuntimeError(f"Querying the Supabase database to upsert matchups failed.") from ex
\ No newline at end of file
+        raise RuntimeError(f"Querying the Supabase database to upsert matchups failed.") from ex
+
+@traced
+def write_matchups(client: Client, matchups: list[dict[str, Any]], chunk_size: int = CHUNK_SIZE, minimal: bool = False, current: list[dict[str, Any]] | None = None) -> tuple[list[dict[str, Any]], dict[str, int]]:
+    """
+    Writes weekly matchups into the Supabase 'matchup' table, upserting only the new and changed rows in chunks.
+
+    Args:
+        client (Client): The Supabase client instance.
+        matchups (list[dict[str, Any]]): Matchup data to write.
+        chunk_size (int = CHUNK_SIZE): The maximum number of rows per upsert request.
+        minimal (bool = False): Whether to ask for a minimal response instead of the upserted rows.
+        current (list[dict[str, Any]] | None = None): The optional matchup rows already known to be stored, skipping the read of each season and week.
+
+    Returns:
+        tuple[list[dict[str, Any]], dict[str, int]]: The matchup rows as stored after the write and the counts of 'inserted', 'updated' and 'unchanged' rows.
+    """
+    try:
+        # get the stored matchups of the seasons and weeks being written
+        if current is None:
+            current = [
+                row
+                for season_id, week in get_season_weeks(matchups).items()
+                for row in get_matchups(client, season_id, week) or []
+            ]
+
+        return write_rows(client, "matchup", matchups, current, ["season", "club_x", "club_y", "week"], ["score_x", "score_y", "winner", "stage", "round"], chunk_size, minimal)
+
+    except Exception as ex:
+        raise RuntimeError(f"Querying the Supabase database to write matchups failed.") from ex
+
+def _matchup_query(client: Client, season_id: str | None, week: int | list[int] | None, updated_since: str | None, columns: str) -> Callable[[str | None], Any]:
+    def query(count: str | None) -> Any:
+        query = client.table("matchup").select(columns, count=count)
+        query = query.eq("season", season_id) if season_id is not None else query
+        query = query.in_("week", week) if isinstance(week, list) else query.eq("week", week) if week is not None else query
+        query = query.gte("updated_at", updated_since) if updated_since is not None else query
+
+        return query.order("id")
+
+    return query
@@ -0,0 +1,71 @@
+# package imports
+import polars as pl
+
+# function imports
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator
+
+# rows per page, lowered to the PostgREST 'max-rows' setting of the Supabase project when that is smaller
+PAGE_SIZE: int = 1000
+
+def get_pages(query: Callable[[str | None], Any], page_size: int = PAGE_SIZE, max_workers: int = 1) -> Iterator[list[dict[str, Any]]]:
+    """
+    Gets the rows of a Supabase select query one range-based page at a time, so reads past the PostgREST 'max-rows' limit are never truncated.
+    The rows are counted with the first page to plan the remaining ranges, and a first page cut short by 'max-rows' sets
+    the size of the remaining pages.
+
+    Args:
+        query (Callable[[str | None], Any]): A function returning a fresh, ordered select query given the optional count method of the select.
+        page_size (int = PAGE_SIZE): The number of rows per page.
+        max_workers (int = 1): The maximum number of pages fetched concurrently.
+
+    Yields:
+        list[dict[str, Any]]: The rows of each page in order.
+    """
+    first = query("exact").range(0, page_size - 1).execute()
+    if not (rows := first.data or []):
+        return
+
+    yield rows
+
+    # a page shorter than the count was capped by 'max-rows', so the remaining pages are planned at that size
+    page_size = min(page_size, len(rows))
+    starts = range(len(rows), first.count or 0, page_size)
+
+    if max_workers <= 1:
+        for start in starts:
+            if not (rows := query(None).range(start, start + page_size - 1).execute().data):
+                return
+
+            yield rows
+
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for rows in executor.map(lambda start: query(None).range(start, start + page_size - 1).execute().data, starts):
+            if rows:
+                yield rows
+
+def get_frame(pages: Iterable[list[dict[str, Any]]], schema: dict[str, pl.DataType] | None = None, schema_overrides: dict[str, pl.DataType] | None = None) -> pl.DataFrame | None:
+    """
+    Assembles pages of Supabase rows into one polars DataFrame, converting each page as it arrives.
+    Declaring the dtypes of the columns skips inferring them from every page and keeps the pages concatenable without casts.
+
+    Args:
+        pages (Iterable[list[dict[str, Any]]]): The pages of rows, e.g. from 'get_pages'.
+        schema (dict[str, polars.DataType] | None = None): The optional schema of the rows, any other column is dropped.
+        schema_overrides (dict[str, polars.DataType] | None = None): The optional dtypes of known columns, any other column is inferred.
+        Columns a page does not have are left out of the overrides so explicit column selections still work.
+
+    Returns:
+        polars.DataFrame | None: A DataFrame of every row.
+        Returns None if there are no rows.
+    """
+    frames = [
+        pl.DataFrame(page, schema=schema, schema_overrides={ column: dtype for column, dtype in (schema_overrides or {}).items() if column in page[0] } or None)
+        for page in pages
+    ]
+    if not frames:
+        return None
+
+    return pl.concat(frames, how="diagonal_relaxed", rechunk=True)
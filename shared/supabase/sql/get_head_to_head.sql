@@ -0,0 +1,24 @@
+-- head-to-head wins and draws across every season for each pair playing in a given season and week
+-- called from shared.supabase.matchup.get_head_to_head through the 'get_head_to_head' rpc
+create or replace function public.get_head_to_head(season_id uuid, week_number integer)
+returns table (club_x uuid, club_y uuid, wins_x bigint, wins_y bigint, draws bigint)
+language sql
+stable
+as $$
+    select
+        current.club_x,
+        current.club_y,
+        count(*) filter (where history.winner = current.club_x) as wins_x,
+        count(*) filter (where history.winner = current.club_y) as wins_y,
+        count(*) filter (where history.winner is null and history.score_x <> 0 and history.score_y <> 0) as draws
+    from public.matchup as current
+    join public.matchup as history
+        on least(history.club_x, history.club_y) = least(current.club_x, current.club_y)
+        and greatest(history.club_x, history.club_y) = greatest(current.club_x, current.club_y)
+    where current.season = season_id
+        and current.week = week_number
+    group by current.club_x, current.club_y;
+$$;
+
+-- supports the pair lookup of the history join
+create index if not exists matchup_pair_idx on public.matchup (least(club_x, club_y), greatest(club_x, club_y));
@@ -0,0 +1,19 @@
+-- last modified timestamp of each matchup row, used as the watermark of shared.store.matchup.sync_matchups
+alter table public.matchup add column if not exists updated_at timestamptz not null default now();
+
+create or replace function public.set_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_at = now();
+    return new;
+end;
+$$;
+
+drop trigger if exists matchup_set_updated_at on public.matchup;
+create trigger matchup_set_updated_at
+    before update on public.matchup
+    for each row execute function public.set_updated_at();
+
+create index if not exists matchup_updated_at_idx on public.matchup (updated_at);
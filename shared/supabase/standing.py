@@ -1,28 +1,76 @@
+# package imports
+import polars as pl
+
 # function imports
 from supabase import Client
-from typing import Any
+from typing import Any, Callable
+
+# local imports
+from shared.python.trace import traced
+from shared.supabase.page import get_frame, get_pages
+from shared.supabase.write import CHUNK_SIZE, get_season_weeks, write_rows
+
+# dtypes of the 'standing' columns, declared so pages are not inferred one by one and whole-number points keep their dtype
+STANDING_SCHEMA: dict[str, pl.DataType] = {
+    "season": pl.String(),
+    "club": pl.String(),
+    "week": pl.Int64(),
+    "standing": pl.Int64(),
+    "win": pl.Int64(),
+    "loss": pl.Int64(),
+    "draw": pl.Int64(),
+    "pf": pl.Float64(),
+    "pa": pl.Float64(),
+    "mpf": pl.Float64()
+}
 
-def get_standings(client: Client, season_id: str | None = None) -> list[dict[str, Any]] | None:
+@traced
+def get_standings(client: Client, season_id: str | None = None, week: int | list[int] | None = None, columns: str = "*", max_workers: int = 1) -> list[dict[str, Any]] | None:
     """
-    Gets standings from the Supabase 'standing' table for a given season.
+    Gets standings from the Supabase 'standing' table for a given season, one page at a time.
 
     Args:
         client (Client): The Supabase client instance.
         season_id (str | None = None): The optional Supabase UUID of the season.
+        week (int | list[int] | None = None): The optional week number, or week numbers, of the standings.
+        columns (str = "*"): The columns to select.
+        max_workers (int = 1): The maximum number of pages fetched concurrently.
 
     Returns:
         list[dict[str, Any]] | None: A list of standing rows returned from the Supabase get.
         Returns None if no records are found.
     """
     try:
-        query = client.table("standing").select("*").eq("season", season_id) if season_id is not None else client.table("standing").select("*")
-        response = query.execute()
-        
-        return response.data or None
+        pages = get_pages(_standing_query(client, season_id, week, columns), max_workers=max_workers)
+
+        return [row for page in pages for row in page] or None
     
     except Exception as ex:
-        raise RuntimeError(f"Querying the Supabase database to get standings failed for {season_id=}.") from ex
+        raise RuntimeError(f"Querying the Supabase database to get standings failed for {season_id=} and {week=}.") from ex
+
+@traced
+def get_standings_frame(client: Client, season_id: str | None = None, week: int | list[int] | None = None, columns: str = "*", max_workers: int = 1) -> pl.DataFrame | None:
+    """
+    Gets standings from the Supabase 'standing' table for a given season as a polars DataFrame assembled page by page.
+
+    Args:
+        client (Client): The Supabase client instance.
+        season_id (str | None = None): The optional Supabase UUID of the season.
+        week (int | list[int] | None = None): The optional week number, or week numbers, of the standings.
+        columns (str = "*"): The columns to select.
+        max_workers (int = 1): The maximum number of pages fetched concurrently.
+
+    Returns:
+        polars.DataFrame | None: A DataFrame of the standing rows returned from the Supabase get.
+        Returns None if no records are found.
+    """
+    try:
+        return get_frame(get_pages(_standing_query(client, season_id, week, columns), max_workers=max_workers), schema_overrides=STANDING_SCHEMA)
+
+    except Exception as ex:
+        raise RuntimeError(f"Querying the Supabase database to get standings failed for {season_id=} and {week=}.") from ex
     
+@traced
 def upsert_standings(client: Client, standings: list[dict[str, Any]]) -> list[dict[str, Any]] | None:
     """
     Upserts weekly standings into the Supabase 'standing' table.
@@ -42,4 +90,41 @@ def upsert_standings(client: Client, standings: list[dict[str, Any]]) -> list[di
         return response.data or None
 
     except Exception as ex:
-        raise RuntimeError(f"Querying the Supabase database to upsert standings failed.") from ex
\ No newline at end of file
+        raise RuntimeError(f"Querying the Supabase database to upsert standings failed.") from ex
+
+@traced
+def write_standings(client: Client, standings: list[dict[str, Any]], chunk_size: int = CHUNK_SIZE, minimal: bool = False) -> tuple[list[dict[str, Any]], dict[str, int]]:
+    """
+    Writes weekly standings into the Supabase 'standing' table, upserting only the new and changed rows in chunks.
+
+    Args:
+        client (Client): The Supabase client instance.
+        standings (list[dict[str, Any]]): Standings data to write.
+        chunk_size (int = CHUNK_SIZE): The maximum number of rows per upsert request.
+        minimal (bool = False): Whether to ask for a minimal response instead of the upserted rows.
+
+    Returns:
+        tuple[list[dict[str, Any]], dict[str, int]]: The standing rows as stored after the write and the counts of 'inserted', 'updated' and 'unchanged' rows.
+    """
+    try:
+        # get the stored standings of the seasons and weeks being written
+        current = [
+            row
+            for season_id, week in get_season_weeks(standings).items()
+            for row in get_standings(client, season_id, week) or []
+        ]
+
+        return write_rows(client, "standing", standings, current, ["season", "club", "week"], ["standing", "win", "loss", "draw", "pf", "pa", "mpf"], chunk_size, minimal)
+
+    except Exception as ex:
+        raise RuntimeError(f"Querying the Supabase database to write standings failed.") from ex
+
+def _standing_query(client: Client, season_id: str | None, week: int | list[int] | None, columns: str) -> Callable[[str | None], Any]:
+    def query(count: str | None) -> Any:
+        query = client.table("standing").select(columns, count=count)
+        query = query.eq("season", season_id) if season_id is not None else query
+        query = query.in_("week", week) if isinstance(week, list) else query.eq("week", week) if week is not None else query
+
+        return query.order("id")
+
+    return query
@@ -0,0 +1,85 @@
+# function imports
+from postgrest import ReturnMethod
+from supabase import Client
+from typing import Any
+
+# rows per upsert request
+CHUNK_SIZE: int = 500
+
+def write_rows(client: Client, table: str, rows: list[dict[str, Any]], current: list[dict[str, Any]], keys: list[str], fields: list[str], chunk_size: int = CHUNK_SIZE, minimal: bool = False) -> tuple[list[dict[str, Any]], dict[str, int]]:
+    """
+    Upserts only the rows that are new or changed compared to the rows currently stored in a Supabase table, in chunks.
+
+    Args:
+        client (Client): The Supabase client instance.
+        table (str): The name of the Supabase table.
+        rows (list[dict[str, Any]]): The candidate rows to write.
+        current (list[dict[str, Any]]): The rows currently stored in the table that the candidate rows may conflict with.
+        keys (list[str]): The columns of the unique constraint used for 'on_conflict'.
+        fields (list[str]): The columns compared to decide whether a stored row changed.
+        A column left out of a candidate row is not written, so it is not compared either.
+        chunk_size (int = CHUNK_SIZE): The maximum number of rows per upsert request.
+        minimal (bool = False): Whether to ask for a minimal response instead of the upserted rows.
+
+    Returns:
+        tuple[list[dict[str, Any]], dict[str, int]]: The rows as stored after the write and the counts of 'inserted', 'updated' and 'unchanged' rows.
+        Rows written with a minimal response are the candidate rows merged over their stored row, so inserted rows have no 'id'.
+    """
+    stored = { tuple(row[key] for key in keys): row for row in current }
+
+    written: list[dict[str, Any]] = []
+    changed: list[dict[str, Any]] = []
+    counts = { "inserted": 0, "updated": 0, "unchanged": 0 }
+
+    # diff the candidate rows against the stored rows
+    for row in rows:
+        existing = stored.get(tuple(row[key] for key in keys))
+
+        if existing is None:
+            counts["inserted"] += 1
+            changed.append(row)
+        elif any(field in row and not is_equal(existing.get(field), row[field]) for field in fields):
+            counts["updated"] += 1
+            changed.append(row)
+        else:
+            counts["unchanged"] += 1
+            written.append(existing)
+
+    # upsert the new and changed rows in chunks
+    for start in range(0, len(changed), chunk_size):
+        chunk = changed[start:start + chunk_size]
+        returning = ReturnMethod.minimal if minimal else ReturnMethod.representation
+
+        response = client.table(table).upsert(chunk, on_conflict=", ".join(keys), returning=returning).execute()
+
+        if minimal:
+            written.extend({ **stored.get(tuple(row[key] for key in keys), {}), **row } for row in chunk)
+        elif response.data:
+            written.extend(response.data)
+        else:
+            raise RuntimeError(f"No data was returned in the upsert response for the {table=} chunk starting at {start=}.")
+
+    return written, counts
+
+def get_season_weeks(rows: list[dict[str, Any]]) -> dict[str, int | list[int]]:
+    """
+    Gets the weeks of each season in a list of candidate rows, so a write only reads the stored rows it may conflict with.
+
+    Args:
+        rows (list[dict[str, Any]]): The candidate rows with a 'season' and 'week'.
+
+    Returns:
+        dict[str, int | list[int]]: A dictionary of season to its week, or to its sorted weeks when there is more than one.
+    """
+    season_weeks: dict[str, set[int]] = {}
+    for row in rows:
+        season_weeks.setdefault(row["season"], set()).add(row["week"])
+
+    return { season: weeks.pop() if len(weeks) == 1 else sorted(weeks) for season, weeks in season_weeks.items() }
+
+def is_equal(stored: Any, candidate: Any) -> bool:
+    # scores are compared to the hundredth since the database may round them
+    if isinstance(stored, (int, float)) and isinstance(candidate, (int, float)) and not isinstance(stored, bool):
+        return round(float(stored), 2) == round(float(candidate), 2)
+
+    return stored == candidate
@@ -0,0 +1,28 @@
+# package imports
+import pytest
+import threading
+
+# function imports
+from supabase import Client, create_client
+from typing import Any, Callable, Iterator
+
+# local imports
+from benchmark.server import PostgrestServer
+
+@pytest.fixture
+def postgrest() -> Iterator[Callable[..., tuple[PostgrestServer, Client]]]:
+    # starts local PostgREST stand-ins over the given tables and returns each with a Supabase client pointed at it
+    servers: list[PostgrestServer] = []
+
+    def start(tables: dict[str, list[dict[str, Any]]], max_rows: int | None = None) -> tuple[PostgrestServer, Client]:
+        server = PostgrestServer(tables, max_rows)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+
+        return server, create_client(server.url, "benchmark.benchmark.benchmark")
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
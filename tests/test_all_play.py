@@ -0,0 +1,83 @@
+# package imports
+import polars as pl
+import pytest
+
+# function imports
+from polars.testing import assert_frame_equal
+from typing import Any, Iterator
+
+# local imports
+from league_table.core import get_all_play
+from shared.sqlite.client import SQLiteClient
+from shared.supabase.club import get_clubs
+
+CLUBS = ["club-a", "club-b", "club-c", "club-d"]
+SEASONS = ["season-2024", "season-2025"]
+WEEKS = 4
+
+@pytest.fixture
+def client() -> Iterator[SQLiteClient]:
+    client = SQLiteClient(":memory:")
+
+    client.table("manager").upsert([{ "id": f"manager-{club}", "name": f"Manager {club}", "sleeper": club } for club in CLUBS]).execute()
+    client.table("club").upsert([{ "id": club, "league": "league", "name": club, "manager": f"manager-{club}" } for club in CLUBS]).execute()
+    client.table("matchup").upsert(matchups(), on_conflict="season, club_x, club_y, week").execute()
+
+    yield client
+    client.close()
+
+def matchups() -> list[dict[str, Any]]:
+    # a fixed schedule of scores with ties within a week and a playoff week that is left out
+    rows: list[dict[str, Any]] = []
+
+    for s, season in enumerate(SEASONS):
+        for week in range(1, WEEKS + 2):
+            scores = [round(80 + (7 * week + 13 * c + 5 * s) % 31 + 0.25 * c, 2) for c in range(len(CLUBS))]
+            if week == 2:
+                scores[1] = scores[2]
+
+            for x, y in ((0, 1), (2, 3)) if week % 2 else ((0, 2), (1, 3)):
+                rows.append({
+                    "season": season,
+                    "week": week,
+                    "club_x": CLUBS[x],
+                    "score_x": scores[x],
+                    "club_y": CLUBS[y],
+                    "score_y": scores[y],
+                    "winner": CLUBS[x] if scores[x] > scores[y] else CLUBS[y] if scores[y] > scores[x] else None,
+                    "stage": "regular" if week <= WEEKS else "playoff",
+                    "round": None
+                })
+
+    return rows
+
+def test_incremental_all_play_matches_a_full_rebuild(client: SQLiteClient) -> None:
+    clubs = get_clubs(client, "league", "id, name") or []
+    full = get_all_play(client, clubs=clubs)
+
+    previous: pl.DataFrame | None = None
+    for season in SEASONS:
+        for week in range(1, WEEKS + 1):
+            previous = get_all_play(client, season, week, previous, clubs=clubs)
+
+    assert previous is not None
+    assert full.height == len(SEASONS) * WEEKS * len(CLUBS)
+    assert_frame_equal(previous, full)
+
+def test_incremental_all_play_replaces_a_week_added_again(client: SQLiteClient) -> None:
+    clubs = get_clubs(client, "league", "id, name") or []
+    full = get_all_play(client, clubs=clubs)
+
+    # adding a week of a finished season again, or an earlier week, replaces the rows at and after it
+    again = get_all_play(client, SEASONS[0], WEEKS, full, clubs=clubs)
+    earlier = get_all_play(client, SEASONS[0], 2, full, clubs=clubs)
+
+    assert_frame_equal(again, full)
+    assert_frame_equal(earlier, full.filter((pl.col("season") != SEASONS[0]) | (pl.col("week") <= 2)))
+
+def test_incremental_all_play_requires_a_season(client: SQLiteClient) -> None:
+    clubs = get_clubs(client, "league", "id, name") or []
+    full = get_all_play(client, clubs=clubs)
+
+    with pytest.raises(ValueError):
+        get_all_play(client, week=2, previous=full, clubs=clubs)
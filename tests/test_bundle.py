@@ -0,0 +1,75 @@
+# package imports
+import polars as pl
+import pytest
+import zipfile
+
+# function imports
+from pathlib import Path
+from typing import Any, Iterator
+
+# local imports
+from bundle.core import build_bundle, get_member, read_bundle
+from league_table.core import rebuild_standings
+from shared.python.registry import invalidate
+from shared.sqlite.client import SQLiteClient
+
+CLUBS = ["club-a", "club-b", "club-c", "club-d"]
+
+@pytest.fixture
+def client() -> Iterator[SQLiteClient]:
+    client = SQLiteClient(":memory:")
+
+    client.table("manager").upsert([{ "id": f"manager-{club}", "name": f"Manager {club}", "sleeper": club } for club in CLUBS]).execute()
+    client.table("club").upsert([{ "id": club, "league": "league", "name": club, "manager": f"manager-{club}" } for club in CLUBS]).execute()
+    upsert(client, *[matchup(week, x, y, 100.0 + week + x, 95.0 + 2 * y) for week in (1, 2, 3) for x, y in ((0, 1), (2, 3))])
+    rebuild_standings(client, "2025")
+
+    yield client
+
+    invalidate("league")
+    client.close()
+
+def matchup(week: int, x: int, y: int, score_x: float, score_y: float) -> dict[str, Any]:
+    winner = CLUBS[x] if score_x > score_y else CLUBS[y] if score_y > score_x else None
+    return { "season": "2025", "week": week, "club_x": CLUBS[x], "score_x": score_x, "club_y": CLUBS[y], "score_y": score_y, "winner": winner, "stage": "regular" }
+
+def upsert(client: SQLiteClient, *rows: dict[str, Any]) -> None:
+    client.table("matchup").upsert(list(rows), on_conflict="season, club_x, club_y, week").execute()
+
+def members(path: Path) -> dict[str, bytes]:
+    with zipfile.ZipFile(path) as bundle:
+        return { name: bundle.read(name) for name in bundle.namelist() }
+
+def test_unchanged_weeks_are_copied(client: SQLiteClient, tmp_path: Path) -> None:
+    path, store = tmp_path / "bundle.zip", tmp_path / "store"
+
+    first = build_bundle(client, "league", "2025", "2025", "league", path, store)
+    before = members(path)
+    unchanged = build_bundle(client, "league", "2025", "2025", "league", path, store)
+
+    # a new score in week 3 changes its matchups and standings, weeks 1 and 2 are copied byte for byte
+    upsert(client, matchup(3, 0, 1, 150.0, 95.0))
+    rebuild_standings(client, "2025", range(3, 4))
+    rebuilt = build_bundle(client, "league", "2025", "2025", "league", path, store)
+    after = members(path)
+
+    assert first["rebuilt"] == [1, 2, 3]
+    assert unchanged["rebuilt"] == [] and unchanged["revision"] == 1
+    assert rebuilt["rebuilt"] == [3] and rebuilt["revision"] == 2
+    assert all(after[get_member(table, week)] == before[get_member(table, week)] for table in ("league_table", "matchup_table") for week in (1, 2))
+    assert after[get_member("league_table", 3)] != before[get_member("league_table", 3)]
+    assert read_bundle(path, "league_table", 3).filter(pl.col("club") == "club-a")["pf"].item() == pytest.approx(101.0 + 102.0 + 150.0)
+
+def test_fingerprints_do_not_use_row_hashes(client: SQLiteClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path, store = tmp_path / "bundle.zip", tmp_path / "store"
+    first = build_bundle(client, "league", "2025", "2025", "league", path, store)
+
+    # row hashes are not stable across polars versions, so fingerprints never depend on them
+    def hash_rows(*args: Any, **kwargs: Any) -> pl.Series:
+        raise AssertionError("The fingerprints used 'hash_rows'.")
+
+    monkeypatch.setattr(pl.DataFrame, "hash_rows", hash_rows)
+    again = build_bundle(client, "league", "2025", "2025", "league", path, store)
+
+    assert again["rebuilt"] == []
+    assert again["weeks"] == first["weeks"]
@@ -0,0 +1,33 @@
+# package imports
+import polars as pl
+
+# local imports
+from league_table.core import calculate_league_tables
+from shared.python.registry import get_club_frame
+from shared.sleeper.roster import get_sleeper_rosters_frame
+
+def test_efficiency_is_null_without_max_points_for() -> None:
+    clubs = [{ "id": club, "name": club, "manager": club } for club in ("club-a", "club-b", "club-c")]
+    standings = pl.DataFrame({
+        "season": ["2025"] * 3,
+        "club": ["club-a", "club-b", "club-c"],
+        "week": [1] * 3,
+        "standing": [1, 2, 3],
+        "pf": [120.0, 100.0, 90.0],
+        "pa": [90.0, 100.0, 120.0],
+        "mpf": [150.0, None, 0.0]
+    })
+
+    league_table = calculate_league_tables(standings.lazy(), get_club_frame(clubs).lazy()).sort("standing").collect()
+
+    assert league_table["eff"].to_list() == [0.8, None, None]
+
+def test_rosters_keep_missing_max_points_for_null() -> None:
+    roster_data = [
+        { "owner_id": "owner-a", "settings": { "wins": 1, "fpts": 120, "fpts_decimal": 50, "ppts": 150, "ppts_decimal": 25 } },
+        { "owner_id": "owner-b", "settings": { "wins": 0, "fpts": 100 } }
+    ]
+
+    rosters = get_sleeper_rosters_frame("league", roster_data)
+
+    assert rosters.select(["id", "pf", "pa", "mpf"]).rows() == [("owner-a", 120.5, 0.0, 150.25), ("owner-b", 100.0, 0.0, None)]
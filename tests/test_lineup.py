@@ -0,0 +1,53 @@
+# package imports
+import polars as pl
+
+# local imports
+from lineup.core import LINEUP_SCHEMA, calculate_optimal_lineups, create_lineups
+
+PLAYERS = pl.DataFrame({
+    "player_id": ["qb", "rb1", "rb2", "wr1", "wr2", "te", "wr-ir", "rb-taxi"],
+    "position": ["QB", "RB", "RB", "WR", "WR", "TE", "WR", "RB"]
+})
+
+def lineups(slots: dict[str, str], points: dict[str, float]) -> pl.DataFrame:
+    return pl.DataFrame({
+        "week": [1] * len(points),
+        "sleeper_id": ["owner"] * len(points),
+        "matchup_id": [1] * len(points),
+        "player_id": list(points),
+        "slot": [slots.get(player_id, "BN") for player_id in points],
+        "points": list(points.values())
+    }, schema=LINEUP_SCHEMA)
+
+def test_optimal_lineup_assigns_overlapping_flex_slots_exactly() -> None:
+    # filling WRRB_FLEX first would take wr2 and leave the te for REC_FLEX: 20 + 15 + 18 + 14 + 2 = 69
+    # the optimal lineup puts rb2 in WRRB_FLEX and wr2 in REC_FLEX: 20 + 15 + 18 + 13 + 14 = 80
+    points = { "qb": 20.0, "rb1": 15.0, "rb2": 13.0, "wr1": 18.0, "wr2": 14.0, "te": 2.0, "wr-ir": 40.0, "rb-taxi": 30.0 }
+    slots = { "qb": "QB", "rb1": "RB", "wr1": "WR", "wr2": "WRRB_FLEX", "te": "REC_FLEX", "wr-ir": "IR", "rb-taxi": "TAXI" }
+
+    efficiency = calculate_optimal_lineups(lineups(slots, points), ["QB", "RB", "WR", "WRRB_FLEX", "REC_FLEX", "BN", "BN", "IR", "TAXI"], PLAYERS)
+
+    assert efficiency.select(["points", "optimal_points", "efficiency"]).row(0) == (69.0, 80.0, 86.2)
+
+def test_optimal_lineup_fills_nested_flex_slots_greedily() -> None:
+    # FLEX takes the best of rb2, wr2 and te, then SUPER_FLEX the best left: 20 + 15 + 18 + 14 + 13 = 80
+    points = { "qb": 20.0, "rb1": 15.0, "rb2": 13.0, "wr1": 18.0, "wr2": 14.0, "te": 2.0, "wr-ir": 40.0 }
+    slots = { "qb": "QB", "rb1": "RB", "wr1": "WR", "te": "FLEX", "rb2": "SUPER_FLEX", "wr-ir": "IR" }
+
+    efficiency = calculate_optimal_lineups(lineups(slots, points), ["QB", "RB", "WR", "FLEX", "SUPER_FLEX", "BN", "IR"], PLAYERS)
+
+    assert efficiency.select(["points", "optimal_points", "efficiency"]).row(0) == (68.0, 80.0, 85.0)
+
+def test_create_lineups_marks_reserve_and_taxi_players() -> None:
+    matchup_data = [{
+        "roster_id": 1,
+        "matchup_id": 1,
+        "starters": ["qb", "0"],
+        "players": ["qb", "rb1", "wr-ir", "rb-taxi"],
+        "players_points": { "qb": 20.0, "rb1": 15.0, "wr-ir": 40.0 }
+    }]
+    roster_data = [{ "roster_id": 1, "owner_id": "owner", "reserve": ["wr-ir"], "taxi": ["rb-taxi"] }]
+
+    lineup = create_lineups(matchup_data, roster_data, ["QB", "RB", "BN", "BN", "IR"], 1)
+
+    assert lineup.select(["player_id", "slot", "points"]).rows() == [("qb", "QB", 20.0), ("rb1", "BN", 15.0), ("wr-ir", "IR", 40.0), ("rb-taxi", "TAXI", 0.0)]
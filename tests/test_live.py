@@ -0,0 +1,68 @@
+# package imports
+import pytest
+
+# function imports
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+# local imports
+from matchup_history.live import MAX_INTERVAL, MIN_INTERVAL, WINDOW_INTERVAL, get_interval, has_changed, is_game_window
+
+def utc(value: str) -> datetime:
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+@pytest.mark.parametrize("now, expected", [
+    # sunday 9-24 eastern, in daylight saving time (UTC-4) and standard time (UTC-5)
+    ("2025-09-07T12:59", False),
+    ("2025-09-07T13:00", True),
+    ("2025-09-08T03:59", True),
+    ("2025-12-07T13:59", False),
+    ("2025-12-07T14:00", True),
+    # monday 0-1 eastern for late sunday games, and monday 19-24
+    ("2025-09-08T04:00", True),
+    ("2025-09-08T04:59", True),
+    ("2025-09-08T05:00", False),
+    ("2025-09-08T22:59", False),
+    ("2025-09-08T23:00", True),
+    ("2025-09-09T03:59", True),
+    ("2025-09-09T04:00", False),
+    # thursday 19-24 eastern
+    ("2025-09-04T22:59", False),
+    ("2025-09-04T23:00", True),
+    ("2025-09-05T04:00", False),
+    # saturday and wednesday
+    ("2025-09-06T18:00", False),
+    ("2025-09-10T23:30", False)
+])
+def test_is_game_window(now: str, expected: bool) -> None:
+    assert is_game_window(utc(now)) is expected
+
+def test_is_game_window_converts_other_timezones() -> None:
+    # 09:30 in London on a Sunday is 04:30 eastern, before the Sunday window
+    london = datetime(2025, 9, 7, 9, 30, tzinfo=timezone(timedelta(hours=1)))
+
+    assert is_game_window(london) is False
+    assert is_game_window(london + timedelta(hours=5)) is True
+
+@pytest.mark.parametrize("interval, changed, now, expected", [
+    (600.0, True, "2025-09-10T12:00", MIN_INTERVAL),
+    (MIN_INTERVAL, False, "2025-09-07T18:00", 2 * MIN_INTERVAL),
+    (WINDOW_INTERVAL, False, "2025-09-07T18:00", WINDOW_INTERVAL),
+    (WINDOW_INTERVAL, False, "2025-09-10T12:00", 2 * WINDOW_INTERVAL),
+    (MAX_INTERVAL, False, "2025-09-10T12:00", MAX_INTERVAL),
+    (1.0, False, "2025-09-10T12:00", MIN_INTERVAL)
+])
+def test_get_interval(interval: float, changed: bool, now: str, expected: float) -> None:
+    assert get_interval(interval, changed, now=utc(now)) == expected
+
+def test_get_interval_respects_a_lower_max_interval() -> None:
+    assert get_interval(60.0, False, max_interval=90.0, now=utc("2025-09-07T18:00")) == 90.0
+
+@pytest.mark.parametrize("seen, expected", [
+    (None, True),
+    ({ "score_x": 100.004, "score_y": 90.0, "winner": "club-a" }, False),
+    ({ "score_x": 100.0, "score_y": 89.99, "winner": "club-a" }, True),
+    ({ "score_x": 100.0, "score_y": 90.0, "winner": None }, True)
+])
+def test_has_changed(seen: dict[str, Any] | None, expected: bool) -> None:
+    assert has_changed(seen, { "score_x": 100.0, "score_y": 90.0, "winner": "club-a" }) is expected
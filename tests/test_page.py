@@ -0,0 +1,40 @@
+# package imports
+import pytest
+
+# function imports
+from supabase import Client
+from typing import Any, Callable
+
+# local imports
+from benchmark.server import PostgrestServer
+from shared.supabase.page import get_frame, get_pages
+
+def rows(count: int) -> list[dict[str, Any]]:
+    return [{ "id": index, "week": index % 14 + 1 } for index in range(1, count + 1)]
+
+def query(client: Client) -> Callable[[str | None], Any]:
+    return lambda count: client.table("matchup").select("id, week", count=count).order("id")
+
+@pytest.mark.parametrize("count, page_size, max_rows, pages, max_workers", [
+    (2500, 1000, None, [1000, 1000, 500], 1),
+    (2000, 1000, None, [1000, 1000], 1),
+    (7, 3, None, [3, 3, 1], 4),
+    (1000, 1000, 300, [300, 300, 300, 100], 1),
+    (1000, 1000, 300, [300, 300, 300, 100], 4),
+    (250, 1000, 300, [250], 1)
+])
+def test_get_pages_reads_every_row_once(postgrest: Callable[..., tuple[PostgrestServer, Client]], count: int, page_size: int, max_rows: int | None, pages: list[int], max_workers: int) -> None:
+    server, client = postgrest({ "matchup": rows(count) }, max_rows)
+
+    read = list(get_pages(query(client), page_size, max_workers))
+
+    assert [len(page) for page in read] == pages
+    assert [row["id"] for page in read for row in page] == list(range(1, count + 1))
+    assert server.requests["GET matchup"] == len(pages)
+
+def test_get_pages_of_an_empty_table(postgrest: Callable[..., tuple[PostgrestServer, Client]]) -> None:
+    server, client = postgrest({ "matchup": [] })
+
+    assert list(get_pages(query(client), 10, max_workers=4)) == []
+    assert get_frame(get_pages(query(client), 10)) is None
+    assert server.requests["GET matchup"] == 2
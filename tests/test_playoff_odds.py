@@ -0,0 +1,72 @@
+# package imports
+import numpy as np
+import pytest
+
+# function imports
+from typing import Any, Iterator
+
+# local imports
+from playoff_odds.core import PRIOR_GAMES, fit_scores, simulate_batch, simulate_seeds
+from shared.sqlite.client import SQLiteClient
+
+CLUBS = ["club-a", "club-b", "club-c", "club-d"]
+
+@pytest.fixture
+def client() -> Iterator[SQLiteClient]:
+    client = SQLiteClient(":memory:")
+
+    client.table("manager").upsert([{ "id": f"manager-{club}", "name": club } for club in CLUBS]).execute()
+    client.table("club").upsert([{ "id": club, "league": "league", "name": club, "manager": f"manager-{club}" } for club in CLUBS]).execute()
+
+    yield client
+    client.close()
+
+def matchup(week: int, club_x: str, score_x: float, club_y: str, score_y: float, stage: str = "regular") -> dict[str, Any]:
+    return { "season": "2025", "week": week, "club_x": club_x, "score_x": score_x, "club_y": club_y, "score_y": score_y, "stage": stage }
+
+def test_clinched_and_eliminated_clubs() -> None:
+    # two weeks left: club-a has clinched the first seed and club-d can no longer reach the second
+    wins = np.array([7.0, 4.0, 3.0, 1.0])
+    pf = np.array([700.0, 650.0, 600.0, 500.0])
+    schedule = np.array([[0, 3], [1, 2], [0, 2], [1, 3]])
+
+    seeds = simulate_seeds(wins, pf, np.full(4, 100.0), np.full(4, 20.0), schedule, 2, 20_000, max_workers=1, seed=7)
+
+    assert seeds[:, 0].tolist() == [20_000, 0, 0, 0]
+    assert seeds[3].tolist() == [0, 0]
+    assert seeds[1, 1] + seeds[2, 1] == 20_000
+    assert seeds[1, 1] > seeds[2, 1] > 0
+
+def test_seeds_are_reproducible_with_a_seed_sequence() -> None:
+    args = (np.array([3.0, 3.0, 2.0, 2.0]), np.array([400.0, 390.0, 410.0, 380.0]), np.full(4, 100.0), np.full(4, 20.0), np.array([[0, 1], [2, 3]]), 2, 5_000)
+
+    first = simulate_batch(*args, np.random.SeedSequence(11))
+    second = simulate_batch(*args, np.random.SeedSequence(11))
+
+    assert np.array_equal(first, second)
+    assert first.sum(axis=0).tolist() == [5_000, 5_000]
+
+def test_ties_on_wins_are_broken_by_points_for() -> None:
+    # no games left, so the seeds are fixed; points for above 1e6 must not outweigh a win
+    wins = np.array([2.0, 3.0, 3.0, 1.0])
+    pf = np.array([2e6, 300.0, 310.0, 5e6])
+
+    seeds = simulate_batch(wins, pf, np.full(4, 100.0), np.full(4, 20.0), np.empty((0, 2), dtype=np.int64), 4, 10, np.random.SeedSequence(0))
+
+    assert seeds.argmax(axis=0).tolist() == [2, 1, 0, 3]
+
+def test_fit_scores_shrinks_to_the_league_mean(client: SQLiteClient) -> None:
+    client.table("matchup").upsert([
+        matchup(1, "club-a", 130.0, "club-b", 90.0),
+        matchup(1, "club-c", 110.0, "club-d", 70.0),
+        matchup(2, "club-a", 0.0, "club-c", 0.0),
+        matchup(3, "club-b", 150.0, "club-d", 50.0),
+        matchup(15, "club-a", 200.0, "club-b", 10.0, stage="playoff")
+    ], on_conflict="season, club_x, club_y, week").execute()
+
+    mean, std = fit_scores(client, "2025", 2, CLUBS)
+
+    # week 2 is unplayed and week 3 and the playoffs are after the week, so the league mean is (130 + 90 + 110 + 70) / 4
+    league = 100.0
+    assert mean.tolist() == pytest.approx([(score + PRIOR_GAMES * league) / (1 + PRIOR_GAMES) for score in (130.0, 90.0, 110.0, 70.0)])
+    assert std.tolist() == pytest.approx([np.std([130.0, 90.0, 110.0, 70.0], ddof=1)] * 4)
@@ -0,0 +1,53 @@
+# package imports
+import pytest
+
+# function imports
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+# local imports
+from shared.python.registry import get_club_lookup, get_club_rows, get_manager_lookup, invalidate
+from shared.sqlite.client import SQLiteClient
+
+def create_client(*clubs: str) -> SQLiteClient:
+    client = SQLiteClient(":memory:")
+
+    client.table("manager").upsert([{ "id": f"manager-{club}", "name": f"Manager {club}", "sleeper": f"owner-{club}" } for club in clubs]).execute()
+    client.table("club").upsert([{ "id": club, "league": "league", "name": club, "manager": f"manager-{club}" } for club in clubs]).execute()
+
+    return client
+
+@pytest.fixture
+def clients() -> Iterator[tuple[SQLiteClient, SQLiteClient]]:
+    first, second = create_client("club-a", "club-b"), create_client("club-c")
+
+    yield first, second
+
+    invalidate("league")
+    first.close()
+    second.close()
+
+def test_club_rows_are_memoized_per_client(clients: tuple[SQLiteClient, SQLiteClient]) -> None:
+    first, second = clients
+
+    assert [club["id"] for club in get_club_rows(first, "league")] == ["club-a", "club-b"]
+    assert [club["id"] for club in get_club_rows(second, "league")] == ["club-c"]
+    assert get_club_lookup(second, "league") == { "owner-club-c": "club-c" }
+    assert get_manager_lookup(first, "league") == { "club-a": "Manager club-a", "club-b": "Manager club-b" }
+
+def test_concurrent_lookups_share_one_memo(clients: tuple[SQLiteClient, SQLiteClient]) -> None:
+    first, _ = clients
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        lookups = list(executor.map(lambda _: get_club_lookup(first, "league"), range(32)))
+
+    assert all(lookup is lookups[0] for lookup in lookups)
+
+def test_invalidate_clears_every_client(clients: tuple[SQLiteClient, SQLiteClient]) -> None:
+    first, second = clients
+    rows = get_club_rows(first, "league"), get_club_rows(second, "league")
+
+    invalidate("league")
+
+    assert get_club_rows(first, "league") is not rows[0]
+    assert get_club_rows(second, "league") is not rows[1]
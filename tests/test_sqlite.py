@@ -0,0 +1,130 @@
+# package imports
+import pytest
+import sqlite3
+import uuid
+
+# function imports
+from pathlib import Path
+from postgrest import ReturnMethod
+from typing import Any, Iterator
+
+# local imports
+from shared.sqlite.client import SQLiteClient
+from shared.sqlite.mirror import mirror_tables
+from shared.supabase.club import get_clubs
+from shared.supabase.matchup import get_head_to_head, get_matchups, write_matchups
+
+@pytest.fixture
+def client() -> Iterator[SQLiteClient]:
+    client = SQLiteClient(":memory:")
+
+    client.table("manager").upsert([
+        { "id": "manager-a", "name": "Manager A", "sleeper": "owner-a" },
+        { "id": "manager-b", "name": "Manager B", "sleeper": "owner-b" }
+    ]).execute()
+    client.table("club").upsert([
+        { "id": "club-a", "league": "league", "name": "Club A", "founded": "2023", "active": True, "manager": "manager-a" },
+        { "id": "club-b", "league": "league", "name": "Club B", "founded": "2023", "active": False, "manager": "manager-b" }
+    ]).execute()
+
+    yield client
+    client.close()
+
+def matchup(season: str, week: int, score_x: float, score_y: float) -> dict[str, Any]:
+    return {
+        "season": season,
+        "week": week,
+        "club_x": "club-a",
+        "score_x": score_x,
+        "club_y": "club-b",
+        "score_y": score_y,
+        "winner": "club-a" if score_x > score_y else "club-b" if score_y > score_x else None,
+        "stage": "regular",
+        "round": None
+    }
+
+def test_upsert_inserts_and_updates_on_conflict(client: SQLiteClient) -> None:
+    inserted = client.table("matchup").upsert([matchup("2025", 1, 100.0, 90.0)], on_conflict="season, club_x, club_y, week").execute().data
+    updated = client.table("matchup").upsert([matchup("2025", 1, 100.0, 110.5)], on_conflict="season, club_x, club_y, week").execute().data
+
+    assert updated[0]["id"] == inserted[0]["id"]
+    assert updated[0]["score_y"] == 110.5
+    assert updated[0]["winner"] == "club-b"
+    assert updated[0]["updated_at"] >= inserted[0]["updated_at"]
+    assert len(client.table("matchup").select("*").execute().data) == 1
+
+def test_upsert_minimal_returns_no_rows(client: SQLiteClient) -> None:
+    response = client.table("matchup").upsert([matchup("2025", 1, 100.0, 90.0)], on_conflict="season, club_x, club_y, week", returning=ReturnMethod.minimal).execute()
+
+    assert response.data == []
+    assert client.table("matchup").select("id", count="exact").execute().count == 1
+
+def test_write_matchups_diffs_stored_weeks(client: SQLiteClient) -> None:
+    _, counts = write_matchups(client, [matchup("2025", 1, 100.0, 90.0), matchup("2025", 2, 80.0, 95.0)])
+    _, counts_again = write_matchups(client, [matchup("2025", 1, 100.0, 90.0), matchup("2025", 2, 80.0, 96.0)])
+
+    assert counts == { "inserted": 2, "updated": 0, "unchanged": 0 }
+    assert counts_again == { "inserted": 0, "updated": 1, "unchanged": 1 }
+    assert [row["week"] for row in get_matchups(client, "2025", [2]) or []] == [2]
+
+def test_select_embeds_the_referenced_row(client: SQLiteClient) -> None:
+    rows = client.table("club").select("id, active, manager(name, sleeper)").order("id").execute().data
+
+    assert rows == [
+        { "id": "club-a", "active": True, "manager": { "name": "Manager A", "sleeper": "owner-a" } },
+        { "id": "club-b", "active": False, "manager": { "name": "Manager B", "sleeper": "owner-b" } }
+    ]
+
+def test_get_clubs_flattens_the_manager(client: SQLiteClient) -> None:
+    clubs = get_clubs(client, "league", "id, name") or []
+
+    assert [(club["id"], club["name"], club["manager"], club["sleeper"]) for club in clubs] == [
+        ("club-a", "Club A", "Manager A", "owner-a"),
+        ("club-b", "Club B", "Manager B", "owner-b")
+    ]
+
+def test_get_head_to_head_counts_every_season(client: SQLiteClient) -> None:
+    client.table("matchup").upsert([
+        matchup("2024", 3, 100.0, 90.0),
+        { **matchup("2024", 9, 80.0, 70.0), "club_x": "club-b", "club_y": "club-a", "winner": "club-b" },
+        matchup("2025", 1, 95.0, 95.0),
+        matchup("2025", 2, 0.0, 0.0)
+    ], on_conflict="season, club_x, club_y, week").execute()
+
+    assert get_head_to_head(client, "2025", 1) == [{ "club_x": "club-a", "club_y": "club-b", "wins_x": 1, "wins_y": 1, "draws": 1 }]
+
+def test_foreign_keys_are_enforced(client: SQLiteClient) -> None:
+    rows = [matchup("2025", 1, 100.0, 90.0), { **matchup("2025", 2, 100.0, 90.0), "club_y": "club-unknown" }]
+
+    with pytest.raises(sqlite3.IntegrityError):
+        client.table("matchup").upsert(rows, on_conflict="season, club_x, club_y, week").execute()
+
+    # the rows of a write share one transaction, so the valid row was rolled back too
+    assert client.table("matchup").select("*").execute().data == []
+
+def test_mirror_tables_writes_in_foreign_key_order(client: SQLiteClient) -> None:
+    client.table("matchup").upsert([matchup("2025", 1, 100.0, 90.0)], on_conflict="season, club_x, club_y, week").execute()
+    target = SQLiteClient(":memory:")
+
+    assert mirror_tables(client, target) == { "manager": 2, "club": 2, "standing": 0, "matchup": 1 }
+    assert target.table("matchup").select("*").execute().data == client.table("matchup").select("*").execute().data
+    target.close()
+
+def test_ids_are_uuid_text_kept_by_the_mirror(client: SQLiteClient) -> None:
+    generated = client.table("matchup").upsert([matchup("2025", 1, 100.0, 90.0)], on_conflict="season, club_x, club_y, week").execute().data[0]["id"]
+    client.table("matchup").upsert([{ **matchup("2025", 2, 100.0, 90.0), "id": "7d0c3c9e-2f4b-4d8a-9a51-0c2f6b1e8d11" }], on_conflict="season, club_x, club_y, week").execute()
+    target = SQLiteClient(":memory:")
+    mirror_tables(client, target)
+
+    assert str(uuid.UUID(generated)) == generated and uuid.UUID(generated).version == 4
+    assert sorted(row["id"] for row in target.table("matchup").select("id").execute().data) == sorted([generated, "7d0c3c9e-2f4b-4d8a-9a51-0c2f6b1e8d11"])
+    target.close()
+
+def test_databases_with_integer_ids_are_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "old.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute("create table standing (id integer primary key autoincrement, season text not null, club text not null, week integer not null, unique (season, club, week))")
+    connection.close()
+
+    with pytest.raises(RuntimeError, match="older schema"):
+        SQLiteClient(path)
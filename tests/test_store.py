@@ -0,0 +1,67 @@
+# package imports
+import polars as pl
+import pytest
+
+# function imports
+from pathlib import Path
+from typing import Any, Iterator
+
+# local imports
+from shared.sqlite.client import SQLiteClient
+from shared.store.matchup import get_watermark, scan_matchups, sync_matchups
+
+@pytest.fixture
+def client() -> Iterator[SQLiteClient]:
+    client = SQLiteClient(":memory:")
+
+    client.table("manager").upsert([{ "id": "manager-a", "name": "Manager A" }, { "id": "manager-b", "name": "Manager B" }]).execute()
+    client.table("club").upsert([{ "id": "club-a", "league": "league", "manager": "manager-a" }, { "id": "club-b", "league": "league", "manager": "manager-b" }]).execute()
+
+    yield client
+    client.close()
+
+def matchup(week: int, updated_at: str) -> dict[str, Any]:
+    return { "season": "2025", "week": week, "club_x": "club-a", "score_x": 100.0, "club_y": "club-b", "score_y": 90.0, "winner": "club-a", "stage": "regular", "updated_at": updated_at }
+
+def upsert(client: SQLiteClient, *rows: dict[str, Any]) -> None:
+    client.table("matchup").upsert(list(rows), on_conflict="season, club_x, club_y, week").execute()
+
+def stored_weeks(root: Path) -> list[int]:
+    return scan_matchups(root).select("week").collect().sort("week")["week"].to_list()
+
+def test_sync_catches_rows_committed_behind_the_watermark(client: SQLiteClient, tmp_path: Path) -> None:
+    upsert(client, matchup(1, "2025-09-10T12:00:00.000+00:00"))
+    assert sync_matchups(client, tmp_path) == 1
+
+    # a row stamped before the watermark by a transaction that started earlier but committed after the sync
+    upsert(client, matchup(2, "2025-09-10T11:58:00.000+00:00"))
+    sync_matchups(client, tmp_path)
+
+    assert stored_weeks(tmp_path) == [1, 2]
+    assert get_watermark(tmp_path) == "2025-09-10T12:00:00.000+00:00"
+
+def test_sync_merges_refetched_rows_by_id(client: SQLiteClient, tmp_path: Path) -> None:
+    upsert(client, matchup(1, "2025-09-10T12:00:00.000+00:00"))
+    sync_matchups(client, tmp_path)
+    upsert(client, { **matchup(1, "2025-09-10T12:01:00.000+00:00"), "score_y": 110.0, "winner": "club-b" })
+    sync_matchups(client, tmp_path)
+    sync_matchups(client, tmp_path)
+
+    stored = scan_matchups(tmp_path).collect()
+
+    assert stored.height == 1
+    assert stored["score_y"].to_list() == [110.0]
+
+def test_full_sync_drops_deleted_rows(client: SQLiteClient, tmp_path: Path) -> None:
+    upsert(client, matchup(1, "2025-09-10T12:00:00.000+00:00"), matchup(2, "2025-09-10T12:00:00.000+00:00"))
+    sync_matchups(client, tmp_path)
+
+    with client.lock:
+        client.connection.execute("delete from matchup where week = 2")
+
+    sync_matchups(client, tmp_path)
+    assert stored_weeks(tmp_path) == [1, 2]
+
+    sync_matchups(client, tmp_path, full=True)
+    assert stored_weeks(tmp_path) == [1]
+    assert pl.read_parquet(tmp_path / "season=2025" / "week=1" / "part.parquet").height == 1
@@ -0,0 +1,51 @@
+# function imports
+from supabase import Client
+from typing import Any, Callable
+
+# local imports
+from benchmark.server import PostgrestServer
+from shared.supabase.write import write_rows
+
+KEYS = ["season", "club", "week"]
+FIELDS = ["standing", "pf", "mpf"]
+
+def standing(club: str, pf: float, **fields: Any) -> dict[str, Any]:
+    return { "season": "2025", "club": club, "week": 1, "standing": 1, "pf": pf, **fields }
+
+def stored(server: PostgrestServer) -> list[dict[str, Any]]:
+    return [dict(row) for row in server.tables["standing"]]
+
+def test_write_rows_posts_only_changed_rows(postgrest: Callable[..., tuple[PostgrestServer, Client]]) -> None:
+    server, client = postgrest({ "standing": [
+        { "id": 1, **standing("club-a", 100.004, mpf=150.0) },
+        { "id": 2, **standing("club-b", 100.0, mpf=150.0) },
+        { "id": 3, **standing("club-c", 100.0, mpf=None) },
+        { "id": 4, **standing("club-d", 100.0, mpf=150.0) },
+        { "id": 5, **standing("club-e", 100.0, mpf=150.0) }
+    ] })
+
+    written, counts = write_rows(client, "standing", [
+        standing("club-a", 100.0, mpf=150.0),    # equal to the hundredth
+        standing("club-b", 100.006, mpf=150.0),  # changed at the hundredth
+        standing("club-c", 100.0, mpf=None),     # null against null
+        standing("club-d", 100.0),               # a missing 'mpf' is not written or compared
+        standing("club-e", 100.0, mpf=None),     # an explicit null replaces the stored 'mpf'
+        standing("club-f", 90.0, mpf=120.0)      # new
+    ], stored(server), KEYS, FIELDS)
+
+    assert counts == { "inserted": 1, "updated": 2, "unchanged": 3 }
+    assert [(table, [row["club"] for row in rows]) for table, rows in server.posts] == [("standing", ["club-b", "club-e", "club-f"])]
+    assert sorted(row["club"] for row in written) == ["club-a", "club-b", "club-c", "club-d", "club-e", "club-f"]
+
+def test_write_rows_upserts_in_chunks(postgrest: Callable[..., tuple[PostgrestServer, Client]]) -> None:
+    server, client = postgrest({ "standing": [{ "id": 1, **standing("club-a", 100.0) }] })
+    rows = [standing("club-a", 100.0)] + [standing(f"club-{index}", 90.0 + index) for index in range(5)]
+
+    written, counts = write_rows(client, "standing", rows, stored(server), KEYS, FIELDS, chunk_size=2, minimal=True)
+    _, again = write_rows(client, "standing", rows, stored(server), KEYS, FIELDS, chunk_size=2)
+
+    assert counts == { "inserted": 5, "updated": 0, "unchanged": 1 }
+    assert [len(rows) for _, rows in server.posts] == [2, 2, 1]
+    assert len(written) == 6 and "id" not in written[-1]
+    assert again == { "inserted": 0, "updated": 0, "unchanged": 6 }
+    assert len(server.tables["standing"]) == 6
@@ -0,0 +1,148 @@
+# package imports
+import polars as pl
+
+# function imports
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from supabase import Client
+from typing import Any, Callable
+
+# local imports
+from league_table.core import get_league_table, update_standings
+from matchup_history.core import update_matchups
+from matchup_table.core import get_matchup_table
+from shared.python.registry import get_club_rows
+from shared.python.trace import span, traced
+from shared.sleeper.matchup import get_sleeper_matchups
+from shared.sleeper.roster import get_sleeper_roster_data, get_sleeper_rosters_frame
+
+# a stage maps its name to the names of the stages it depends on and a function of their results
+Stage = tuple[list[str], Callable[..., Any]]
+
+@traced
+def run_weekly(client: Client, sleeper_league_id: str, supabase_league_id: str, season_id: str, week: int) -> dict[str, pl.DataFrame]:
+    """
+    Runs the weekly standings, matchup history and matchup table updates in one process.
+    Each input is fetched once and the upsert responses are passed straight to the stages that need them.
+
+    Args:
+        client (Client): The Supabase client.
+        sleeper_league_id (str): The Sleeper id of the league.
+        supabase_league_id (str): The Supabase UUID of the league.
+        season_id (str): The Supabase UUID of the season.
+        week (int): The week number to update.
+
+    Returns:
+        dict[str, polars.DataFrame]: The upserted 'standings' and 'matchups' and the resulting 'league_table' and 'matchup_table'.
+    """
+    try:
+        results = run_stages(get_weekly_stages(client, sleeper_league_id, supabase_league_id, season_id, week))
+
+        return { name: results[name] for name in ("standings", "matchups", "league_table", "matchup_table") }
+
+    except Exception as ex:
+        raise RuntimeError(f"Error running the weekly pipeline for {season_id=} and {week=}.") from ex
+
+@traced
+def run_leagues(client: Client, leagues: list[dict[str, str]], week: int, max_workers: int = 8) -> dict[str, dict[str, pl.DataFrame]]:
+    """
+    Runs the weekly pipeline of several leagues concurrently as one DAG of stages.
+    Every league shares the Supabase client, the Sleeper connection pool and one bounded thread pool, so the network waits
+    of one league overlap with the work of the others.
+
+    Args:
+        client (Client): The Supabase client.
+        leagues (list[dict[str, str]]): The leagues returned by 'get_league', with a 'league' key and their Sleeper and Supabase ids.
+        week (int): The week number to update.
+        max_workers (int = 8): The maximum number of stages running at once across every league.
+
+    Returns:
+        dict[str, dict[str, polars.DataFrame]]: A dictionary of league key to the results of 'run_weekly' for that league.
+    """
+    stages: dict[str, Stage] = {}
+    for league in leagues:
+        weekly = get_weekly_stages(client, league["sleeper_league_id"], league["supabase_league_id"], league["season_id"], week)
+
+        # prefix every stage and dependency with the league key to keep the leagues apart in one DAG
+        stages.update({
+            f"{league['league']}.{name}": ([f"{league['league']}.{dependency}" for dependency in dependencies], function)
+            for name, (dependencies, function) in weekly.items()
+        })
+
+    try:
+        results = run_stages(stages, max_workers)
+
+        return {
+            league["league"]: { name: results[f"{league['league']}.{name}"] for name in ("standings", "matchups", "league_table", "matchup_table") }
+            for league in leagues
+        }
+
+    except Exception as ex:
+        raise RuntimeError(f"Error running the weekly pipeline for leagues {[league['league'] for league in leagues]} and {week=}.") from ex
+
+def get_weekly_stages(client: Client, sleeper_league_id: str, supabase_league_id: str, season_id: str, week: int) -> dict[str, Stage]:
+    """
+    Gets the stages of the weekly pipeline of a league.
+
+    Args:
+        client (Client): The Supabase client.
+        sleeper_league_id (str): The Sleeper id of the league.
+        supabase_league_id (str): The Supabase UUID of the league.
+        season_id (str): The Supabase UUID of the season.
+        week (int): The week number to update.
+
+    Returns:
+        dict[str, Stage]: A dictionary of stage name to the names of its dependencies and its function.
+    """
+    return {
+        "roster_data": ([], lambda: get_sleeper_roster_data(sleeper_league_id)),
+        "clubs": ([], lambda: get_club_rows(client, supabase_league_id)),
+        # parsed straight into a frame from the response cached by 'roster_data', so the rosters are not fetched twice
+        "rosters": (["roster_data"], lambda _: get_sleeper_rosters_frame(sleeper_league_id)),
+        "sleeper_matchups": (["roster_data"], lambda roster_data: get_sleeper_matchups(sleeper_league_id, week, roster_data)),
+        "standings": (["rosters", "clubs"], lambda rosters, clubs: update_standings(client, sleeper_league_id, supabase_league_id, season_id, week, rosters, clubs)),
+        "matchups": (["sleeper_matchups", "clubs"], lambda sleeper_matchups, clubs: update_matchups(client, sleeper_league_id, supabase_league_id, season_id, week, sleeper_matchups, clubs)),
+        "league_table": (["standings", "clubs"], lambda standings, clubs: get_league_table(client, season_id, week, standings, clubs)),
+        "matchup_table": (["matchups", "clubs"], lambda matchups, clubs: get_matchup_table(client, season_id, supabase_league_id, week, clubs, matchups))
+    }
+
+def run_stages(stages: dict[str, Stage], max_workers: int = 4) -> dict[str, Any]:
+    """
+    Runs a DAG of stages, starting each stage as soon as the stages it depends on have finished.
+    Independent stages run concurrently in a thread pool.
+
+    Args:
+        stages (dict[str, Stage]): A dictionary of stage name to the names of its dependencies and its function.
+        The function is called with the results of its dependencies as positional arguments in order.
+        max_workers (int = 4): The maximum number of stages running at once.
+
+    Returns:
+        dict[str, Any]: A dictionary of stage name to the result of the stage.
+    """
+    if unknown := { dependency for dependencies, _ in stages.values() for dependency in dependencies if dependency not in stages }:
+        raise ValueError(f"Stages depend on unknown stages {sorted(unknown)}.")
+
+    results: dict[str, Any] = {}
+    running: dict[Future, str] = {}
+    pending = dict(stages)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            # start every stage whose dependencies have finished
+            for name, (dependencies, function) in list(pending.items()):
+                if all(dependency in results for dependency in dependencies):
+                    running[executor.submit(run_stage, name, function, *(results[dependency] for dependency in dependencies))] = name
+                    del pending[name]
+
+            if not running:
+                raise ValueError(f"Stages {sorted(pending)} have circular dependencies.")
+
+            # collect the finished stages
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+
+    return results
+
+def run_stage(name: str, function: Callable[..., Any], *args: Any) -> Any:
+    with span(f"stage.{name}"):
+        return function(*args)
@@ -0,0 +1,55 @@
+# package imports
+import os
+import polars as pl
+import sys
+import traceback
+
+# function imports
+from dotenv import load_dotenv
+from supabase import Client, create_client
+
+# local imports
+from shared.python.league import get_league, get_league_keys
+from shared.python.output import write_output
+from shared.python.trace import profile
+from shared.python.utils import get_week
+from weekly.core import run_weekly
+
+load_dotenv()
+
+# the league is read from the league registry in shared/leagues.json, the first league unless LEAGUE is set
+league: dict[str, str] = get_league(os.getenv("LEAGUE") or get_league_keys()[0])
+
+season_id: str = league["season_id"]
+sleeper_league_id: str = league["sleeper_league_id"]
+supabase_league_id: str = league["supabase_league_id"]
+
+supabase_url: str | None = os.getenv("SUPABASE_URL")
+if not supabase_url:
+    raise ValueError(f"Failed to retrieve the environment variable for supabase url.")
+
+supabase_key: str | None = os.getenv("SUPABASE_KEY")
+if not supabase_key:
+    raise ValueError(f"Failed to retrieve the environment variable for supabase key.")
+
+try:
+    # get the week
+    week: int = get_week()
+
+    # initialize the Supabase client
+    client: Client = create_client(supabase_url, supabase_key)
+
+    # profile the pipeline when LEAGUEDB_PROFILE is set, spans are exported when LEAGUEDB_TRACE is set
+    with profile():
+        # run every weekly stage in one process
+        results: dict[str, pl.DataFrame] = run_weekly(client, sleeper_league_id, supabase_league_id, season_id, week)
+
+        # save the league table and matchup table to their partitions of the output datasets and export them as .csv files
+        write_output(results["league_table"].drop(["id", "season", "club_id"]).sort("standing"), "league_table", league["league"], league["season"], week, csv_path="league_table/data/league_table.csv")
+        write_output(results["matchup_table"], "matchup_table", league["league"], league["season"], week, csv_path="matchup_table/data/matchup_table.csv")
+
+except Exception as ex:
+    print(f"An error occurred:")
+    traceback.print_exception(type(ex), ex, ex.__traceback__)
+    print(f"Exiting now...")
+    sys.exit()